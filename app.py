@@ -3,15 +3,19 @@
 
 import streamlit as st
 from src.styles import apply_all_styles
-from src.layouts import render_sticky_header, render_sidebar, render_main_tabs
+from src.layouts import render_sticky_header, render_sidebar, render_main_tabs, render_player_view
 from src.utils.combat import initialize_combat_state
+from src.utils.encounter_registry import PLAYER_VIEW, VIEW_PARAM, sync_encounter
+from src.utils.memory import run_memory_maintenance
+from src.utils.profiler import profile_rerun, profiled
+from src.utils.session_keys import collect_session_garbage
 from src.utils.data_manager import (
-    auto_load_player_roster,
-    auto_load_monster_library,
+    start_auto_load,
+    apply_auto_load,
     auto_save_player_roster,
     auto_save_monster_library,
 )
-from src.config import PAGE_TITLE, PAGE_ICON, PAGE_LAYOUT
+from src.config import PAGE_TITLE, PAGE_ICON, PAGE_LAYOUT, AUTO_LOAD_POLL_SECONDS
 
 
 def main():
@@ -24,37 +28,84 @@ def main():
         layout=PAGE_LAYOUT,
     )
     
-    # Apply all CSS styles
-    apply_all_styles()
+    # Lightweight read-only page for players (no tracker state or styles)
+    if st.query_params.get(VIEW_PARAM) == PLAYER_VIEW:
+        render_player_view()
+        return
     
-    # Initialize combat state
-    initialize_combat_state()
-    
-    # Auto-load saved data on first run
-    _auto_load_data()
-    
-    # Render layout
-    render_sticky_header()
-    render_sidebar()
-    render_main_tabs()
+    # Timings of this run are recorded only when profiling is enabled
+    with profile_rerun():
+        # Apply all CSS styles
+        apply_all_styles()
+        
+        # Initialize combat state
+        initialize_combat_state()
+        
+        # Attach to / pull from a shared encounter (see ?encounter=...)
+        sync_encounter()
+        
+        # Auto-load saved data in the background (first run only)
+        _auto_load_data()
+        
+        # Drop widget state of removed combatants, finished searches, etc.
+        collect_session_garbage()
+        
+        # Render layout
+        render_sticky_header()
+        render_sidebar()
+        render_main_tabs()
+        
+        # Render footer
+        _render_footer()
+        
+        # Auto-save data
+        _auto_save_data()
+        
+        # Publish changes made outside commands (start/end combat, loads)
+        sync_encounter()
+        
+        # Periodic memory budget checks (and allocation tracing, if enabled)
+        run_memory_maintenance()
+
+
+def _auto_load_data():
+    """Start loading the player roster and monster library without blocking the first paint."""
+    if st.session_state.get('auto_loaded'):
+        return
     
-    # Render footer
-    _render_footer()
+    if 'auto_load_future' not in st.session_state:
+        st.session_state.auto_load_future = start_auto_load()
     
-    # Auto-save data
-    _auto_save_data()
+    # Small files are usually done by now; otherwise poll until they are
+    if not _finish_auto_load():
+        _render_auto_load_status()
 
 
-def _auto_load_data():
-    """Auto-load player roster and monster library on first run."""
-    if 'auto_loaded' not in st.session_state:
-        auto_load_player_roster()
-        auto_load_monster_library()
-        st.session_state.auto_loaded = True
+def _finish_auto_load() -> bool:
+    """Apply the background auto-load if it has finished."""
+    future = st.session_state.auto_load_future
+    if not future.done():
+        return False
+    apply_auto_load(*future.result())
+    del st.session_state.auto_load_future
+    st.session_state.auto_loaded = True
+    return True
+
+
+@st.fragment(run_every=AUTO_LOAD_POLL_SECONDS)
+def _render_auto_load_status():
+    """Placeholder shown while the auto-load runs; reruns the app once it's done."""
+    if st.session_state.get('auto_loaded') or _finish_auto_load():
+        st.rerun()
+    st.caption("⏳ Loading saved players and monsters...")
 
 
+@profiled("app._auto_save_data")
 def _auto_save_data():
     """Auto-save player roster and monster library."""
+    # Saving before the auto-load finished would overwrite the files with a partial roster
+    if not st.session_state.get('auto_loaded'):
+        return
     auto_save_player_roster()
     auto_save_monster_library()
 
@@ -0,0 +1 @@
+"""Performance benchmarks for the D&D Combat Tracker."""
@@ -0,0 +1,112 @@
+# benchmarks/__main__.py
+"""Run the benchmark suites and write the results as JSON.
+
+Run with:
+    python -m benchmarks [--suites commands turns ...] [--sizes 10 100 1000]
+                         [--repeat N] [--output FILE] [--compare BASELINE]
+
+Results go to benchmarks/results/<timestamp>-<commit>.json by default, so
+runs on different commits can be compared with --compare.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks import bench_commands, bench_persistence, bench_search, bench_startup, bench_turns
+from benchmarks.common import DEFAULT_SIZES, print_results
+
+SUITES = {
+    'commands': bench_commands,
+    'turns': bench_turns,
+    'persistence': bench_persistence,
+    'search': bench_search,
+    'startup': bench_startup,
+}
+
+RESULTS_DIR = Path(__file__).parent / "results"
+REGRESSION_THRESHOLD = 1.10  # Flag benchmarks more than 10% slower than the baseline
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict) -> list[str]:
+    """Print the ratio to a baseline run for each shared benchmark; returns the regressions."""
+    regressions = []
+    for name, by_size in results.items():
+        for size, seconds in by_size.items():
+            before = baseline.get(name, {}).get(size)
+            if not before:
+                continue
+            ratio = seconds / before
+            flag = ""
+            if ratio > REGRESSION_THRESHOLD:
+                flag = "  << slower"
+                regressions.append(f"{name}[{size}]")
+            print(f"  {name:<36} {size:>5}: {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--suites', nargs='+', choices=list(SUITES), default=list(SUITES))
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', type=Path, help="Results file (default: benchmarks/results/...)")
+    parser.add_argument('--compare', type=Path, help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.suites:
+        print(f"{name}:")
+        suite_results = SUITES[name].run(tuple(args.sizes), args.repeat)
+        print_results(suite_results)
+        results.update(suite_results)
+
+    # JSON object keys are strings; use them throughout so files compare directly
+    results = {name: {str(size): seconds for size, seconds in by_size.items()} for name, by_size in results.items()}
+
+    commit = _git_commit()
+    started = datetime.now()
+    document = {
+        'meta': {
+            'commit': commit,
+            'timestamp': started.isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': args.sizes,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        output = RESULTS_DIR / f"{started:%Y%m%d-%H%M%S}-{commit or 'nogit'}.json"
+    output.write_text(json.dumps(document, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())['results']
+        print(f"\nCompared with {args.compare}:")
+        regressions = compare(results, baseline)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
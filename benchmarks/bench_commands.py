@@ -0,0 +1,96 @@
+# benchmarks/bench_commands.py
+"""Benchmark execute + undo for every command class, and undo snapshots.
+
+Run with:
+    python -m benchmarks.bench_commands [--sizes 10 100 1000] [--repeat N]
+"""
+
+import argparse
+from copy import deepcopy
+
+from benchmarks.common import (
+    DEFAULT_SIZES, combat_session, make_combatant, make_encounter, print_results, sandbox_data_dir, time_per_call,
+)
+from src.utils.command_manager import execute_command, initialize_command_stack, undo_last_command
+from src.utils.commands import (
+    AddCombatantCommand, RemoveCombatantCommand, ApplyDamageCommand, ApplyHealingCommand,
+    SetTempHPCommand, AddConditionCommand, RemoveConditionCommand, ClearAllConditionsCommand,
+    SetExhaustionCommand, UpdateDeathSavesCommand, FullHealCommand, BatchEditCommand,
+    NextTurnCommand, PreviousTurnCommand,
+)
+from src.utils.compact import CompactCombatants
+
+# Command name -> factory taking the encounter size. Index 0 always has
+# conditions (see make_combatant); the middle combatant has none.
+COMMANDS = {
+    'AddCombatant': lambda n: AddCombatantCommand({**make_combatant(1), 'id': 'bench-extra'}),
+    'RemoveCombatant': lambda n: RemoveCombatantCommand(n // 2),
+    'ApplyDamage': lambda n: ApplyDamageCommand(n // 2, 7),
+    'ApplyHealing': lambda n: ApplyHealingCommand(n // 2, 7),
+    'SetTempHP': lambda n: SetTempHPCommand(n // 2, 5),
+    'AddCondition': lambda n: AddConditionCommand(n // 2, "Frightened"),
+    'RemoveCondition': lambda n: RemoveConditionCommand(0, "Prone"),
+    'ClearAllConditions': lambda n: ClearAllConditionsCommand(0),
+    'SetExhaustion': lambda n: SetExhaustionCommand(n // 2, 3),
+    'UpdateDeathSaves': lambda n: UpdateDeathSavesCommand(n // 2, success_delta=1),
+    'FullHeal': lambda n: FullHealCommand(n // 2),
+    'BatchEdit': lambda n: BatchEditCommand({i: {'current_hp': 1, 'ac': 15} for i in range(0, n, 10)}),
+    'NextTurn': lambda n: NextTurnCommand(),
+    'PreviousTurn': lambda n: PreviousTurnCommand(),
+}
+
+
+def run(sizes: tuple[int, ...] = DEFAULT_SIZES, repeat: int = 3) -> dict:
+    """Time execute_command + undo_last_command per command class and encounter size.
+
+    Returns:
+        {"execute_undo.<Command>": {size: seconds per execute+undo}}
+    """
+    results = {f"execute_undo.{name}": {} for name in COMMANDS}
+    with sandbox_data_dir():
+        for size in sizes:
+            for name, factory in COMMANDS.items():
+                with combat_session(size):
+                    initialize_command_stack()
+
+                    def execute_and_undo():
+                        execute_command(factory(size))
+                        undo_last_command()
+
+                    results[f"execute_undo.{name}"][size] = time_per_call(execute_and_undo, repeat)
+    results.update(run_snapshots(sizes, repeat))
+    return results
+
+
+def run_snapshots(sizes: tuple[int, ...] = DEFAULT_SIZES, repeat: int = 3) -> dict:
+    """Time taking and restoring a combatants snapshot, deep-copied vs compact.
+
+    Returns:
+        {"snapshot.<operation>": {size: seconds}}
+    """
+    results = {name: {} for name in (
+        'snapshot.deepcopy', 'snapshot.compact_capture', 'snapshot.compact_copy', 'snapshot.compact_restore',
+    )}
+    for size in sizes:
+        combatants = make_encounter(size)
+        table = CompactCombatants.from_combatants(combatants)
+        results['snapshot.deepcopy'][size] = time_per_call(lambda: deepcopy(combatants), repeat)
+        results['snapshot.compact_capture'][size] = time_per_call(
+            lambda: CompactCombatants.from_combatants(combatants), repeat,
+        )
+        results['snapshot.compact_copy'][size] = time_per_call(table.copy, repeat)
+        results['snapshot.compact_restore'][size] = time_per_call(table.to_combatants, repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print_results(run(tuple(args.sizes), args.repeat))
+
+
+if __name__ == "__main__":
+    main()
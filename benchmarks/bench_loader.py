@@ -0,0 +1,67 @@
+# benchmarks/bench_loader.py
+"""Benchmark the validating combat loader on multi-MB save files.
+
+Run with:
+    python -m benchmarks.bench_loader [--combatants N] [--log-entries N]
+"""
+
+import argparse
+import io
+import json
+
+from benchmarks.common import best_of, make_combatant
+from src.config import EXPORT_VERSION
+from src.utils.import_export import iter_combat_state_json, read_combat_state_stream
+from src.utils.schema import upgrade_combat_state
+
+
+def make_combat_state(num_combatants: int, num_log_entries: int, version: str = EXPORT_VERSION) -> dict:
+    return {
+        'combatants': [make_combatant(i) for i in range(num_combatants)],
+        'current_turn_index': 0,
+        'round_number': 12,
+        'combat_active': True,
+        'combat_log': [f"Creature {i % num_combatants} took {i % 20} damage" for i in range(num_log_entries)],
+        'export_timestamp': "2025-01-01T00:00:00",
+        'version': version,
+    }
+
+
+def run(num_combatants: int = 2000, num_log_entries: int = 50_000, repeat: int = 3) -> dict:
+    """Time parsing + validation against a plain json.loads baseline.
+
+    Returns:
+        Dict of timings in seconds plus the document size in bytes
+    """
+    state = make_combat_state(num_combatants, num_log_entries)
+    document = ''.join(iter_combat_state_json(state))
+    parsed = json.loads(document)
+
+    results = {
+        'size_bytes': len(document.encode('utf-8')),
+        'json_loads': best_of(lambda: json.loads(document), repeat),
+        'validate_only': best_of(lambda: upgrade_combat_state(parsed), repeat),
+        'stream_load_validate': best_of(lambda: read_combat_state_stream(io.StringIO(document)), repeat),
+    }
+
+    legacy = make_combat_state(num_combatants, num_log_entries, version="2.0")
+    legacy_document = json.dumps(legacy)
+    results['stream_load_migrate'] = best_of(lambda: read_combat_state_stream(io.StringIO(legacy_document)), repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--combatants', type=int, default=2000)
+    parser.add_argument('--log-entries', type=int, default=50_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    results = run(args.combatants, args.log_entries, args.repeat)
+    print(f"Document size: {results.pop('size_bytes') / 1_000_000:.1f} MB")
+    for name, seconds in results.items():
+        print(f"  {name:<22} {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/bench_persistence.py
+"""Benchmark combat export/import and the roster/library auto-saves.
+
+All files are written to a temporary directory, never to data/.
+
+Run with:
+    python -m benchmarks.bench_persistence [--sizes 10 100 1000] [--repeat N]
+"""
+
+import argparse
+
+from benchmarks.common import (
+    DEFAULT_SIZES, combat_session, make_combatant, print_results, sandbox_data_dir, time_per_call,
+)
+from src.utils.data_manager import auto_save_monster_library, auto_save_player_roster
+from src.utils.import_export import export_combat_state, import_combat_state
+
+
+def make_roster(size: int) -> dict:
+    """Player roster with `size` characters."""
+    return {
+        f"player{i}": {
+            'name': f"Hero {i}",
+            'class_name': "Fighter",
+            'level': 1 + i % 20,
+            'proficiency_bonus': 2 + i % 5,
+            'max_hp': 30 + i % 40,
+            'ac': 12 + i % 8,
+            'initiative_bonus': i % 5,
+            'dex_modifier': i % 5,
+            'speed': 30,
+            'has_alert': False,
+            'notes': "Second Wind. Action Surge. " * 5,
+            'saved_at': "2025-01-01T00:00:00",
+        }
+        for i in range(size)
+    }
+
+
+def make_library(size: int) -> dict:
+    """Monster library with `size` saved monsters."""
+    library = {}
+    for i in range(size):
+        monster = make_combatant(2 * i)  # Even indices are monsters
+        library[f"monster{i}"] = {
+            'name': monster['name'],
+            'source': "wotc-srd",
+            'source_title': "5e Core Rules",
+            'raw_data': {'name': monster['name'], 'hit_points': monster['max_hp'], 'desc': monster['notes']},
+            'parsed_stats': {k: monster[k] for k in ('max_hp', 'ac', 'dex_modifier', 'speed', 'notes', 'cr')},
+            'saved_at': "2025-01-01T00:00:00",
+        }
+    return library
+
+
+def run(sizes: tuple[int, ...] = DEFAULT_SIZES, repeat: int = 3) -> dict:
+    """Time export/import of a combat and both auto-saves per size.
+
+    Returns:
+        {"<operation>": {size: seconds per call}}
+    """
+    results = {name: {} for name in (
+        'export_combat_state', 'import_combat_state', 'auto_save_player_roster', 'auto_save_monster_library',
+    )}
+    with sandbox_data_dir():
+        for size in sizes:
+            with combat_session(size) as state:
+                document = export_combat_state()
+                results['export_combat_state'][size] = time_per_call(export_combat_state, repeat)
+                results['import_combat_state'][size] = time_per_call(lambda: import_combat_state(document), repeat)
+
+                state.player_roster = make_roster(size)
+                state.saved_monsters = make_library(size)
+                results['auto_save_player_roster'][size] = time_per_call(auto_save_player_roster, repeat)
+                results['auto_save_monster_library'][size] = time_per_call(auto_save_monster_library, repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print_results(run(tuple(args.sizes), args.repeat))
+
+
+if __name__ == "__main__":
+    main()
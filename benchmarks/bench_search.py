@@ -0,0 +1,57 @@
+# benchmarks/bench_search.py
+"""Benchmark ranking monster names with calculate_match_score.
+
+Run with:
+    python -m benchmarks.bench_search [--sizes 10 100 1000] [--repeat N]
+"""
+
+import argparse
+
+from benchmarks.common import DEFAULT_SIZES, print_results, time_per_call
+from src.utils.monster_api import calculate_match_score
+
+_NAME_PARTS = (
+    ("Young", "Adult", "Ancient", "Giant", "Dire", "Lesser", ""),
+    ("Red", "Blue", "Green", "Shadow", "Frost", "Fire", "Swamp", ""),
+    ("Dragon", "Goblin", "Wolf", "Spider", "Troll", "Elemental", "Drake", "Hag"),
+)
+
+SEARCH_TERMS = ("dragon", "gob", "frost giant", "xyzzy")
+
+
+def make_names(size: int) -> list[str]:
+    """`size` monster names built from common name parts."""
+    prefixes, colours, kinds = _NAME_PARTS
+    names = []
+    for i in range(size):
+        parts = (prefixes[i % len(prefixes)], colours[(i // 7) % len(colours)], kinds[(i // 3) % len(kinds)])
+        names.append(" ".join(p for p in parts if p) + (f" {i}" if i >= 100 else ""))
+    return names
+
+
+def run(sizes: tuple[int, ...] = DEFAULT_SIZES, repeat: int = 3) -> dict:
+    """Time scoring and sorting `size` names against each search term.
+
+    Returns:
+        {"match_score.<term>": {size: seconds to rank all names}}
+    """
+    results = {f"match_score.{term.replace(' ', '_')}": {} for term in SEARCH_TERMS}
+    for size in sizes:
+        names = make_names(size)
+        for term in SEARCH_TERMS:
+            rank = lambda: sorted(names, key=lambda name: calculate_match_score(term, name), reverse=True)
+            results[f"match_score.{term.replace(' ', '_')}"][size] = time_per_call(rank, repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print_results(run(tuple(args.sizes), args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# benchmarks/bench_startup.py
+"""Benchmark startup: importing the app and a new session's first run.
+
+Run with:
+    python -m benchmarks.bench_startup [--sizes 10 100 1000] [--repeat N]
+
+Import time is measured in a fresh interpreter with `python -X importtime`,
+after importing streamlit (which the server has loaded before any app code).
+The standalone run exits non-zero when importing the app takes longer than
+IMPORT_BUDGET_MS or pulls in any of DEFERRED_MODULES.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.bench_persistence import make_library, make_roster
+from benchmarks.common import DEFAULT_SIZES, best_of, print_results, sandbox_data_dir
+from src.utils import data_manager
+
+ROOT = Path(__file__).parent.parent
+APP_FILE = ROOT / "app.py"
+
+IMPORT_BUDGET_MS = 60  # Cumulative import time of app.py, excluding streamlit itself
+
+# Modules that must only be imported when their tab (or feature) is first used
+DEFERRED_MODULES = (
+    'requests',
+    'difflib',
+    'src.utils.monster_api',
+    'src.utils.import_export',
+    'src.utils.snapshot_history',
+    'src.components.monster_search',
+    'src.components.player_character_form',
+    'src.components.save_load_manager',
+    'src.components.debug_panel',
+)
+
+_IMPORT_SCRIPT = (
+    "import sys, streamlit; before = set(sys.modules); import app; "
+    "print('\\n'.join(sorted(set(sys.modules) - before)))"
+)
+
+
+def measure_app_import() -> tuple[float, list[str]]:
+    """Import app.py in a fresh interpreter.
+
+    Returns:
+        (cumulative import time in seconds, modules the import loaded)
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _IMPORT_SCRIPT],
+        capture_output=True, text=True, check=True, cwd=ROOT,
+    )
+    seconds = 0.0
+    for line in proc.stderr.splitlines():
+        # "import time:  self [us] | cumulative | name", children before parents
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == 'app':
+            seconds = int(parts[1]) / 1_000_000
+    return seconds, proc.stdout.split()
+
+
+def _write_auto_saves(size: int) -> None:
+    data_manager.initialize_data_directories()
+    data_manager.AUTO_SAVE_ROSTER_FILE.write_text(json.dumps({'players': make_roster(size)}))
+    data_manager.AUTO_SAVE_LIBRARY_FILE.write_text(json.dumps({'monsters': make_library(size)}))
+
+
+def _first_run() -> None:
+    # Imported here: the testing harness is only needed by this benchmark
+    from streamlit.testing.v1 import AppTest
+    AppTest.from_file(str(APP_FILE), default_timeout=60).run()
+
+
+def run(sizes: tuple[int, ...] = DEFAULT_SIZES, repeat: int = 3) -> dict:
+    """Time the app import, a new session's first run and the (background) auto-load.
+
+    Sizes are the number of players and of monsters in the auto-saved files;
+    the import is independent of them and reported under size 0.
+
+    Returns:
+        {"startup.<phase>": {size: seconds}}
+    """
+    results = {
+        'startup.import_app': {0: min(measure_app_import()[0] for _ in range(repeat))},
+        'startup.first_run': {},
+        'startup.auto_load': {},
+    }
+    with sandbox_data_dir():
+        for size in sizes:
+            _write_auto_saves(size)
+            results['startup.first_run'][size] = best_of(_first_run, repeat)
+            results['startup.auto_load'][size] = best_of(
+                lambda: (data_manager.read_auto_player_roster(), data_manager.read_auto_monster_library()),
+                repeat,
+            )
+    return results
+
+
+def check_import_budget() -> list[str]:
+    """Problems with the app's startup imports (empty if within budget)."""
+    seconds, modules = measure_app_import()
+    problems = []
+    if seconds * 1000 > IMPORT_BUDGET_MS:
+        problems.append(f"importing app took {seconds * 1000:.1f} ms (budget {IMPORT_BUDGET_MS} ms)")
+    loaded = set(modules)
+    problems.extend(f"{name} is imported at startup" for name in DEFERRED_MODULES if name in loaded)
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print_results(run(tuple(args.sizes), args.repeat))
+
+    problems = check_import_budget()
+    for problem in problems:
+        print(f"  !! {problem}")
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
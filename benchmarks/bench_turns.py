@@ -0,0 +1,47 @@
+# benchmarks/bench_turns.py
+"""Benchmark advancing turns through encounters with many downed monsters.
+
+NextTurnCommand skips monsters at 0 HP, so its cost grows with the share of
+the encounter that is down.
+
+Run with:
+    python -m benchmarks.bench_turns [--sizes 10 100 1000] [--repeat N]
+"""
+
+import argparse
+
+from benchmarks.common import DEFAULT_SIZES, combat_session, print_results, sandbox_data_dir, time_per_call
+from src.utils.command_manager import execute_command, initialize_command_stack
+from src.utils.commands import NextTurnCommand
+
+DEAD_FRACTIONS = (0.0, 0.5, 0.9)
+
+
+def run(sizes: tuple[int, ...] = DEFAULT_SIZES, repeat: int = 3) -> dict:
+    """Time one NextTurnCommand per encounter size and share of downed monsters.
+
+    Returns:
+        {"next_turn.dead_<pct>": {size: seconds per turn}}
+    """
+    results = {}
+    with sandbox_data_dir():
+        for fraction in DEAD_FRACTIONS:
+            by_size = results[f"next_turn.dead_{round(fraction * 100)}"] = {}
+            for size in sizes:
+                with combat_session(size, dead_fraction=fraction):
+                    initialize_command_stack()
+                    by_size[size] = time_per_call(lambda: execute_command(NextTurnCommand()), repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print_results(run(tuple(args.sizes), args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# benchmarks/common.py
+"""Shared helpers for the benchmark suites."""
+
+import tempfile
+import timeit
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+from unittest import mock
+
+from src.utils import combat_log_store, data_manager, snapshot_history
+from src.utils.combat import new_combatant_id
+from src.utils.headless import HeadlessSessionState, headless_session
+
+DEFAULT_SIZES = (10, 100, 1000)
+
+
+def best_of(func: Callable[[], object], repeat: int) -> float:
+    """Fastest of `repeat` single calls, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = timeit.default_timer()
+        func()
+        best = min(best, timeit.default_timer() - start)
+    return best
+
+
+def time_per_call(func: Callable[[], object], repeat: int, setup: Callable[[], object] | None = None) -> float:
+    """Seconds per call, best of `repeat` runs of an auto-ranged loop.
+
+    Args:
+        func: The operation to time
+        repeat: Number of timed runs
+        setup: Called (untimed) before each run, e.g. to reset state
+    """
+    timer = timeit.Timer(func)
+    if setup:
+        setup()
+    number, _ = timer.autorange()
+    best = float('inf')
+    for _ in range(repeat):
+        if setup:
+            setup()
+        best = min(best, timer.timeit(number) / number)
+    return best
+
+
+def print_results(results: dict) -> None:
+    """Print {benchmark: {size: seconds}} as one line per benchmark."""
+    for name, by_size in results.items():
+        timings = "  ".join(f"{size:>5}: {seconds * 1000:9.3f} ms" for size, seconds in by_size.items())
+        print(f"  {name:<36} {timings}")
+
+
+@contextmanager
+def sandbox_data_dir() -> Iterator[Path]:
+    """Point every data directory at a temporary folder, so benchmarks never touch real saves."""
+    with tempfile.TemporaryDirectory(prefix="bench_data_") as tmp, ExitStack() as stack:
+        root = Path(tmp)
+        paths = {
+            'DATA_DIR': root,
+            'COMBAT_DIR': root / "combats",
+            'PLAYER_DIR': root / "players",
+            'MONSTER_DIR': root / "monsters",
+            'HISTORY_DIR': root / "history",
+            'LOG_DIR': root / "logs",
+            'SQLITE_DB_FILE': root / "tracker.db",
+            'AUTO_SAVE_ROSTER_FILE': root / "players" / "auto_roster.json",
+            'AUTO_SAVE_LIBRARY_FILE': root / "monsters" / "auto_library.json",
+        }
+        for name, path in paths.items():
+            stack.enter_context(mock.patch.object(data_manager, name, path))
+        stack.enter_context(mock.patch.object(combat_log_store, 'LOG_DIR', paths['LOG_DIR']))
+        stack.enter_context(mock.patch.object(snapshot_history, 'HISTORY_DIR', paths['HISTORY_DIR']))
+        yield root
+
+
+def make_combatant(i: int) -> dict:
+    """Build a realistic combatant (players and monsters alternate)."""
+    base = {
+        'name': f"Creature {i}",
+        'initiative': 10 + i % 10,
+        'dex_modifier': i % 5,
+        'max_hp': 50,
+        'current_hp': 50 - i % 50,
+        'temp_hp': i % 3,
+        'ac': 12 + i % 8,
+        'speed': 30,
+        'conditions': ["Prone", "Poisoned"] if i % 4 == 0 else [],
+        'exhaustion': i % 2,
+        'death_saves': {'successes': 0, 'failures': 0},
+        'is_stable': False,
+        'notes': "Multiattack. Bite: +5 to hit, 2d6+3 piercing. " * 10,
+    }
+    if i % 2:
+        return {**base, 'combatant_type': 'player', 'class_name': "Fighter",
+                'level': 5, 'proficiency_bonus': 3, 'has_alert': False}
+    return {**base, 'combatant_type': 'monster', 'cr': "2", 'monster_type': "Beast", 'size': "Large"}
+
+
+def make_encounter(num_combatants: int, dead_fraction: float = 0.0) -> list[dict]:
+    """Combatants with ids, ready for the session; the first `dead_fraction` of monsters are at 0 HP."""
+    combatants = [{**make_combatant(i), 'id': new_combatant_id()} for i in range(num_combatants)]
+    monsters = [c for c in combatants if c['combatant_type'] == 'monster']
+    for combatant in monsters[:int(len(monsters) * dead_fraction)]:
+        combatant['current_hp'] = 0
+    return combatants
+
+
+@contextmanager
+def combat_session(num_combatants: int, dead_fraction: float = 0.0) -> Iterator[HeadlessSessionState]:
+    """Headless session with an active encounter of `num_combatants`."""
+    with headless_session({
+        'combatants': make_encounter(num_combatants, dead_fraction),
+        'current_turn_index': 0,
+        'round_number': 1,
+        'combat_active': True,
+    }) as state:
+        yield state
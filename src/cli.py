@@ -0,0 +1,508 @@
+# src/cli.py
+"""Command-line tools for saved combats (no Streamlit server needed).
+
+Run with:
+    python -m src.cli show SAVE
+    python -m src.cli replay SAVE SCRIPT [--output DEST]
+    python -m src.cli convert SOURCE DEST
+    python -m src.cli validate [PATH ...] [--workers N] [--upgrade]
+
+SAVE, SOURCE and DEST are a .json path (or a file name in data/combats),
+`sqlite:NAME` for a save in the SQLite store, or `history:NAME[@VERSION]`
+for a versioned save (latest version by default). Every command accepts
+--timings to print how long each step took.
+"""
+
+import argparse
+import json
+import os
+import shlex
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from src.config import EXPORT_VERSION
+from src.constants import CONDITIONS, EFFECT_DURATIONS
+from src.utils import combat, data_manager, snapshot_history
+from src.utils.combat_log_store import get_combat_log
+from src.utils.command_manager import redo_last_command, undo_last_command
+from src.utils.headless import headless_session
+from src.utils.import_export import (
+    get_combat_state, iter_combat_state_json, iter_monster_library_json, iter_player_roster_json,
+    load_combat_state, read_combat_state_stream, read_entries_stream, write_json_chunks,
+)
+from src.utils.schema import (
+    CURRENT_VERSIONS, ENTRY_VALIDATORS, SchemaError, document_version, upgrade_combat_state,
+)
+
+# Data folder -> kind of save it holds (for validate)
+SAVE_KINDS = {
+    data_manager.COMBAT_DIR.name: 'combat',
+    data_manager.PLAYER_DIR.name: 'roster',
+    data_manager.MONSTER_DIR.name: 'library',
+}
+
+
+class CliError(Exception):
+    """A user-facing error: printed without a traceback, exit status 1."""
+
+
+# =============================================================================
+# Save locations
+# =============================================================================
+def _parse_location(spec: str) -> tuple[str, str]:
+    """Split 'sqlite:NAME' / 'history:NAME' / a path into (backend, name)."""
+    backend, sep, name = spec.partition(':')
+    if sep and backend in ('sqlite', 'history'):
+        return backend, name
+    return 'json', spec
+
+
+def _combat_path(name: str) -> Path:
+    path = Path(name)
+    if path.exists():
+        return path
+    for candidate in (data_manager.COMBAT_DIR / name, data_manager.COMBAT_DIR / f"{name}.json"):
+        if candidate.exists():
+            return candidate
+    raise CliError(f"No such save: {name}")
+
+
+def read_save(spec: str) -> dict:
+    """Read, upgrade and validate a combat save.
+
+    Raises:
+        CliError: If the save doesn't exist or is invalid
+    """
+    backend, name = _parse_location(spec)
+    try:
+        if backend == 'sqlite':
+            state = data_manager.get_sqlite_store().load_combat(name)
+            if state is None:
+                raise CliError(f"No SQLite save named {name}")
+            return upgrade_combat_state(state)
+
+        if backend == 'history':
+            name, _, version = name.partition('@')
+            if not version:
+                versions = snapshot_history.list_versions(name)
+                if not versions:
+                    raise CliError(f"No versioned save named {name}")
+                version = versions[-1].version
+            success, message, state = snapshot_history.load_version(name, int(version))
+            if not success:
+                raise CliError(message)
+            return upgrade_combat_state(state)
+
+        with open(_combat_path(name), 'r') as f:
+            return read_combat_state_stream(f)
+    except json.JSONDecodeError as e:
+        raise CliError(f"{spec}: invalid JSON ({e})") from None
+    except SchemaError as e:
+        raise CliError(f"{spec}: invalid combat state ({e})") from None
+
+
+def write_save(spec: str, state: dict) -> str:
+    """Write a combat state (current version) to a save location.
+
+    Returns:
+        Description of where it went
+    """
+    state = {**state, 'export_timestamp': datetime.now().isoformat(), 'version': EXPORT_VERSION}
+    backend, name = _parse_location(spec)
+    if backend == 'sqlite':
+        data_manager.initialize_data_directories()
+        data_manager.get_sqlite_store().save_combat(name, state)
+        return f"SQLite save {name}"
+    if backend == 'history':
+        success, message, _ = snapshot_history.save_version(name, state)
+        if not success:
+            raise CliError(message)
+        return message
+
+    path = Path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        write_json_chunks(iter_combat_state_json(state), f)
+    return str(path)
+
+
+# =============================================================================
+# Timing
+# =============================================================================
+class Timings:
+    """Wall-clock durations per step name."""
+
+    def __init__(self):
+        self.durations: dict[str, list[float]] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.durations.setdefault(name, []).append(seconds)
+
+    def time(self, name: str, func: Callable, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def print(self) -> None:
+        print("\nTimings:")
+        for name, values in self.durations.items():
+            values = sorted(values)
+            p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+            print(
+                f"  {name:<20} n={len(values):<5} total={sum(values) * 1000:9.2f} ms  "
+                f"mean={statistics.fmean(values) * 1000:8.3f} ms  p95={p95 * 1000:8.3f} ms  "
+                f"max={values[-1] * 1000:8.3f} ms"
+            )
+
+
+# =============================================================================
+# show
+# =============================================================================
+def format_combat(state: dict) -> str:
+    """Plain-text summary of a combat: round, turn order, HP and conditions."""
+    status = f"Round {state['round_number']}" if state['combat_active'] else "Not started"
+    lines = [f"{status} · {len(state['combatants'])} combatant(s)"]
+    for idx, c in enumerate(state['combatants']):
+        marker = "▶" if state['combat_active'] and idx == state['current_turn_index'] else " "
+        hp = f"{c['current_hp']}/{c['max_hp']}" + (f"+{c['temp_hp']}" if c['temp_hp'] else "")
+        conditions = ", ".join(c['conditions'])
+        lines.append(
+            f" {marker} {idx + 1:>3}. {c['name']:<24} init {c['initiative']:>2}  "
+            f"HP {hp:<11} AC {c['ac']:>2}  {conditions}"
+        )
+    names = {c.get('id', c['name']): c['name'] for c in state['combatants']}
+    for effect in state.get('effects', []):
+        ends = f"ends round {effect['expires_round']} ({effect['trigger']} of {names.get(effect['anchor_id'], '?')}'s turn)" \
+            if effect['expires_round'] else "no set end"
+        concentration = f", {names.get(effect.get('source_id'), '?')} concentrating" if effect['concentration'] else ""
+        lines.append(f"   ⏳ {effect['name']} on {names.get(effect['target_id'], '?')}: {ends}{concentration}")
+    return "\n".join(lines)
+
+
+def cmd_show(args, timings: Timings) -> int:
+    state = timings.time('read', read_save, args.save)
+    print(format_combat(state))
+    return 0
+
+
+# =============================================================================
+# replay
+# =============================================================================
+def _find_target(token: str) -> int:
+    """Index of the combatant named `token` (case-insensitive) or at 1-based position `token`."""
+    combatants = combat.st.session_state.combatants
+    for idx, c in enumerate(combatants):
+        if c['name'].lower() == token.lower():
+            return idx
+    if token.isdigit() and 1 <= int(token) <= len(combatants):
+        return int(token) - 1
+    raise CliError(f"no combatant '{token}'")
+
+
+def _condition(name: str) -> str:
+    for condition in CONDITIONS:
+        if condition.lower() == name.lower():
+            return condition
+    raise CliError(f"unknown condition '{name}'")
+
+
+def _duration(name: str) -> str:
+    if name.lower() in EFFECT_DURATIONS:
+        return name.lower()
+    raise CliError(f"unknown duration '{name}' (one of {', '.join(EFFECT_DURATIONS)})")
+
+
+def _timed_condition(index: int, condition: str, duration: str, source_index: int) -> None:
+    combat.add_effect(index, condition, duration, source_index, condition=condition)
+
+
+def _concentrate(index: int, name: str, duration: str, source_index: int) -> None:
+    combat.add_effect(index, name, duration, source_index, concentration=True)
+
+
+def _death_save(index: int, outcome: str) -> None:
+    deltas = {'success': (1, 0), 'failure': (0, 1)}
+    if outcome == 'reset':
+        combat.update_death_saves(index, reset=True)
+    elif outcome in deltas:
+        combat.update_death_saves(index, *deltas[outcome])
+    else:
+        raise CliError(f"death save outcome must be success, failure or reset, not '{outcome}'")
+
+
+# Script action -> (argument kinds, handler). 'target' arguments are resolved
+# to a combatant index, 'int' converted, 'condition' checked against CONDITIONS,
+# 'duration' against EFFECT_DURATIONS. Timed effects name their source last.
+ACTIONS: dict[str, tuple[tuple[str, ...], Callable]] = {
+    'damage': (('target', 'int'), combat.apply_damage),
+    'heal': (('target', 'int'), combat.apply_healing),
+    'temp': (('target', 'int'), combat.set_temp_hp),
+    'condition': (('target', 'condition'), combat.add_condition),
+    'uncondition': (('target', 'condition'), combat.remove_condition),
+    'timed': (('target', 'condition', 'duration', 'target'), _timed_condition),
+    'effect': (('target', 'str', 'duration', 'target'), combat.add_effect),
+    'concentrate': (('target', 'str', 'duration', 'target'), _concentrate),
+    'break': (('target',), combat.break_concentration),
+    'clear': (('target',), combat.clear_all_conditions),
+    'exhaustion': (('target', 'int'), combat.set_exhaustion),
+    'deathsave': (('target', 'str'), _death_save),
+    'fullheal': (('target',), combat.full_heal),
+    'remove': (('target',), combat.remove_combatant),
+    'start': ((), combat.start_combat),
+    'next': ((), combat.next_turn),
+    'prev': ((), combat.previous_turn),
+    'undo': ((), undo_last_command),
+    'redo': ((), redo_last_command),
+    'end': ((), combat.end_combat),
+}
+
+_CONVERTERS = {'target': _find_target, 'int': int, 'condition': _condition, 'duration': _duration, 'str': str}
+
+
+def parse_script(path: Path) -> list[tuple[int, str, list[str]]]:
+    """Read an action script: one action per line, shell-style quoting, '#' comments.
+
+    Example:
+        start
+        damage "Goblin 1" 7
+        condition Aria prone
+        next
+
+    Returns:
+        (line number, action, arguments) per action
+    """
+    actions = []
+    for number, line in enumerate(path.read_text().splitlines(), start=1):
+        try:
+            tokens = shlex.split(line, comments=True)
+        except ValueError as e:
+            raise CliError(f"{path}:{number}: {e}") from None
+        if not tokens:
+            continue
+        action, *arguments = tokens
+        if action not in ACTIONS:
+            raise CliError(f"{path}:{number}: unknown action '{action}' (one of {', '.join(ACTIONS)})")
+        kinds = ACTIONS[action][0]
+        if len(arguments) != len(kinds):
+            raise CliError(f"{path}:{number}: '{action}' takes {len(kinds)} argument(s): {' '.join(kinds) or 'none'}")
+        actions.append((number, action, arguments))
+    return actions
+
+
+def cmd_replay(args, timings: Timings) -> int:
+    state = timings.time('read', read_save, args.save)
+    script = parse_script(Path(args.script))
+
+    with headless_session():
+        combat.initialize_combat_state()
+        try:
+            success, message = load_combat_state(state)
+            if not success:
+                raise CliError(message)
+            log = get_combat_log()
+            first_seq = len(log)  # Sequence number of the first replayed event
+            for number, action, arguments in script:
+                kinds, handler = ACTIONS[action]
+                try:
+                    values = [_CONVERTERS[kind](arg) for kind, arg in zip(kinds, arguments)]
+                except ValueError as e:
+                    raise CliError(f"{args.script}:{number}: {e}") from None
+                except CliError as e:
+                    raise CliError(f"{args.script}:{number}: {e}") from None
+                timings.time(action, handler, *values)
+
+            for entry in log.get(range(first_seq, len(log))):
+                print(f"[R{entry['round']}] {entry['message']}")
+            print()
+            result = get_combat_state()
+            print(format_combat(result))
+            if args.output:
+                print(f"\nWrote {timings.time('write', write_save, args.output, result)}")
+        finally:
+            get_combat_log().discard()  # Remove the spill file, also when the script failed
+    return 0
+
+
+# =============================================================================
+# convert
+# =============================================================================
+def cmd_convert(args, timings: Timings) -> int:
+    state = timings.time('read', read_save, args.source)
+    destination = timings.time('write', write_save, args.dest, state)
+    print(f"Converted {args.source} -> {destination}")
+    return 0
+
+
+# =============================================================================
+# validate
+# =============================================================================
+def _guess_kind(path: Path) -> str:
+    return SAVE_KINDS.get(path.parent.name, 'combat')
+
+
+def validate_file(path: str, kind: str, upgrade: bool) -> dict:
+    """Validate one save file (runs in a worker process).
+
+    Returns:
+        {'path', 'kind', 'ok', 'error', 'version', 'count', 'upgraded', 'seconds'}
+    """
+    start = time.perf_counter()
+    result = {'path': path, 'kind': kind, 'ok': False, 'error': None, 'version': None,
+              'count': 0, 'upgraded': False}
+    try:
+        text = Path(path).read_text()
+        if kind == 'combat':
+            document = read_combat_state_stream(text)
+            result['count'] = len(document['combatants'])
+        else:
+            document = read_entries_stream(text, kind)
+            if document is None:
+                raise SchemaError(f"no {ENTRY_VALIDATORS[kind][0]} section")
+            result['count'] = len(document)
+        result['ok'] = True
+
+        if upgrade:
+            # The streaming readers don't report the version they upgraded from
+            result['version'] = document_version(json.loads(text))
+            if result['version'] != CURRENT_VERSIONS[kind]:
+                _write_current(path, kind, document)
+                result['upgraded'] = True
+    except json.JSONDecodeError as e:
+        result['error'] = f"invalid JSON ({e})"
+    except (SchemaError, OSError) as e:
+        result['error'] = str(e)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def _write_current(path: str, kind: str, document: dict) -> None:
+    """Rewrite a save in the current format (atomically)."""
+    if kind == 'combat':
+        chunks = iter_combat_state_json({**document, 'version': EXPORT_VERSION})
+    else:
+        wrapper = {ENTRY_VALIDATORS[kind][0]: document, 'version': CURRENT_VERSIONS[kind],
+                   'export_timestamp': datetime.now().isoformat()}
+        chunks = (iter_player_roster_json if kind == 'roster' else iter_monster_library_json)(wrapper)
+    temp = Path(f"{path}.tmp")
+    with open(temp, 'w') as f:
+        write_json_chunks(chunks, f)
+    os.replace(temp, path)
+
+
+def _collect_files(paths: list[str]) -> list[tuple[str, str]]:
+    """(path, kind) of every save under the given files/folders (default: the data folder).
+    
+    Default folders that don't exist yet (nothing saved there) are skipped;
+    paths given explicitly must exist.
+    """
+    if paths:
+        roots = [Path(p) for p in paths]
+    else:
+        default_roots = [data_manager.COMBAT_DIR, data_manager.PLAYER_DIR, data_manager.MONSTER_DIR]
+        roots = [root for root in default_roots if root.exists()]
+    files = []
+    for root in roots:
+        if root.is_dir():
+            files.extend((str(p), _guess_kind(p)) for p in sorted(root.rglob("*.json")))
+        elif root.exists():
+            files.append((str(root), _guess_kind(root)))
+        else:
+            raise CliError(f"No such file or folder: {root}")
+    return files
+
+
+def cmd_validate(args, timings: Timings) -> int:
+    files = _collect_files(args.paths)
+    if not files:
+        print("No save files found")
+        return 0
+
+    start = time.perf_counter()
+    workers = args.workers or None  # None: one per CPU
+    if len(files) == 1 or workers == 1:
+        results = [validate_file(path, kind, args.upgrade) for path, kind in files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(
+                validate_file,
+                [path for path, _ in files],
+                [kind for _, kind in files],
+                [args.upgrade] * len(files),
+                chunksize=max(1, len(files) // (4 * (workers or os.cpu_count() or 1))),
+            ))
+    wall = time.perf_counter() - start
+
+    failed = [r for r in results if not r['ok']]
+    for r in results:
+        if not r['ok']:
+            print(f"FAIL  {r['path']}: {r['error']}")
+        elif r['upgraded'] or args.verbose:
+            note = f" (upgraded from {r['version']})" if r['upgraded'] else ""
+            print(f"ok    {r['path']}: {r['count']} {r['kind']} entries{note}")
+        timings.add(f"validate.{r['kind']}", r['seconds'])
+    if args.timings:
+        print("\nSlowest files:")
+        for r in sorted(results, key=lambda r: r['seconds'], reverse=True)[:5]:
+            print(f"  {r['seconds'] * 1000:9.2f} ms  {r['path']}")
+
+    upgraded = sum(r['upgraded'] for r in results)
+    print(f"\n{len(results) - len(failed)}/{len(results)} valid, {len(failed)} invalid, "
+          f"{upgraded} upgraded in {wall:.2f} s")
+    return 1 if failed else 0
+
+
+# =============================================================================
+# Entry point
+# =============================================================================
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description=__doc__.splitlines()[0])
+    parser.add_argument('--timings', action='store_true', help="Print timing stats per step")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    show = commands.add_parser('show', help="Print a saved combat")
+    show.add_argument('save')
+    show.set_defaults(func=cmd_show)
+
+    replay = commands.add_parser('replay', help="Apply a script of actions to a saved combat",
+                                 description=f"Actions: {', '.join(ACTIONS)}. " + parse_script.__doc__.splitlines()[0])
+    replay.add_argument('save')
+    replay.add_argument('script', help="Action script, one action per line")
+    replay.add_argument('--output', help="Where to save the result (path, sqlite:NAME or history:NAME)")
+    replay.set_defaults(func=cmd_replay)
+
+    convert = commands.add_parser('convert', help="Copy a save to another location/format (upgrading it)")
+    convert.add_argument('source')
+    convert.add_argument('dest')
+    convert.set_defaults(func=cmd_convert)
+
+    validate = commands.add_parser('validate', help="Validate every save (in parallel)")
+    validate.add_argument('paths', nargs='*', help="Files or folders (default: data/combats, players, monsters)")
+    validate.add_argument('--workers', type=int, help="Worker processes (default: one per CPU)")
+    validate.add_argument('--upgrade', action='store_true', help="Rewrite older-version files in the current format")
+    validate.add_argument('--verbose', '-v', action='store_true', help="List valid files too")
+    validate.set_defaults(func=cmd_validate)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    timings = Timings()
+    try:
+        status = args.func(args, timings)
+    except CliError as e:
+        print(f"error: {e}", file=sys.stderr)
+        status = 1
+    if args.timings and timings.durations:
+        timings.print()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,7 @@
 
 import streamlit as st
 from src.utils.command_manager import undo_last_command, redo_last_command, can_undo, can_redo
-from src.utils.combat import next_turn, previous_turn, end_combat
+from src.utils.combat import next_turn, previous_turn, end_combat, start_combat
 
 
 def render_combat_controls() -> None:
@@ -100,11 +100,7 @@ def render_start_combat_button() -> None:
     
     if len(st.session_state.combatants) > 0:
         if st.button("▶️ Start Combat", type="primary", use_container_width=True, key="ctrl_start"):
-            # Sort by initiative (highest first), then by DEX modifier for ties
-            st.session_state.combatants.sort(
-                key=lambda x: (-x['initiative'], -x['dex_modifier'])
-            )
-            st.session_state.combat_active = True
+            start_combat()
             st.rerun()
     else:
         st.markdown(
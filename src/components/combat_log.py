@@ -3,6 +3,8 @@
 
 import streamlit as st
 from src.components.command_history import render_command_history
+from src.utils.combat_log_store import get_combat_log
+from src.utils.models import LogEntry
 from src.config import (
     COMBAT_LOG_DEFAULT_HEIGHT,
     COMBAT_LOG_MIN_HEIGHT,
@@ -47,23 +49,59 @@ def render_log_entries() -> None:
         label_visibility="collapsed"
     )
     
-    combat_log = st.session_state.get('combat_log', [])
+    combat_log = get_combat_log()
     
     if combat_log:
-        log_container = st.container(height=log_height)
-        with log_container:
-            # Show most recent entries first (reversed)
-            for entry in reversed(combat_log[-50:]):
-                st.text(entry)
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            round_filter = st.selectbox(
+                "Round",
+                [None] + combat_log.rounds(),
+                format_func=lambda r: "All rounds" if r is None else f"Round {r}",
+                key="log_round_filter",
+                label_visibility="collapsed"
+            )
+        
+        with col2:
+            actor_filter = st.selectbox(
+                "Combatant",
+                [None] + list(combat_log.actor_names),
+                format_func=lambda a: "Everyone" if a is None else combat_log.actor_names[a],
+                key="log_actor_filter",
+                label_visibility="collapsed"
+            )
+        
+        if round_filter is None and actor_filter is None:
+            entries = combat_log.recent()
+        else:
+            # Indexed lookup, including events already spilled to disk
+            entries = combat_log.filter(round_filter, actor_filter)[::-1]
+        
+        _render_log_table(entries, log_height)
+        
+        if round_filter is None and actor_filter is None and combat_log.spilled_count:
+            st.caption(f"{combat_log.spilled_count} older events on disk - filter by round or combatant to see them")
     else:
         st.info("No events yet. Combat actions will appear here.")
     
     # Clear log button
     if st.button("🗑️ Clear Log", use_container_width=True, key="clear_combat_log"):
-        st.session_state.combat_log = []
+        combat_log.clear()
         st.rerun()
 
 
+def _render_log_table(entries: list[LogEntry], height: int) -> None:
+    """Render log events (newest first) as one scrolling table."""
+    st.dataframe(
+        [{'Rnd': entry.get('round'), 'Event': entry['message']} for entry in entries],
+        height=height,
+        hide_index=True,
+        use_container_width=True,
+        column_config={'Rnd': st.column_config.NumberColumn(width="small")},
+    )
+
+
 def render_combat_log_compact() -> None:
     """Render a compact version of the combat log (no height slider)."""
     
@@ -83,21 +121,17 @@ def render_combat_log_compact() -> None:
     if show_commands:
         render_command_history()
     else:
-        combat_log = st.session_state.get('combat_log', [])
+        combat_log = get_combat_log()
         
         if combat_log:
-            # Show last 20 entries in a scrollable container
-            log_container = st.container(height=250)
-            with log_container:
-                for entry in reversed(combat_log[-20:]):
-                    st.text(entry)
+            _render_log_table(combat_log.recent(), 250)
         else:
             st.caption("No events yet")
 
 
 def get_log_entry_count() -> int:
     """Get the number of entries in the combat log."""
-    return len(st.session_state.get('combat_log', []))
+    return len(get_combat_log())
 
 
 def add_log_entry(message: str) -> None:
@@ -105,6 +139,4 @@ def add_log_entry(message: str) -> None:
     
     Note: Prefer using commands which auto-log. This is for manual entries.
     """
-    if 'combat_log' not in st.session_state:
-        st.session_state.combat_log = []
-    st.session_state.combat_log.append(message)
\ No newline at end of file
+    get_combat_log().append(message, round_number=st.session_state.get('round_number', 1))
\ No newline at end of file
@@ -2,55 +2,22 @@
 """Combat overview dashboard with statistics."""
 
 import streamlit as st
+from src.utils.combat_stats import get_condition_index, read_combat_stats
 
 
 def get_combat_stats() -> dict:
-    """Calculate combat statistics.
+    """Get the combat statistics (maintained incrementally by commands).
     
     Returns:
         Dictionary with combat statistics.
     """
-    combatants = st.session_state.get('combatants', [])
-    
-    total = len(combatants)
-    alive = sum(1 for c in combatants if c['current_hp'] > 0)
-    unconscious = sum(1 for c in combatants if c['current_hp'] == 0)
-    
-    # Count players vs monsters
-    players = sum(1 for c in combatants if c.get('combatant_type') == 'player')
-    monsters = total - players
-    
-    players_alive = sum(
-        1 for c in combatants 
-        if c.get('combatant_type') == 'player' and c['current_hp'] > 0
-    )
-    monsters_alive = sum(
-        1 for c in combatants 
-        if c.get('combatant_type') != 'player' and c['current_hp'] > 0
-    )
-    
-    # Conditions and exhaustion
-    conditioned = sum(1 for c in combatants if c['conditions'])
-    exhausted = sum(1 for c in combatants if c['exhaustion'] > 0)
-    
-    # Stabilized
-    stabilized = sum(
-        1 for c in combatants 
-        if c['current_hp'] == 0 and c.get('is_stable', False)
-    )
-    
-    return {
-        'total': total,
-        'alive': alive,
-        'unconscious': unconscious,
-        'players': players,
-        'monsters': monsters,
-        'players_alive': players_alive,
-        'monsters_alive': monsters_alive,
-        'conditioned': conditioned,
-        'exhausted': exhausted,
-        'stabilized': stabilized,
-    }
+    return read_combat_stats()
+
+
+def _condition_breakdown() -> str | None:
+    """Tooltip for the Conditions metric: how many combatants have each condition."""
+    counts = get_condition_index().counts()
+    return ", ".join(f"{name}: {count}" for name, count in counts.items()) or None
 
 
 def render_combat_overview() -> None:
@@ -74,7 +41,7 @@ def render_combat_overview() -> None:
         st.metric("Down", stats['unconscious'])
     
     with col4:
-        st.metric("Conditions", stats['conditioned'])
+        st.metric("Conditions", stats['conditioned'], help=_condition_breakdown())
     
     with col5:
         st.metric("Exhausted", stats['exhausted'])
@@ -105,7 +72,7 @@ def render_combat_overview_detailed() -> None:
         st.metric("Stabilized", stats['stabilized'])
     
     with col5:
-        st.metric("Conditions", stats['conditioned'])
+        st.metric("Conditions", stats['conditioned'], help=_condition_breakdown())
     
     with col6:
         st.metric("Exhausted", stats['exhausted'])
@@ -132,4 +99,14 @@ def render_combat_overview_detailed() -> None:
             if monsters_down > 0:
                 st.metric("👹 Monsters Down", monsters_down, delta=-monsters_down, delta_color="normal")
             else:
-                st.metric("👹 Monsters Down", 0)
\ No newline at end of file
+                st.metric("👹 Monsters Down", 0)
+    
+    # Row 3: Party health and damage
+    if stats['players'] > 0:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.metric("❤️ Party HP", f"{stats['party_hp_pct']}%", help=f"{stats['party_hp']}/{stats['party_max_hp']} HP")
+        
+        with col2:
+            st.metric("⚔️ Damage This Round", stats['damage_this_round'])
@@ -2,27 +2,81 @@
 """Combatant card display component with multiple view modes."""
 
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
+from src.components.combat_overview import get_combat_stats
 from src.utils.combat import (
     apply_damage, apply_healing, set_temp_hp, remove_combatant,
     add_condition, remove_condition, set_exhaustion, update_death_saves,
-    full_heal, clear_all_conditions,
+    full_heal, clear_all_conditions, add_effect, end_effect, break_concentration,
 )
-from src.constants import CONDITIONS, EXHAUSTION_EFFECTS, ICONS
+from src.utils.command_manager import can_undo, can_redo
+from src.utils.combat_stats import get_condition_index
+from src.utils.conditions import CONDITION_BITS
+from src.utils.effects import concentration_of, describe_expiry, effect_label, effects_on, get_effects_state
+from src.utils.encounter_registry import is_read_only
+from src.utils.profiler import profiled
+from src.utils.session_keys import combatant_key
+from src.utils.view_models import CombatantView, get_combatant_view
+from src.constants import CONDITIONS, EFFECT_DURATIONS, EXHAUSTION_EFFECTS, ICONS
 
+# Session key holding the summary signature from the last full render
+SUMMARY_SIGNATURE_KEY = 'card_summary_signature'
+# Counts shown by the header and overview. HP totals are left out: they change
+# with every damage or heal, which would turn each card action into a full rerun.
+SUMMARY_METRICS = (
+    'total', 'alive', 'unconscious', 'stabilized', 'conditioned', 'exhausted',
+    'players', 'players_alive', 'monsters', 'monsters_alive',
+)
+
+
+def _summary_signature() -> tuple:
+    """Everything outside a card that a card action can change.
+    
+    Covers the header/overview counts (alive, down, conditioned, exhausted, ...),
+    the undo/redo button state and the active effects: starting or ending an
+    effect can change the conditions and effects shown on other cards (the
+    target's, the concentrating source's).
+    """
+    stats = get_combat_stats()
+    return (tuple(stats[name] for name in SUMMARY_METRICS), can_undo(), can_redo(), tuple(get_effects_state()['active']))
 
-def get_hp_color(current: int, maximum: int) -> str:
-    """Return color based on HP percentage."""
-    if current == 0:
-        return "gray"
-    pct = current / maximum
-    if pct > 0.5:
-        return "green"
-    elif pct > 0.25:
-        return "orange"
-    else:
-        return "red"
 
+def remember_summary_signature() -> None:
+    """Record the summary signature the page was rendered with (call once per full run)."""
+    st.session_state[SUMMARY_SIGNATURE_KEY] = _summary_signature()
 
+
+def _rerun_card() -> None:
+    """Rerun only the current card, or the whole app if the summary changed."""
+    if _summary_signature() != st.session_state.get(SUMMARY_SIGNATURE_KEY):
+        st.rerun()
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        # The action was handled during a full run, where fragment reruns aren't allowed
+        st.rerun()
+
+
+@st.fragment
+def render_combatant_card_fragment(index: int, view_mode: str = 'compact'):
+    """Render a combatant card as a fragment so its actions rerun only this card.
+    
+    Takes the index rather than the combatant so fragment reruns read fresh state.
+    Structural changes (removing a combatant, switching view mode) still rerun
+    the whole app.
+    """
+    combatants = st.session_state.get('combatants', [])
+    if index >= len(combatants):
+        return
+    
+    is_current_turn = (
+        st.session_state.get('combat_active', False)
+        and index == st.session_state.get('current_turn_index', 0)
+    )
+    render_combatant_card(combatants[index], index, is_current_turn, view_mode)
+
+
+@profiled()
 def render_combatant_card(combatant: dict, index: int, is_current_turn: bool, view_mode: str = 'compact'):
     """Render a card for a single combatant.
     
@@ -32,106 +86,86 @@ def render_combatant_card(combatant: dict, index: int, is_current_turn: bool, vi
         is_current_turn: Whether this is the active combatant
         view_mode: 'detailed', 'compact', or 'dense'
     """
-    title = _build_card_title(combatant)
+    view = get_combatant_view(combatant)
     
-    if view_mode == 'dense':
-        _render_dense_card(combatant, index, is_current_turn, title)
+    if is_read_only():
+        _render_read_only_card(combatant, is_current_turn, view)
+    elif view_mode == 'dense':
+        _render_dense_card(combatant, index, is_current_turn, view)
     elif view_mode == 'compact':
-        _render_compact_card(combatant, index, is_current_turn, title)
+        _render_compact_card(combatant, index, is_current_turn, view)
     else:
-        _render_detailed_card(combatant, index, is_current_turn, title)
+        _render_detailed_card(combatant, index, is_current_turn, view)
 
 
-def _build_card_title(combatant: dict) -> str:
-    """Build the title string for a combatant card."""
-    name = combatant['name']
-    hp = f"{combatant['current_hp']}/{combatant['max_hp']}"
-    if combatant['temp_hp'] > 0:
-        hp += f"(+{combatant['temp_hp']})"
-    
-    init = combatant['initiative']
-    ac = combatant['ac']
-    
-    # Status icons
-    status = []
-    if combatant['current_hp'] == 0:
-        status.append(ICONS['dead'])
-    elif combatant['current_hp'] < combatant['max_hp'] * 0.25:
-        status.append(ICONS['critical'])
-    if combatant['conditions']:
-        status.append(f"{ICONS['condition']}{len(combatant['conditions'])}")
-    if combatant['exhaustion'] > 0:
-        status.append(f"{ICONS['exhaustion']}{combatant['exhaustion']}")
+def _render_read_only_card(combatant: dict, is_current_turn: bool, view: CombatantView):
+    """Render a card without any controls or notes, for viewers of a shared encounter.
     
-    status_str = " ".join(status) if status else ""
-    
-    # Type icon
-    type_icon = ICONS['player'] if combatant.get('combatant_type') == 'player' else ICONS['monster']
-    
-    title = f"{type_icon} **{name}** | HP: {hp} | Init: {init} | AC: {ac}"
-    if status_str:
-        title += f" | {status_str}"
-    
-    return title
+    Viewers share the encounter snapshot's combatant dicts, so nothing here may write to them.
+    """
+    with st.expander(view.title, expanded=is_current_turn):
+        st.progress(view.hp_pct, text=f"HP: {view.hp_text}")
+        if combatant['conditions']:
+            st.markdown("**Conditions:** " + ", ".join([f"`{c}`" for c in combatant['conditions']]))
+        if combatant['exhaustion'] > 0:
+            st.markdown(f"**Exhaustion:** {combatant['exhaustion']}")
 
 
-def _render_dense_card(combatant: dict, index: int, is_current_turn: bool, title: str):
+def _render_dense_card(combatant: dict, index: int, is_current_turn: bool, view: CombatantView):
     """Render ultra-compact card for dense view."""
     with st.container():
         col1, col2 = st.columns([3, 1])
         
         with col1:
-            st.markdown(f"**{title}**")
+            st.markdown(f"**{view.title}**")
         
         with col2:
-            if st.button(ICONS['delete'], key=f"remove_dense_{index}", help="Remove", use_container_width=True):
+            if st.button(ICONS['delete'], key=combatant_key(combatant, "remove_dense"), help="Remove", use_container_width=True):
                 remove_combatant(index)
                 st.rerun()
         
         # HP bar
-        hp_pct = combatant['current_hp'] / combatant['max_hp'] if combatant['max_hp'] > 0 else 0
-        st.progress(hp_pct, text=f"HP: {combatant['current_hp']}/{combatant['max_hp']}")
+        st.progress(view.hp_pct, text=f"HP: {combatant['current_hp']}/{combatant['max_hp']}")
         
         # Quick actions row
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            with st.form(f"dmg_dense_{index}", clear_on_submit=True):
-                dmg = st.number_input("Damage", 0, 999, 0, key=f"dmg_d_{index}", label_visibility="collapsed")
+            with st.form(combatant_key(combatant, "dmg_dense"), clear_on_submit=True):
+                dmg = st.number_input("Damage", 0, 999, 0, key=combatant_key(combatant, "dmg_d"), label_visibility="collapsed")
                 if st.form_submit_button(ICONS['damage'], use_container_width=True):
                     apply_damage(index, dmg)
-                    st.rerun()
+                    _rerun_card()
         
         with col2:
-            with st.form(f"heal_dense_{index}", clear_on_submit=True):
-                heal = st.number_input("Heal", 0, 999, 0, key=f"heal_d_{index}", label_visibility="collapsed")
+            with st.form(combatant_key(combatant, "heal_dense"), clear_on_submit=True):
+                heal = st.number_input("Heal", 0, 999, 0, key=combatant_key(combatant, "heal_d"), label_visibility="collapsed")
                 if st.form_submit_button(ICONS['heal'], use_container_width=True):
                     apply_healing(index, heal)
-                    st.rerun()
+                    _rerun_card()
         
         with col3:
-            if st.button("📋", key=f"expand_dense_{index}", help="Show details", use_container_width=True):
-                st.session_state[f'expand_{index}'] = not st.session_state.get(f'expand_{index}', False)
-                st.rerun()
+            if st.button("📋", key=combatant_key(combatant, "expand_dense"), help="Show details", use_container_width=True):
+                st.session_state[combatant_key(combatant, 'expand')] = not st.session_state.get(combatant_key(combatant, 'expand'), False)
+                _rerun_card()
         
         # Expandable details
-        if st.session_state.get(f'expand_{index}', False):
+        if st.session_state.get(combatant_key(combatant, 'expand'), False):
             with st.expander("Details", expanded=True):
-                _render_compact_card(combatant, index, is_current_turn, title, in_dense=True)
+                _render_compact_card(combatant, index, is_current_turn, view, in_dense=True)
 
 
-def _render_compact_card(combatant: dict, index: int, is_current_turn: bool, title: str, in_dense: bool = False):
+def _render_compact_card(combatant: dict, index: int, is_current_turn: bool, view: CombatantView, in_dense: bool = False):
     """Render compact card - good balance of info and space."""
     expanded = is_current_turn if not in_dense else True
     
-    with st.expander(title, expanded=expanded):
+    with st.expander(view.title, expanded=expanded):
         # Single row stats
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
             st.markdown(f"**HP:** {combatant['current_hp']}/{combatant['max_hp']}")
-            hp_pct = combatant['current_hp'] / combatant['max_hp'] if combatant['max_hp'] > 0 else 0
-            st.progress(hp_pct, text=None)
+            st.progress(view.hp_pct, text=None)
             if combatant['temp_hp'] > 0:
                 st.caption(f"Temp: {combatant['temp_hp']}")
         
@@ -157,25 +191,25 @@ def _render_compact_card(combatant: dict, index: int, is_current_turn: bool, tit
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            with st.form(f"damage_form_c_{index}", clear_on_submit=True):
-                damage = st.number_input("Damage", min_value=0, step=1, key=f"dmg_c_{index}")
+            with st.form(combatant_key(combatant, "damage_form_c"), clear_on_submit=True):
+                damage = st.number_input("Damage", min_value=0, step=1, key=combatant_key(combatant, "dmg_c"))
                 if st.form_submit_button(ICONS['damage'], use_container_width=True):
                     apply_damage(index, damage)
-                    st.rerun()
+                    _rerun_card()
         
         with col2:
-            with st.form(f"heal_form_c_{index}", clear_on_submit=True):
-                healing = st.number_input("Heal", min_value=0, step=1, key=f"heal_c_{index}")
+            with st.form(combatant_key(combatant, "heal_form_c"), clear_on_submit=True):
+                healing = st.number_input("Heal", min_value=0, step=1, key=combatant_key(combatant, "heal_c"))
                 if st.form_submit_button(ICONS['heal'], use_container_width=True):
                     apply_healing(index, healing)
-                    st.rerun()
+                    _rerun_card()
         
         with col3:
-            with st.form(f"temp_hp_form_c_{index}", clear_on_submit=True):
-                temp_hp = st.number_input("Temp", min_value=0, step=1, key=f"temp_c_{index}")
+            with st.form(combatant_key(combatant, "temp_hp_form_c"), clear_on_submit=True):
+                temp_hp = st.number_input("Temp", min_value=0, step=1, key=combatant_key(combatant, "temp_c"))
                 if st.form_submit_button(ICONS['shield'], use_container_width=True):
                     set_temp_hp(index, temp_hp)
-                    st.rerun()
+                    _rerun_card()
         
         # Conditions display
         if combatant['conditions'] or combatant['exhaustion'] > 0:
@@ -192,14 +226,14 @@ def _render_compact_card(combatant: dict, index: int, is_current_turn: bool, tit
         
         # Full controls button
         if not in_dense:
-            if st.button("⚙️ Full Controls", key=f"full_ctrl_{index}", use_container_width=True):
+            if st.button("⚙️ Full Controls", key=combatant_key(combatant, "full_ctrl"), use_container_width=True):
                 st.session_state.view_mode = 'detailed'
                 st.rerun()
 
 
-def _render_detailed_card(combatant: dict, index: int, is_current_turn: bool, title: str):
+def _render_detailed_card(combatant: dict, index: int, is_current_turn: bool, view: CombatantView):
     """Render full detailed card - original view."""
-    with st.expander(title, expanded=is_current_turn):
+    with st.expander(view.title, expanded=is_current_turn):
         # Type-specific header
         if combatant.get('combatant_type') == 'player':
             st.markdown(f"**{ICONS['player']} Player Character** - {combatant.get('class_name', 'Unknown')} (Level {combatant.get('level', '?')})")
@@ -217,9 +251,8 @@ def _render_detailed_card(combatant: dict, index: int, is_current_turn: bool, ti
         col1, col2, col3 = st.columns([2, 1, 1])
         
         with col1:
-            hp_pct = combatant['current_hp'] / combatant['max_hp'] if combatant['max_hp'] > 0 else 0
             st.markdown(f"**HP:** {combatant['current_hp']} / {combatant['max_hp']}")
-            st.progress(hp_pct, text=None)
+            st.progress(view.hp_pct, text=None)
             if combatant['temp_hp'] > 0:
                 st.markdown(f"**Temp HP:** {combatant['temp_hp']}")
         
@@ -234,25 +267,25 @@ def _render_detailed_card(combatant: dict, index: int, is_current_turn: bool, ti
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            with st.form(f"damage_form_{index}", clear_on_submit=True):
-                damage = st.number_input("Damage", min_value=0, step=1, key=f"dmg_{index}")
+            with st.form(combatant_key(combatant, "damage_form"), clear_on_submit=True):
+                damage = st.number_input("Damage", min_value=0, step=1, key=combatant_key(combatant, "dmg"))
                 if st.form_submit_button(f"{ICONS['damage']} Apply Damage", use_container_width=True):
                     apply_damage(index, damage)
-                    st.rerun()
+                    _rerun_card()
         
         with col2:
-            with st.form(f"heal_form_{index}", clear_on_submit=True):
-                healing = st.number_input("Healing", min_value=0, step=1, key=f"heal_{index}")
+            with st.form(combatant_key(combatant, "heal_form"), clear_on_submit=True):
+                healing = st.number_input("Healing", min_value=0, step=1, key=combatant_key(combatant, "heal"))
                 if st.form_submit_button(f"{ICONS['heal']} Heal", use_container_width=True):
                     apply_healing(index, healing)
-                    st.rerun()
+                    _rerun_card()
         
         with col3:
-            with st.form(f"temp_hp_form_{index}", clear_on_submit=True):
-                temp_hp = st.number_input("Temp HP", min_value=0, step=1, key=f"temp_{index}")
+            with st.form(combatant_key(combatant, "temp_hp_form"), clear_on_submit=True):
+                temp_hp = st.number_input("Temp HP", min_value=0, step=1, key=combatant_key(combatant, "temp"))
                 if st.form_submit_button(f"{ICONS['shield']} Set Temp HP", use_container_width=True):
                     set_temp_hp(index, temp_hp)
-                    st.rerun()
+                    _rerun_card()
         
         # Conditions and Exhaustion
         st.markdown("---")
@@ -276,24 +309,34 @@ def _render_detailed_card(combatant: dict, index: int, is_current_turn: bool, ti
                 new_condition = st.selectbox(
                     "Add condition",
                     [""] + available,
-                    key=f"add_cond_{index}",
+                    key=combatant_key(combatant, "add_cond"),
+                    label_visibility="collapsed"
+                )
+                duration = st.selectbox(
+                    "Duration",
+                    list(EFFECT_DURATIONS),
+                    format_func=EFFECT_DURATIONS.get,
+                    key=combatant_key(combatant, "cond_duration"),
                     label_visibility="collapsed"
                 )
-                if new_condition and st.button(f"{ICONS['add']} Add", key=f"btn_add_cond_{index}", use_container_width=True):
-                    add_condition(index, new_condition)
-                    st.rerun()
+                if new_condition and st.button(f"{ICONS['add']} Add", key=combatant_key(combatant, "btn_add_cond"), use_container_width=True):
+                    if duration == 'permanent':
+                        add_condition(index, new_condition)
+                    else:
+                        add_effect(index, new_condition, duration, _default_source(index), condition=new_condition)
+                    _rerun_card()
             
             with col_remove:
                 if combatant['conditions']:
                     remove_cond = st.selectbox(
                         "Remove condition",
                         [""] + combatant['conditions'],
-                        key=f"remove_cond_{index}",
+                        key=combatant_key(combatant, "remove_cond"),
                         label_visibility="collapsed"
                     )
-                    if remove_cond and st.button(f"{ICONS['remove']} Remove", key=f"btn_remove_cond_{index}", use_container_width=True):
+                    if remove_cond and st.button(f"{ICONS['remove']} Remove", key=combatant_key(combatant, "btn_remove_cond"), use_container_width=True):
                         remove_condition(index, remove_cond)
-                        st.rerun()
+                        _rerun_card()
         
         with col2:
             st.markdown("**Exhaustion Level:**")
@@ -309,14 +352,18 @@ def _render_detailed_card(combatant: dict, index: int, is_current_turn: bool, ti
             col_minus, col_plus = st.columns(2)
             
             with col_minus:
-                if st.button(ICONS['remove'], key=f"exhaust_minus_{index}", use_container_width=True, disabled=current_exhaustion == 0):
+                if st.button(ICONS['remove'], key=combatant_key(combatant, "exhaust_minus"), use_container_width=True, disabled=current_exhaustion == 0):
                     set_exhaustion(index, max(0, current_exhaustion - 1))
-                    st.rerun()
+                    _rerun_card()
             
             with col_plus:
-                if st.button(ICONS['add'], key=f"exhaust_plus_{index}", use_container_width=True, disabled=current_exhaustion >= 6):
+                if st.button(ICONS['add'], key=combatant_key(combatant, "exhaust_plus"), use_container_width=True, disabled=current_exhaustion >= 6):
                     set_exhaustion(index, min(6, current_exhaustion + 1))
-                    st.rerun()
+                    _rerun_card()
+        
+        # Timed effects and concentration
+        st.markdown("---")
+        _render_effects(combatant, index)
         
         # Quick Actions
         st.markdown("---")
@@ -339,7 +386,7 @@ def _render_detailed_card(combatant: dict, index: int, is_current_turn: bool, ti
         notes = st.text_area(
             "Notes",
             value=combatant['notes'],
-            key=f"notes_{index}",
+            key=combatant_key(combatant, "notes"),
             height=150,
             label_visibility="collapsed"
         )
@@ -348,47 +395,106 @@ def _render_detailed_card(combatant: dict, index: int, is_current_turn: bool, ti
         
         # Remove button
         st.markdown("---")
-        if st.button(f"{ICONS['delete']} Remove from Combat", key=f"remove_{index}", type="secondary", use_container_width=True):
+        if st.button(f"{ICONS['delete']} Remove from Combat", key=combatant_key(combatant, "remove"), type="secondary", use_container_width=True):
             remove_combatant(index)
             st.rerun()
 
 
+def _default_source(index: int) -> int:
+    """Whoever's turn it is during combat, otherwise the combatant itself"""
+    if st.session_state.get('combat_active', False):
+        return st.session_state.current_turn_index
+    return index
+
+
+def _render_effects(combatant: dict, index: int):
+    """Render timed effects on a combatant and what it is concentrating on"""
+    st.markdown("### ⏳ Effects")
+    
+    effects = effects_on(combatant)
+    if not effects:
+        st.text("None")
+    for effect in effects:
+        col_name, col_end = st.columns([4, 1])
+        with col_name:
+            icon = "🧠 " if effect['concentration'] else ""
+            st.markdown(f"{icon}**{effect['name']}** — {describe_expiry(effect)}")
+        with col_end:
+            if st.button("End", key=combatant_key(combatant, f"end_effect_{effect['id']}"), use_container_width=True):
+                end_effect(effect['id'])
+                _rerun_card()
+    
+    concentrating = concentration_of(combatant)
+    if concentrating:
+        col_conc, col_break = st.columns([4, 1])
+        with col_conc:
+            st.markdown("🧠 Concentrating on " + ", ".join(effect_label(effect) for effect in concentrating))
+        with col_break:
+            if st.button("Break", key=combatant_key(combatant, "break_conc"), use_container_width=True):
+                break_concentration(index)
+                _rerun_card()
+    
+    combatants = st.session_state.combatants
+    # Options are ids, so a remembered choice follows the combatant when the order changes
+    positions = {c['id']: i for i, c in enumerate(combatants)}
+    with st.form(combatant_key(combatant, "effect_form"), clear_on_submit=True):
+        col_name, col_duration, col_source = st.columns(3)
+        with col_name:
+            name = st.text_input("Effect", placeholder="e.g. Bless", key=combatant_key(combatant, "effect_name"))
+        with col_duration:
+            duration = st.selectbox(
+                "Duration", list(EFFECT_DURATIONS), index=list(EFFECT_DURATIONS).index('minute'),
+                format_func=EFFECT_DURATIONS.get, key=combatant_key(combatant, "effect_duration"),
+            )
+        with col_source:
+            source = st.selectbox(
+                "Source", list(positions), index=_default_source(index),
+                format_func=lambda combatant_id: combatants[positions[combatant_id]]['name'],
+                key=combatant_key(combatant, "effect_source"),
+            )
+        concentration = st.checkbox("Source is concentrating", key=combatant_key(combatant, "effect_conc"))
+        if st.form_submit_button(f"{ICONS['add']} Add Effect", use_container_width=True) and name.strip():
+            add_effect(index, name.strip(), duration, positions[source], concentration=concentration)
+            _rerun_card()
+
+
 def _render_quick_actions(combatant: dict, index: int):
     """Render quick action buttons."""
     st.markdown("### ⚡ Quick Actions")
     
+    conditions = get_condition_index().mask(combatant['id'])  # Kept up to date by commands
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        if "Prone" in combatant['conditions']:
-            if st.button("🧍 Stand Up", key=f"standup_{index}", use_container_width=True):
+        if conditions & CONDITION_BITS["Prone"]:
+            if st.button("🧍 Stand Up", key=combatant_key(combatant, "standup"), use_container_width=True):
                 remove_condition(index, "Prone")
-                st.rerun()
+                _rerun_card()
         else:
-            if st.button("🤕 Knock Prone", key=f"prone_{index}", use_container_width=True):
+            if st.button("🤕 Knock Prone", key=combatant_key(combatant, "prone"), use_container_width=True):
                 add_condition(index, "Prone")
-                st.rerun()
+                _rerun_card()
     
     with col2:
-        if "Unconscious" in combatant['conditions']:
-            if st.button("😊 Wake Up", key=f"wakeup_{index}", use_container_width=True):
+        if conditions & CONDITION_BITS["Unconscious"]:
+            if st.button("😊 Wake Up", key=combatant_key(combatant, "wakeup"), use_container_width=True):
                 remove_condition(index, "Unconscious")
-                st.rerun()
+                _rerun_card()
         else:
-            if st.button("😵 Unconscious", key=f"unconscious_{index}", use_container_width=True):
+            if st.button("😵 Unconscious", key=combatant_key(combatant, "unconscious"), use_container_width=True):
                 add_condition(index, "Unconscious")
-                st.rerun()
+                _rerun_card()
     
     with col3:
-        if st.button("✨ Full Heal", key=f"fullheal_{index}", use_container_width=True, type="primary"):
+        if st.button("✨ Full Heal", key=combatant_key(combatant, "fullheal"), use_container_width=True, type="primary"):
             full_heal(index)
-            st.rerun()
+            _rerun_card()
     
     with col4:
         if combatant['conditions']:
-            if st.button("🧹 Clear Conditions", key=f"clearcond_{index}", use_container_width=True):
+            if st.button("🧹 Clear Conditions", key=combatant_key(combatant, "clearcond"), use_container_width=True):
                 clear_all_conditions(index)
-                st.rerun()
+                _rerun_card()
 
 
 def _render_death_saves(combatant: dict, index: int):
@@ -403,9 +509,9 @@ def _render_death_saves(combatant: dict, index: int):
         success_str = f"{ICONS['success']} " * success_count + f"{ICONS['empty']} " * (3 - success_count)
         st.markdown(success_str)
         
-        if st.button(f"{ICONS['add']} Success", key=f"success_{index}", use_container_width=True):
+        if st.button(f"{ICONS['add']} Success", key=combatant_key(combatant, "success"), use_container_width=True):
             update_death_saves(index, success_delta=1)
-            st.rerun()
+            _rerun_card()
     
     with col2:
         st.markdown("**Failures**")
@@ -413,14 +519,14 @@ def _render_death_saves(combatant: dict, index: int):
         failure_str = f"{ICONS['failure']} " * failure_count + f"{ICONS['empty']} " * (3 - failure_count)
         st.markdown(failure_str)
         
-        if st.button(f"{ICONS['add']} Failure", key=f"failure_{index}", use_container_width=True):
+        if st.button(f"{ICONS['add']} Failure", key=combatant_key(combatant, "failure"), use_container_width=True):
             update_death_saves(index, failure_delta=1)
-            st.rerun()
+            _rerun_card()
     
     with col3:
         if combatant['is_stable']:
             st.success("Stable")
         
-        if st.button("🔄 Reset", key=f"reset_death_{index}", use_container_width=True):
+        if st.button("🔄 Reset", key=combatant_key(combatant, "reset_death"), use_container_width=True):
             update_death_saves(index, reset=True)
-            st.rerun()
\ No newline at end of file
+            _rerun_card()
\ No newline at end of file
@@ -0,0 +1,125 @@
+# src/components/combatant_grid.py
+"""Grid view: bulk-edit all combatants in one table."""
+
+import streamlit as st
+from src.utils.combat import apply_batch_edit, ensure_combatant_ids
+from src.constants import CONDITIONS, ICONS
+from src.config import MAX_INITIATIVE, MIN_INITIATIVE, MAX_AC, MIN_AC, MAX_EXHAUSTION, MAX_HP
+
+# Editable grid columns -> combatant fields
+GRID_FIELDS = {
+    'Init': 'initiative',
+    'HP': 'current_hp',
+    'Temp HP': 'temp_hp',
+    'AC': 'ac',
+    'Conditions': 'conditions',
+    'Exhaustion': 'exhaustion',
+}
+
+
+def render_combatant_grid():
+    """Render all combatants as one editable table.
+
+    Edits are only applied when the form is submitted, so any number of
+    changes cost a single rerun and a single undo step.
+    """
+    combatants = st.session_state.get('combatants', [])
+    ensure_combatant_ids(combatants)
+    current_turn_index = st.session_state.get('current_turn_index', 0)
+    combat_active = st.session_state.get('combat_active', False)
+
+    rows = []
+    for idx, c in enumerate(combatants):
+        type_icon = ICONS['player'] if c.get('combatant_type') == 'player' else ICONS['monster']
+        turn_marker = "🎯 " if combat_active and idx == current_turn_index else ""
+        rows.append({
+            'id': c['id'],
+            'Name': f"{turn_marker}{type_icon} {c['name']}",
+            'Init': c['initiative'],
+            'HP': c['current_hp'],
+            'Max HP': c['max_hp'],
+            'Temp HP': c['temp_hp'],
+            'AC': c['ac'],
+            'Conditions': list(c['conditions']),
+            'Exhaustion': c['exhaustion'],
+        })
+
+    with st.form("combatant_grid_form"):
+        edited = st.data_editor(
+            rows,
+            key="combatant_grid",
+            hide_index=True,
+            num_rows="fixed",
+            use_container_width=True,
+            disabled=['Name', 'Max HP'],
+            column_config={
+                'id': None,
+                'Init': st.column_config.NumberColumn(min_value=MIN_INITIATIVE, max_value=MAX_INITIATIVE, step=1),
+                'HP': st.column_config.NumberColumn(min_value=0, max_value=MAX_HP, step=1),
+                'Temp HP': st.column_config.NumberColumn(min_value=0, max_value=MAX_HP, step=1),
+                'AC': st.column_config.NumberColumn(min_value=MIN_AC, max_value=MAX_AC, step=1),
+                'Conditions': st.column_config.MultiselectColumn(options=CONDITIONS),
+                'Exhaustion': st.column_config.NumberColumn(min_value=0, max_value=MAX_EXHAUSTION, step=1),
+            },
+        )
+
+        submitted = st.form_submit_button("💾 Apply Changes", type="primary", use_container_width=True)
+
+    if submitted:
+        changes = diff_grid_rows(combatants, edited)
+        if changes:
+            apply_batch_edit(changes)
+            st.rerun()
+        else:
+            st.info("No changes to apply")
+
+
+def diff_grid_rows(combatants: list, rows: list[dict]) -> dict[int, dict]:
+    """Compare edited grid rows with the current combatants.
+
+    Rows are matched by combatant id, so a combatant removed or reordered
+    since the grid was drawn is skipped rather than overwritten.
+
+    Returns:
+        {index: {field: new_value}} for combatants with at least one change
+    """
+    index_by_id = {c['id']: idx for idx, c in enumerate(combatants)}
+    changes = {}
+
+    for row in rows:
+        idx = index_by_id.get(row.get('id'))
+        if idx is None:
+            continue
+        combatant = combatants[idx]
+
+        fields = {}
+        for column, field in GRID_FIELDS.items():
+            value = row.get(column)
+            if value is None:
+                continue  # Cleared cell - keep the current value
+            if field == 'conditions':
+                value = _merge_conditions(combatant['conditions'], value)
+            else:
+                # data_editor can hand back floats / numpy ints
+                value = int(value)
+            if field == 'current_hp':
+                value = min(value, combatant['max_hp'])
+            if value != combatant[field]:
+                fields[field] = value
+
+        if fields:
+            changes[idx] = fields
+
+    return changes
+
+
+def _merge_conditions(current: list[str], edited: list[str]) -> list[str]:
+    """Conditions after a grid edit, compared as a set with the current ones.
+
+    Conditions still selected keep their order and newly selected ones are
+    appended, so an untouched cell gives back the current list unchanged.
+    Non-standard conditions, which the grid can't offer as options, are kept.
+    """
+    selected = set(edited)
+    kept = [c for c in current if c in selected or c not in CONDITIONS]
+    return kept + [c for c in CONDITIONS if c in selected and c not in current]
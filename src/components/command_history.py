@@ -1,6 +1,6 @@
 # src/components/command_history.py
 import streamlit as st
-from src.utils.command_manager import get_command_history
+from src.utils.command_manager import get_command_history, get_command_details
 
 def render_command_history():
     """Render the command history viewer"""
@@ -12,23 +12,32 @@ def render_command_history():
         return
     
     st.markdown(f"**📋 Command History ({len(history)} commands)**")
-    st.caption("Shows last 50 commands. Current position marked with →")
+    st.caption("Shows last 50 commands. Current position marked with →. Select a row for technical details.")
     
-    # Show with position indicator
     current_pos = st.session_state.get('command_stack_position', -1)
     
-    # Create container with scroll
-    container = st.container(height=400)
+    # One table for the whole stack; descriptions were stored when each command ran
+    rows = []
+    for idx, description in enumerate(history):
+        if idx == current_pos:
+            status = "→"
+        elif idx < current_pos:
+            status = ""
+        else:
+            status = "undone"
+        rows.append({'#': idx + 1, 'Status': status, 'Command': description})
     
-    with container:
-        for idx, (description, technical) in enumerate(history):
-            # Mark current position
-            if idx == current_pos:
-                st.markdown(f"**→ {idx + 1}.** {description}")
-                with st.expander("🔍 Technical details", expanded=False):
-                    st.code(technical, language="python")
-            elif idx <= current_pos:
-                st.markdown(f"{idx + 1}. {description}")
-            else:
-                # Grayed out for undone commands
-                st.markdown(f"~~{idx + 1}. {description}~~ *(undone)*")
\ No newline at end of file
+    event = st.dataframe(
+        rows,
+        key="command_history_table",
+        hide_index=True,
+        use_container_width=True,
+        height=400,
+        on_select="rerun",
+        selection_mode="single-row",
+    )
+    
+    # Technical details only for the selected command
+    selected = event.selection.rows
+    if selected and selected[0] < len(history):
+        st.code(get_command_details(selected[0]), language="python")
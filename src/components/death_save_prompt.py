@@ -1,9 +1,11 @@
 import streamlit as st
 from src.utils.combat import update_death_saves
+from src.utils.session_keys import combatant_key
 import random
 
 def render_death_save_prompt(combatant, index):
     """Render death saving throw prompt for unconscious players"""
+    roll_key = combatant_key(combatant, 'death_roll_result')
     
     st.markdown("---")
     
@@ -45,68 +47,68 @@ def render_death_save_prompt(combatant, index):
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        if st.button("🎲 Roll d20", key=f"death_roll_{index}", use_container_width=True, type="primary"):
+        if st.button("🎲 Roll d20", key=combatant_key(combatant, "death_roll"), use_container_width=True, type="primary"):
             roll = random.randint(1, 20)
-            st.session_state[f'death_roll_result_{index}'] = roll
+            st.session_state[roll_key] = roll
             st.rerun()
     
     with col2:
-        manual_roll = st.number_input("Or enter:", min_value=1, max_value=20, value=10, key=f"death_manual_{index}", label_visibility="collapsed")
-        if st.button("Use Manual", key=f"death_use_manual_{index}", use_container_width=True):
-            st.session_state[f'death_roll_result_{index}'] = manual_roll
+        manual_roll = st.number_input("Or enter:", min_value=1, max_value=20, value=10, key=combatant_key(combatant, "death_manual"), label_visibility="collapsed")
+        if st.button("Use Manual", key=combatant_key(combatant, "death_use_manual"), use_container_width=True):
+            st.session_state[roll_key] = manual_roll
             st.rerun()
     
     with col3:
-        if st.button("✅ Success", key=f"death_success_{index}", use_container_width=True):
-            st.session_state[f'death_roll_result_{index}'] = None
+        if st.button("✅ Success", key=combatant_key(combatant, "death_success"), use_container_width=True):
+            st.session_state[roll_key] = None
             update_death_saves(index, success_delta=1)
             st.rerun()
     
     with col4:
-        if st.button("❌ Failure", key=f"death_failure_{index}", use_container_width=True):
-            st.session_state[f'death_roll_result_{index}'] = None
+        if st.button("❌ Failure", key=combatant_key(combatant, "death_failure"), use_container_width=True):
+            st.session_state[roll_key] = None
             update_death_saves(index, failure_delta=1)
             st.rerun()
     
     # Show roll result if rolled
-    if f'death_roll_result_{index}' in st.session_state and st.session_state[f'death_roll_result_{index}'] is not None:
-        roll = st.session_state[f'death_roll_result_{index}']
+    if roll_key in st.session_state and st.session_state[roll_key] is not None:
+        roll = st.session_state[roll_key]
         
         st.markdown("---")
         
         if roll == 20:
             st.success(f"### 🎉 NATURAL 20! - {combatant['name']} regains 1 HP!")
-            if st.button("✨ Apply Recovery", key=f"death_nat20_{index}", use_container_width=True, type="primary"):
+            if st.button("✨ Apply Recovery", key=combatant_key(combatant, "death_nat20"), use_container_width=True, type="primary"):
                 from src.utils.combat import apply_healing
                 apply_healing(index, 1)
-                st.session_state[f'death_roll_result_{index}'] = None
+                st.session_state[roll_key] = None
                 st.rerun()
         
         elif roll == 1:
             st.error(f"### 💀 NATURAL 1! - TWO failures!")
-            if st.button("Apply 2 Failures", key=f"death_nat1_{index}", use_container_width=True):
+            if st.button("Apply 2 Failures", key=combatant_key(combatant, "death_nat1"), use_container_width=True):
                 update_death_saves(index, failure_delta=2)
-                st.session_state[f'death_roll_result_{index}'] = None
+                st.session_state[roll_key] = None
                 st.rerun()
         
         elif roll >= 10:
             st.success(f"### ✅ SUCCESS (rolled {roll})")
-            if st.button("Apply Success", key=f"death_apply_success_{index}", use_container_width=True):
+            if st.button("Apply Success", key=combatant_key(combatant, "death_apply_success"), use_container_width=True):
                 update_death_saves(index, success_delta=1)
-                st.session_state[f'death_roll_result_{index}'] = None
+                st.session_state[roll_key] = None
                 st.rerun()
         
         else:
             st.error(f"### ❌ FAILURE (rolled {roll})")
-            if st.button("Apply Failure", key=f"death_apply_failure_{index}", use_container_width=True):
+            if st.button("Apply Failure", key=combatant_key(combatant, "death_apply_failure"), use_container_width=True):
                 update_death_saves(index, failure_delta=1)
-                st.session_state[f'death_roll_result_{index}'] = None
+                st.session_state[roll_key] = None
                 st.rerun()
         
         col1, col2 = st.columns(2)
         with col1:
-            if st.button("🔄 Reroll", key=f"death_reroll_{index}", use_container_width=True):
-                st.session_state[f'death_roll_result_{index}'] = None
+            if st.button("🔄 Reroll", key=combatant_key(combatant, "death_reroll"), use_container_width=True):
+                st.session_state[roll_key] = None
                 st.rerun()
     
     st.markdown("---")
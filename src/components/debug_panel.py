@@ -0,0 +1,163 @@
+# src/components/debug_panel.py
+"""Debug panel: session state, memory and profiling (DEBUG_MODE only)."""
+
+import html
+import streamlit as st
+from src.config import MEMORY_BUDGETS
+from src.utils.memory import TRACE_KEY, enforce_memory_budgets, measure_session_memory
+from src.utils.profiler import (
+    ENABLED_KEY, RerunProfile, export_chrome_trace, export_profile_json, get_profiler, is_enabled,
+)
+from src.utils.session_keys import collect_session_garbage, session_size_by_category
+
+# Flame graph colours, cycled by depth
+FLAME_COLORS = ["#e4572e", "#f3a712", "#a8c686", "#669bbc", "#7b6d8d"]
+
+
+def render_debug_panel() -> None:
+    """Render session-state size per category, memory accounting and the rerun profiler."""
+
+    with st.expander("🛠️ Debug: Session State", expanded=False):
+        rows = session_size_by_category()
+        total_keys = sum(row['keys'] for row in rows)
+        total_bytes = sum(row['bytes'] for row in rows)
+
+        st.caption(f"{total_keys} keys · ~{total_bytes / 1024:.1f} KiB (pickled)")
+        st.dataframe(
+            rows,
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                'category': st.column_config.TextColumn("Category"),
+                'keys': st.column_config.NumberColumn("Keys"),
+                'bytes': st.column_config.NumberColumn("Bytes", format="%d"),
+            },
+        )
+
+        if st.button("🧹 Collect Garbage", key="debug_collect_garbage", use_container_width=True):
+            removed = collect_session_garbage()
+            st.success(f"Removed {removed} stale key(s)")
+
+    with st.expander("🧠 Debug: Memory", expanded=False):
+        _render_memory()
+
+    with st.expander("⏱️ Debug: Profiler", expanded=False):
+        _render_profiler()
+
+
+def _render_memory() -> None:
+    """Deep sizes against budgets, budget enforcement and tracemalloc diffs."""
+    sizes = measure_session_memory()
+    st.dataframe(
+        [
+            {'value': key, 'kib': size / 1024, 'budget_kib': MEMORY_BUDGETS[key] / 1024 if key in MEMORY_BUDGETS else None}
+            for key, size in sizes.items()
+        ],
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            'value': st.column_config.TextColumn("Session value"),
+            'kib': st.column_config.NumberColumn("KiB", format="%.1f"),
+            'budget_kib': st.column_config.NumberColumn("Budget KiB", format="%.0f"),
+        },
+    )
+
+    last_trim = st.session_state.get('memory_last_trim')
+    if last_trim:
+        st.caption("Last automatic trim: " + "; ".join(last_trim))
+
+    if st.button("✂️ Enforce Budgets", key="debug_enforce_budgets", use_container_width=True):
+        actions = enforce_memory_budgets()
+        if actions:
+            st.success("; ".join(actions))
+        else:
+            st.info("Everything is within budget")
+
+    st.toggle("Trace allocations (tracemalloc)", key=TRACE_KEY,
+              help="Shows allocation growth between reruns; slows every rerun while on")
+    diff = st.session_state.get('memory_alloc_diff')
+    if st.session_state.get(TRACE_KEY) and diff:
+        st.caption("Top allocation growth since the previous rerun")
+        st.dataframe(
+            diff,
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                'size_diff': st.column_config.NumberColumn("Δ bytes"),
+                'count_diff': st.column_config.NumberColumn("Δ blocks"),
+                'size': st.column_config.NumberColumn("Bytes"),
+            },
+        )
+
+
+def _render_profiler() -> None:
+    """Toggle, per-function totals and a flame view of recent reruns."""
+    st.toggle("Profile reruns", value=is_enabled(), key=ENABLED_KEY)
+
+    runs = list(get_profiler().runs)
+    if not runs:
+        st.caption("No profiled reruns yet. Enable profiling and interact with the app.")
+        return
+
+    # Totals per function over all kept reruns
+    totals: dict[str, dict] = {}
+    for run in runs:
+        for name, stats in run.call_stats().items():
+            entry = totals.setdefault(name, {'function': name, 'calls': 0, 'ms': 0.0, 'deepcopy_kib': 0.0})
+            entry['calls'] += stats['calls']
+            entry['ms'] += stats['seconds'] * 1000
+            entry['deepcopy_kib'] += stats['deepcopy_bytes'] / 1024
+    st.caption(f"Last {len(runs)} rerun(s)")
+    st.dataframe(
+        sorted(totals.values(), key=lambda row: row['ms'], reverse=True),
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            'ms': st.column_config.NumberColumn("Total ms", format="%.1f"),
+            'deepcopy_kib': st.column_config.NumberColumn("Deepcopy KiB", format="%.1f"),
+        },
+    )
+
+    # Flame view of one rerun, newest first
+    choice = st.selectbox(
+        "Rerun",
+        range(len(runs) - 1, -1, -1),
+        format_func=lambda i: f"#{i + 1} {runs[i].label} · {runs[i].duration * 1000:.0f} ms",
+        key="profiler_rerun_select",
+    )
+    st.markdown(_flame_html(runs[choice]), unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "JSON", export_profile_json(runs), file_name="profile.json",
+            mime="application/json", use_container_width=True,
+        )
+    with col2:
+        st.download_button(
+            "Chrome trace", export_chrome_trace(runs), file_name="profile.trace.json",
+            mime="application/json", use_container_width=True,
+            help="Open in chrome://tracing or ui.perfetto.dev",
+        )
+
+
+def _flame_html(run: RerunProfile) -> str:
+    """Render one rerun as stacked bars: one row per call depth, widths proportional to time."""
+    total = run.duration or 1e-9
+    depth = max((span.depth for span in run.spans), default=0) + 1
+    bars = []
+    for span in run.spans:
+        left = 100 * span.start / total
+        width = max(100 * span.duration / total, 0.2)
+        label = html.escape(span.name.rsplit('.', 1)[-1])
+        title = html.escape(f"{span.name}: {span.duration * 1000:.2f} ms, {span.deepcopy_bytes} deepcopy bytes")
+        bars.append(
+            f"<div title='{title}' style='position:absolute; left:{left:.2f}%; width:{width:.2f}%; "
+            f"top:{span.depth * 18}px; height:16px; overflow:hidden; white-space:nowrap; "
+            f"font-size:10px; line-height:16px; padding-left:2px; box-sizing:border-box; "
+            f"background:{FLAME_COLORS[span.depth % len(FLAME_COLORS)]}; color:#111;'>{label}</div>"
+        )
+    return (
+        f"<div style='position:relative; width:100%; height:{depth * 18}px; margin-bottom:0.5rem;'>"
+        + "".join(bars) + "</div>"
+    )
@@ -0,0 +1,68 @@
+# src/components/encounter_share.py
+"""Sidebar controls for sharing an encounter with other devices."""
+
+import streamlit as st
+from src.utils.encounter_registry import (
+    PLAYER_PARAM,
+    PLAYER_VIEW,
+    VIEW_PARAM,
+    get_encounter_role,
+    get_session_encounter,
+    host_encounter,
+    join_encounter,
+    leave_encounter,
+)
+
+
+def render_encounter_share() -> None:
+    """Render hosting/joining controls, or the status of the shared encounter."""
+
+    role = get_encounter_role()
+    with st.expander("📡 Shared Encounter", expanded=role is not None):
+        if role is None:
+            _render_not_shared()
+            return
+
+        encounter = get_session_encounter()
+        if encounter is None:
+            st.caption("The shared encounter has ended.")
+            return
+
+        label = encounter.name or encounter.encounter_id
+        if role == 'writer':
+            st.success(f"Sharing **{label}** · version {encounter.version}")
+            st.caption(f"👀 {encounter.active_viewers()} viewer(s) watching")
+            st.code(_player_link(encounter.player_token), language=None)
+            st.caption(
+                f"Players open this link to follow the turn order. Code **{encounter.encounter_id}** "
+                "joins the full tracker read-only (with exact monster HP and AC), so only give it to "
+                "co-DMs. Keep your own URL to stay the DM after a refresh."
+            )
+            st.button("⏹️ Stop Sharing", use_container_width=True, key="share_stop", on_click=leave_encounter)
+        else:
+            st.info(f"Viewing **{label}** (read-only) · version {encounter.version}")
+            st.button("🚪 Leave", use_container_width=True, key="share_leave", on_click=leave_encounter)
+
+
+def _render_not_shared() -> None:
+    """Host the current encounter or join another one."""
+
+    st.text_input("Encounter name", key="share_name", placeholder="e.g. Goblin Ambush")
+    if st.button("📡 Share This Encounter", use_container_width=True, key="share_host"):
+        host_encounter(st.session_state.get('share_name', ""))
+        st.rerun()
+
+    st.divider()
+
+    code = st.text_input("Encounter code", key="share_join_code", placeholder="Code from the DM")
+    if st.button("👀 Join as Viewer", use_container_width=True, key="share_join", disabled=not code):
+        success, message = join_encounter(code)
+        if success:
+            st.rerun()
+        st.error(message)
+
+
+def _player_link(player_token: str) -> str:
+    """Link to the player page: this page's URL with only the view and player token parameters."""
+    base = (st.context.url or "").split('?', 1)[0]
+    return f"{base}?{VIEW_PARAM}={PLAYER_VIEW}&{PLAYER_PARAM}={player_token}"
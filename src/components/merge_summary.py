@@ -0,0 +1,48 @@
+"""Merge policy selection and import summary display."""
+
+import streamlit as st
+from src.config import DEFAULT_MERGE_POLICY
+from src.utils.merge import MERGE_POLICIES
+
+
+def render_merge_policy_select(key: str) -> str:
+    """Render the conflict policy selector for an import. Returns the policy key."""
+    policies = list(MERGE_POLICIES)
+    return st.selectbox(
+        "When an entry already exists",
+        policies,
+        index=policies.index(DEFAULT_MERGE_POLICY),
+        format_func=MERGE_POLICIES.get,
+        key=key,
+        help="Keep local ignores incoming changes; Newest wins compares save timestamps",
+    )
+
+
+def render_merge_report(state_key: str, noun: str, key: str) -> None:
+    """Render the summary of the last import into `st.session_state[state_key]`.
+    
+    `key` distinguishes the widgets when the same report is shown in several places.
+    """
+    report_key = f'merge_report_{state_key}'
+    report = st.session_state.get(report_key)
+    if report is None:
+        return
+    
+    col1, col2 = st.columns([5, 1])
+    
+    with col1:
+        st.success(f"Last import: {report.summary(noun)}")
+    
+    with col2:
+        if st.button("✖", key=f"dismiss_{key}", help="Dismiss", use_container_width=True):
+            del st.session_state[report_key]
+            st.rerun()
+    
+    if report.added or report.updated or report.skipped:
+        with st.expander("Import details"):
+            if report.added:
+                st.markdown("**Added:** " + ", ".join(report.added))
+            for name, fields in report.updated:
+                st.markdown(f"**Updated** {name}: " + ", ".join(f"`{f}`" for f in fields))
+            for name, fields in report.skipped:
+                st.markdown(f"**Skipped** {name} (differs in " + ", ".join(f"`{f}`" for f in fields) + ")")
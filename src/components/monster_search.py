@@ -2,13 +2,14 @@
 """Monster search and library management."""
 
 import streamlit as st
-import hashlib
 from src.utils.monster_api import (
     search_monster, parse_monster_stats, roll_hp_from_dice,
-    get_source_display, clear_monster_cache, get_cache_stats
+    get_source_display, clear_monster_cache, get_cache_stats, monster_id as get_monster_id
 )
+from src.utils.session_keys import entity_key
 from src.utils.combat import add_monster_combatant
-from src.utils.import_export import export_monster_library, import_monster_library
+from src.utils.import_export import import_monster_library, monster_library_download, is_new_upload, open_text_stream
+from src.components.merge_summary import render_merge_policy_select, render_merge_report
 from src.constants import MONSTER_SOURCES
 from src.config import MAX_BULK_ADD
 
@@ -30,11 +31,7 @@ def initialize_source_preferences():
 
 def save_monster_to_library(monster_data: dict, parsed_stats: dict):
     """Save a monster to the user's library."""
-    monster_id = hashlib.md5(
-        f"{monster_data['name']}_{monster_data.get('document__slug', '')}".encode()
-    ).hexdigest()
-    
-    st.session_state.saved_monsters[monster_id] = {
+    st.session_state.saved_monsters[get_monster_id(monster_data)] = {
         'name': monster_data['name'],
         'source': monster_data.get('document__slug', ''),
         'source_title': monster_data.get('document__title', ''),
@@ -77,13 +74,13 @@ def render_saved_monsters():
                     min_value=1,
                     max_value=MAX_BULK_ADD,
                     value=1,
-                    key=f"saved_num_{monster_id}"
+                    key=entity_key('monster', monster_id, "saved_num")
                 )
             with col2:
                 auto_roll_init = st.checkbox(
                     "Auto-roll Init",
                     value=True,
-                    key=f"saved_init_{monster_id}"
+                    key=entity_key('monster', monster_id, "saved_init")
                 )
             
             # Shared initiative option
@@ -91,7 +88,7 @@ def render_saved_monsters():
                 shared_init = st.checkbox(
                     "Share Initiative",
                     value=True,
-                    key=f"saved_shared_init_{monster_id}",
+                    key=entity_key('monster', monster_id, "saved_shared_init"),
                     help="All instances use the same initiative roll"
                 )
             else:
@@ -102,7 +99,7 @@ def render_saved_monsters():
             with col1:
                 if st.button(
                     f"➕ Add to Combat",
-                    key=f"add_saved_{monster_id}",
+                    key=entity_key('monster', monster_id, "add_saved"),
                     use_container_width=True,
                     type="primary"
                 ):
@@ -115,7 +112,7 @@ def render_saved_monsters():
             with col2:
                 if st.button(
                     "🗑️ Remove",
-                    key=f"remove_saved_{monster_id}",
+                    key=entity_key('monster', monster_id, "remove_saved"),
                     use_container_width=True
                 ):
                     del st.session_state.saved_monsters[monster_id]
@@ -238,7 +235,8 @@ def _display_search_results():
     result_count = len(st.session_state['monster_search_results'])
     st.markdown(f"**Top {result_count} result(s) for '{st.session_state.get('search_term', '')}'**")
     
-    for idx, monster in enumerate(st.session_state['monster_search_results']):
+    for monster in st.session_state['monster_search_results']:
+        result_id = get_monster_id(monster)
         source = monster.get('document__slug', 'unknown')
         source_title = monster.get('document__title', 'Unknown Source')
         source_display = get_source_display(source, source_title)
@@ -254,19 +252,19 @@ def _display_search_results():
             col1, col2 = st.columns(2)
             
             with col1:
-                use_average_hp = st.checkbox("Use Average HP", value=True, key=f"avg_hp_{idx}")
-                num_instances = st.number_input("Number", min_value=1, max_value=MAX_BULK_ADD, value=1, key=f"num_{idx}")
+                use_average_hp = st.checkbox("Use Average HP", value=True, key=entity_key('search', result_id, "avg_hp"))
+                num_instances = st.number_input("Number", min_value=1, max_value=MAX_BULK_ADD, value=1, key=entity_key('search', result_id, "num"))
             
             with col2:
-                auto_roll_init = st.checkbox("Auto-roll Initiative", value=True, key=f"auto_init_{idx}")
+                auto_roll_init = st.checkbox("Auto-roll Initiative", value=True, key=entity_key('search', result_id, "auto_init"))
                 if num_instances > 1:
-                    shared_init = st.checkbox("Share Initiative", value=True, key=f"shared_init_{idx}",
+                    shared_init = st.checkbox("Share Initiative", value=True, key=entity_key('search', result_id, "shared_init"),
                                               help="All instances use the same initiative roll")
                 else:
                     shared_init = False
-                show_notes = st.checkbox("Include Notes", value=True, key=f"notes_{idx}")
+                show_notes = st.checkbox("Include Notes", value=True, key=entity_key('search', result_id, "notes"))
             
-            if st.button(f"➕ Add {monster['name']} to Combat", key=f"add_monster_{idx}", use_container_width=True):
+            if st.button(f"➕ Add {monster['name']} to Combat", key=entity_key('search', result_id, "add_monster"), use_container_width=True):
                 notes = parsed['notes'] if show_notes else ""
                 hp = parsed['max_hp'] if use_average_hp else (roll_hp_from_dice(parsed['hp_dice']) or parsed['max_hp'])
                 
@@ -299,11 +297,10 @@ def _render_library_tab():
     
     with col1:
         if st.session_state.saved_monsters:
-            export_data = export_monster_library()
             from src.utils.import_export import get_monster_library_filename
             st.download_button(
                 label="📥 Export Library",
-                data=export_data,
+                data=monster_library_download(),
                 file_name=get_monster_library_filename(),
                 mime="application/json",
                 use_container_width=True
@@ -316,10 +313,10 @@ def _render_library_tab():
             key="monster_library_upload",
             label_visibility="collapsed"
         )
-        if uploaded_file is not None:
+        merge_policy = render_merge_policy_select("monster_library_merge_policy")
+        if uploaded_file is not None and is_new_upload(uploaded_file, "monster_library_upload"):
             try:
-                json_str = uploaded_file.read().decode('utf-8')
-                success, message = import_monster_library(json_str)
+                success, message = import_monster_library(open_text_stream(uploaded_file), merge_policy)
                 if success:
                     st.success(message)
                     st.rerun()
@@ -328,6 +325,8 @@ def _render_library_tab():
             except Exception as e:
                 st.error(f"Error reading file: {str(e)}")
     
+    render_merge_report('saved_monsters', "monster", "monster_library_merge_report")
+    
     st.markdown("---")
     render_saved_monsters()
 
@@ -4,8 +4,11 @@
 import streamlit as st
 import hashlib
 import random
+from datetime import datetime
 from src.utils.combat import add_player_combatant
-from src.utils.import_export import export_player_roster_data, import_player_roster_data
+from src.utils.import_export import import_player_roster_data, player_roster_download, is_new_upload, open_text_stream
+from src.components.merge_summary import render_merge_policy_select, render_merge_report
+from src.utils.session_keys import entity_key
 
 
 def initialize_player_roster():
@@ -17,7 +20,10 @@ def initialize_player_roster():
 def save_player_to_roster(player_data: dict):
     """Save a player character to the roster."""
     player_id = hashlib.md5(player_data['name'].encode()).hexdigest()
-    st.session_state.player_roster[player_id] = player_data
+    st.session_state.player_roster[player_id] = {
+        **player_data,
+        'saved_at': datetime.now().isoformat(),
+    }
 
 
 def render_player_roster():
@@ -48,7 +54,7 @@ def render_player_roster():
             with col1:
                 if st.button(
                     f"➕ Add to Combat",
-                    key=f"add_player_{player_id}",
+                    key=entity_key('player', player_id, "add_player"),
                     use_container_width=True,
                     type="primary"
                 ):
@@ -74,7 +80,7 @@ def render_player_roster():
             with col2:
                 if st.button(
                     "🗑️ Remove",
-                    key=f"remove_player_{player_id}",
+                    key=entity_key('player', player_id, "remove_player"),
                     use_container_width=True
                 ):
                     del st.session_state.player_roster[player_id]
@@ -375,10 +381,9 @@ def _render_roster_management():
     
     with col1:
         if st.session_state.player_roster:
-            export_data = export_player_roster_data()
             st.download_button(
                 label="📥 Export Roster",
-                data=export_data,
+                data=player_roster_download(),
                 file_name=f"dnd_players_{__import__('datetime').datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                 mime="application/json",
                 use_container_width=True
@@ -391,10 +396,10 @@ def _render_roster_management():
             key="player_roster_upload",
             label_visibility="collapsed"
         )
-        if uploaded_file is not None:
+        merge_policy = render_merge_policy_select("player_roster_merge_policy")
+        if uploaded_file is not None and is_new_upload(uploaded_file, "player_roster_upload"):
             try:
-                json_str = uploaded_file.read().decode('utf-8')
-                success, message = import_player_roster_data(json_str)
+                success, message = import_player_roster_data(open_text_stream(uploaded_file), merge_policy)
                 if success:
                     st.success(message)
                     st.rerun()
@@ -403,6 +408,8 @@ def _render_roster_management():
             except Exception as e:
                 st.error(f"Error reading file: {str(e)}")
     
+    render_merge_report('player_roster', "player", "player_roster_merge_report")
+    
     st.markdown("---")
     render_player_roster()
 
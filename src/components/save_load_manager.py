@@ -2,7 +2,6 @@
 """Save/load manager UI for combats, rosters, and libraries."""
 
 import streamlit as st
-import json
 from src.utils.data_manager import (
     get_combat_files, get_player_roster_files, get_monster_library_files,
     save_combat_to_file, load_combat_from_file, delete_combat_file,
@@ -11,11 +10,22 @@ from src.utils.data_manager import (
     format_file_time
 )
 from src.utils.import_export import (
-    export_combat_state, import_combat_state,
-    export_player_roster_data, import_player_roster_data,
-    export_monster_library, import_monster_library,
-    get_export_filename
+    get_combat_state, import_combat_state, load_combat_state, combat_state_download,
+    get_player_roster_state, import_player_roster_data, merge_player_roster, player_roster_download,
+    get_monster_library_state, import_monster_library, merge_monster_library, monster_library_download,
+    get_export_filename, is_new_upload, open_text_stream
 )
+from src.utils.snapshot_history import (
+    get_history_names, list_versions, save_version, load_version, delete_history
+)
+from src.components.merge_summary import render_merge_policy_select, render_merge_report
+from src.components.tab_nav import render_tab_nav
+
+SAVE_LOAD_TABS = {
+    "combat": "⚔️ Combat",
+    "players": "👥 Players",
+    "monsters": "👹 Monsters",
+}
 
 
 def render_save_load_manager():
@@ -23,15 +33,13 @@ def render_save_load_manager():
     
     st.markdown("#### 💾 Save/Load Manager")
     
-    tab1, tab2, tab3 = st.tabs(["⚔️ Combat", "👥 Players", "👹 Monsters"])
+    active_tab = render_tab_nav(SAVE_LOAD_TABS, key="save_load_tab")
     
-    with tab1:
+    if active_tab == "combat":
         render_combat_save_load()
-    
-    with tab2:
+    elif active_tab == "players":
         render_player_save_load()
-    
-    with tab3:
+    else:
         render_monster_save_load()
 
 
@@ -50,13 +58,19 @@ def render_combat_save_load():
                 key="combat_save_name",
                 label_visibility="collapsed"
             )
+            versioned = st.checkbox(
+                "Versioned save",
+                key="combat_save_versioned",
+                help="Keep every save of this encounter as a compact version you can go back to"
+            )
         
         with col2:
             if st.button("💾 Save", use_container_width=True, type="primary", key="save_combat_btn"):
                 if save_name.strip():
-                    combat_data_str = export_combat_state()
-                    combat_data = json.loads(combat_data_str)
-                    success, message, filepath = save_combat_to_file(combat_data, save_name.strip())
+                    if versioned:
+                        success, message, _ = save_version(save_name.strip(), get_combat_state())
+                    else:
+                        success, message, filepath = save_combat_to_file(get_combat_state(), save_name.strip())
                     
                     if success:
                         st.success(message)
@@ -66,10 +80,9 @@ def render_combat_save_load():
                     st.warning("Enter a name for the save")
         
         st.caption("Or download to your computer:")
-        export_data = export_combat_state()
         st.download_button(
             label="📥 Download Combat",
-            data=export_data,
+            data=combat_state_download(),
             file_name=get_export_filename(),
             mime="application/json",
             use_container_width=True,
@@ -94,8 +107,7 @@ def render_combat_save_load():
                 if st.button("📂", key=f"load_combat_{filepath.stem}", help="Load"):
                     success, message, data = load_combat_from_file(filepath)
                     if success:
-                        json_str = json.dumps(data)
-                        success, message = import_combat_state(json_str)
+                        success, message = load_combat_state(data)
                         if success:
                             st.success(message)
                             st.rerun()
@@ -115,6 +127,13 @@ def render_combat_save_load():
     else:
         st.caption("No saved combats yet")
     
+    history_names = get_history_names()
+    if history_names:
+        st.markdown("---")
+        st.markdown("##### Version History")
+        for name in history_names:
+            render_version_timeline(name)
+    
     st.markdown("---")
     st.caption("Or upload from your computer:")
     uploaded_file = st.file_uploader(
@@ -124,10 +143,9 @@ def render_combat_save_load():
         label_visibility="collapsed"
     )
     
-    if uploaded_file is not None:
+    if uploaded_file is not None and is_new_upload(uploaded_file, "upload_combat_file"):
         try:
-            json_str = uploaded_file.read().decode('utf-8')
-            success, message = import_combat_state(json_str)
+            success, message = import_combat_state(open_text_stream(uploaded_file))
             if success:
                 st.success(message)
                 st.rerun()
@@ -137,6 +155,42 @@ def render_combat_save_load():
             st.error(f"Error: {str(e)}")
 
 
+def render_version_timeline(name: str):
+    """Render the saved versions of one encounter, newest first."""
+    versions = list_versions(name)
+    total_kb = sum(v.size for v in versions) / 1024
+    
+    with st.expander(f"🕒 **{name}** - {len(versions)} version(s), {total_kb:.1f} KB"):
+        for info in reversed(versions):
+            col1, col2 = st.columns([4, 1])
+            
+            with col1:
+                saved_at = info.saved_at[:16].replace('T', ' ')
+                st.caption(
+                    f"**v{info.version}** - Round {info.round_number}, "
+                    f"{info.combatant_count} combatants - {saved_at}"
+                )
+            
+            with col2:
+                if st.button("📂", key=f"load_version_{name}_{info.version}", help="Load this version"):
+                    success, message, data = load_version(name, info.version)
+                    if success:
+                        success, message = load_combat_state(data)
+                    if success:
+                        st.success(message)
+                        st.rerun()
+                    else:
+                        st.error(message)
+        
+        if st.button("🗑️ Delete history", key=f"delete_history_{name}"):
+            success, message = delete_history(name)
+            if success:
+                st.success(message)
+                st.rerun()
+            else:
+                st.error(message)
+
+
 def render_player_save_load():
     """Render player roster save/load interface."""
     
@@ -156,9 +210,7 @@ def render_player_save_load():
         with col2:
             if st.button("💾 Save", use_container_width=True, type="primary", key="save_roster_btn"):
                 if save_name.strip():
-                    roster_data_str = export_player_roster_data()
-                    roster_data = json.loads(roster_data_str)
-                    success, message, filepath = save_player_roster_to_file(roster_data, save_name.strip())
+                    success, message, filepath = save_player_roster_to_file(get_player_roster_state(), save_name.strip())
                     
                     if success:
                         st.success(message)
@@ -168,10 +220,9 @@ def render_player_save_load():
                     st.warning("Enter a name for the save")
         
         st.caption("Or download to your computer:")
-        export_data = export_player_roster_data()
         st.download_button(
             label="📥 Download Roster",
-            data=export_data,
+            data=player_roster_download(),
             file_name=f"dnd_players_{__import__('datetime').datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
             mime="application/json",
             use_container_width=True,
@@ -183,6 +234,9 @@ def render_player_save_load():
     st.markdown("---")
     st.markdown("##### Saved Rosters")
     
+    merge_policy = render_merge_policy_select("roster_merge_policy")
+    render_merge_report('player_roster', "player", "roster_merge_report")
+    
     roster_files = get_player_roster_files()
     
     if roster_files:
@@ -196,8 +250,7 @@ def render_player_save_load():
                 if st.button("📂", key=f"load_roster_{filepath.stem}", help="Load"):
                     success, message, data = load_player_roster_from_file(filepath)
                     if success:
-                        json_str = json.dumps(data)
-                        success, message = import_player_roster_data(json_str)
+                        success, message = merge_player_roster(data, merge_policy)
                         if success:
                             st.success(message)
                             st.rerun()
@@ -226,10 +279,9 @@ def render_player_save_load():
         label_visibility="collapsed"
     )
     
-    if uploaded_file is not None:
+    if uploaded_file is not None and is_new_upload(uploaded_file, "upload_roster_file"):
         try:
-            json_str = uploaded_file.read().decode('utf-8')
-            success, message = import_player_roster_data(json_str)
+            success, message = import_player_roster_data(open_text_stream(uploaded_file), merge_policy)
             if success:
                 st.success(message)
                 st.rerun()
@@ -258,9 +310,7 @@ def render_monster_save_load():
         with col2:
             if st.button("💾 Save", use_container_width=True, type="primary", key="save_library_btn"):
                 if save_name.strip():
-                    library_data_str = export_monster_library()
-                    library_data = json.loads(library_data_str)
-                    success, message, filepath = save_monster_library_to_file(library_data, save_name.strip())
+                    success, message, filepath = save_monster_library_to_file(get_monster_library_state(), save_name.strip())
                     
                     if success:
                         st.success(message)
@@ -270,10 +320,9 @@ def render_monster_save_load():
                     st.warning("Enter a name for the save")
         
         st.caption("Or download to your computer:")
-        export_data = export_monster_library()
         st.download_button(
             label="📥 Download Library",
-            data=export_data,
+            data=monster_library_download(),
             file_name=f"dnd_monsters_{__import__('datetime').datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
             mime="application/json",
             use_container_width=True,
@@ -285,6 +334,9 @@ def render_monster_save_load():
     st.markdown("---")
     st.markdown("##### Saved Libraries")
     
+    merge_policy = render_merge_policy_select("library_merge_policy")
+    render_merge_report('saved_monsters', "monster", "library_merge_report")
+    
     library_files = get_monster_library_files()
     
     if library_files:
@@ -298,8 +350,7 @@ def render_monster_save_load():
                 if st.button("📂", key=f"load_library_{filepath.stem}", help="Load"):
                     success, message, data = load_monster_library_from_file(filepath)
                     if success:
-                        json_str = json.dumps(data)
-                        success, message = import_monster_library(json_str)
+                        success, message = merge_monster_library(data, merge_policy)
                         if success:
                             st.success(message)
                             st.rerun()
@@ -328,10 +379,9 @@ def render_monster_save_load():
         label_visibility="collapsed"
     )
     
-    if uploaded_file is not None:
+    if uploaded_file is not None and is_new_upload(uploaded_file, "upload_library_file"):
         try:
-            json_str = uploaded_file.read().decode('utf-8')
-            success, message = import_monster_library(json_str)
+            success, message = import_monster_library(open_text_stream(uploaded_file), merge_policy)
             if success:
                 st.success(message)
                 st.rerun()
@@ -0,0 +1,41 @@
+# src/components/tab_nav.py
+"""Segmented-control navigation that only renders the active section."""
+
+import streamlit as st
+
+
+def render_tab_nav(tabs: dict[str, str], key: str) -> str:
+    """Render a tab bar and return the key of the active tab.
+
+    Unlike st.tabs, the caller renders only the active tab's content, so
+    hidden tabs cost nothing on rerun. The choice is kept under a separate
+    session key so it survives reruns where the bar itself isn't rendered
+    (e.g. nested tabs inside a hidden tab).
+
+    Args:
+        tabs: Tab keys mapped to their labels, in display order
+        key: Widget key for the tab bar
+    """
+    state_key = f"{key}_active"
+    active = st.session_state.get(state_key)
+    if active not in tabs:
+        active = next(iter(tabs))
+    st.session_state[state_key] = active
+    st.session_state[key] = active
+
+    st.segmented_control(
+        "Section",
+        list(tabs),
+        format_func=tabs.get,
+        key=key,
+        on_change=_remember_tab,
+        args=(key, state_key),
+        label_visibility="collapsed",
+    )
+    return st.session_state[state_key]
+
+
+def _remember_tab(key: str, state_key: str) -> None:
+    # Clicking the active tab deselects it; keep showing that tab instead
+    if st.session_state[key] is not None:
+        st.session_state[state_key] = st.session_state[key]
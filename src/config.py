@@ -5,6 +5,7 @@
 # Command System
 # =============================================================================
 MAX_COMMAND_HISTORY = 50  # Maximum undo/redo stack size
+COMPACT_SNAPSHOTS = True  # Keep undo snapshots of combatants as column arrays (utils/compact.py)
 
 # =============================================================================
 # UI Defaults
@@ -12,10 +13,17 @@ MAX_COMMAND_HISTORY = 50  # Maximum undo/redo stack size
 DEFAULT_VIEW_MODE = 'compact'  # 'detailed', 'compact', or 'dense'
 DEFAULT_SPEED = 30  # Default movement speed in feet
 
+# Combatant List
+VIEW_MODEL_CACHE_SIZE = 1024  # Cached per-combatant display data (LRU, per session)
+WINDOWED_LIST_THRESHOLD = 20  # Above this many combatants, only cards near the turn are rendered
+WINDOW_RADIUS = 3  # Cards rendered on each side of the current turn in windowed mode
+
 # Combat Log
 COMBAT_LOG_DEFAULT_HEIGHT = 300
 COMBAT_LOG_MIN_HEIGHT = 100
 COMBAT_LOG_MAX_HEIGHT = 600
+LOG_RING_CAPACITY = 500  # Log events kept in memory; older ones are spilled to disk
+LOG_SPILL_MAX_AGE_HOURS = 24  # Spill files from ended sessions are deleted after this
 
 # =============================================================================
 # API Settings
@@ -48,6 +56,15 @@ PLAYERS_FOLDER = "players"
 MONSTERS_FOLDER = "monsters"
 AUTO_ROSTER_FILENAME = "auto_roster.json"
 AUTO_LIBRARY_FILENAME = "auto_library.json"
+LOGS_FOLDER = "logs"  # Spilled combat log events
+HISTORY_FOLDER = "history"  # Versioned combat saves (one .jsonl per encounter)
+HISTORY_REBASE_INTERVAL = 10  # Store a full snapshot every N versioned saves
+
+# Storage backend for saves: 'json' (one file per save) or 'sqlite'
+# (row-level storage in a single WAL-mode database under DATA_FOLDER)
+STORAGE_BACKEND = "json"
+SQLITE_FILENAME = "tracker.db"
+AUTO_LOAD_POLL_SECONDS = 0.5  # How often the page checks whether the background auto-load finished
 
 # =============================================================================
 # Export Settings
@@ -55,6 +72,39 @@ AUTO_LIBRARY_FILENAME = "auto_library.json"
 EXPORT_VERSION = "3.0"
 ROSTER_VERSION = "1.0"
 LIBRARY_VERSION = "1.0"
+EXPORT_SPOOL_MAX_BYTES = 8 * 1024 * 1024  # Downloads larger than this spool to disk
+DEFAULT_MERGE_POLICY = 'keep_local'  # 'keep_local', 'take_incoming', or 'newest'
+
+# =============================================================================
+# Shared Encounters
+# =============================================================================
+ENCOUNTER_VIEWER_TIMEOUT = 60  # Seconds without a rerun before a viewer stops counting as watching
+ENCOUNTER_IDLE_HOURS = 12  # Encounters nobody published to for this long are dropped
+MAX_SHARED_ENCOUNTERS = 200  # Per server process; the longest-idle one is dropped beyond this
+PLAYER_VIEW_POLL_SECONDS = 1  # Rerun interval of the player view's live fragment
+
+# =============================================================================
+# Effects
+# =============================================================================
+ROUNDS_PER_MINUTE = 10
+EXPIRED_EFFECTS_KEPT = 100  # Expired effects remembered so Previous Turn can bring them back
+
+# =============================================================================
+# Debugging
+# =============================================================================
+DEBUG_MODE = False  # Extra consistency checks (e.g. recount combat stats every render)
+PROFILER_ENABLED = False  # Time render functions and commands (can also be toggled in the debug panel)
+PROFILER_MAX_RERUNS = 20  # Profiled reruns kept per session
+
+# Memory budgets per session (bytes); exceeding one trims the oldest data
+MEMORY_BUDGETS = {
+    'command_stack': 32 * 1024 * 1024,  # Oldest undo steps are dropped
+    'combat_log': 4 * 1024 * 1024,  # In-memory events are spilled to disk
+    'monster_search_cache': 4 * 1024 * 1024,  # Oldest searches are dropped
+    'view_model_cache': 2 * 1024 * 1024,  # Least recently used entries are dropped
+}
+MEMORY_CHECK_INTERVAL = 20  # Reruns between budget checks (measuring is O(session size))
+MEMORY_TOP_ALLOCATIONS = 15  # Allocation diffs shown when tracemalloc tracing is on
 
 # =============================================================================
 # Page Configuration
@@ -118,6 +118,22 @@ EXHAUSTION_DESCRIPTION: str = """
 *Effects are cumulative. Long rest removes 1 level (with food/drink).*
 """
 
+# =============================================================================
+# Effect Durations (see utils/effects.py)
+# =============================================================================
+# "Source" is the combatant that caused the effect (by default, whoever's turn it is)
+EFFECT_DURATIONS: dict[str, str] = {
+    "permanent": "Until removed",
+    "source_start": "Until the start of the source's next turn",
+    "source_end": "Until the end of the source's next turn",
+    "target_end": "Until the end of the target's next turn",
+    "minute": "1 minute (10 rounds)",
+    "ten_minutes": "10 minutes (100 rounds)",
+}
+
+CONCENTRATION_DC_MIN = 10  # Concentration save DC: half the damage taken, at least this
+CONCENTRATION_DC_MAX = 30
+
 # =============================================================================
 # Creature Sizes
 # =============================================================================
@@ -286,9 +302,25 @@ ICONS = {
     "empty": "⬜",
 }
 
+# Player view: HP band shown for monsters instead of exact HP, keyed by HP colour
+HP_BANDS: dict[str, str] = {
+    "green": "Healthy",
+    "orange": "Bloodied",
+    "red": "Badly Wounded",
+    "gray": "Down",
+}
+
 # =============================================================================
 # View Modes
 # =============================================================================
+MAIN_TABS: dict[str, str] = {
+    "combat": "⚔️ Combat",
+    "players": "👥 Players",
+    "monsters": "👹 Monsters",
+    "reference": "📖 Reference",
+    "saveload": "💾 Save/Load",
+}
+
 VIEW_MODES: dict[str, dict] = {
     "detailed": {
         "name": "Detailed",
@@ -305,4 +337,9 @@ VIEW_MODES: dict[str, dict] = {
         "icon": "📉",
         "description": "Ultra-compact for large encounters",
     },
+    "grid": {
+        "name": "Grid",
+        "icon": "🧮",
+        "description": "Edit many combatants at once in a table",
+    },
 }
\ No newline at end of file
@@ -4,9 +4,11 @@
 from .sticky_header import render_sticky_header
 from .sidebar import render_sidebar
 from .main_tabs import render_main_tabs
+from .player_view import render_player_view
 
 __all__ = [
     "render_sticky_header",
     "render_sidebar",
     "render_main_tabs",
+    "render_player_view",
 ]
\ No newline at end of file
@@ -1,19 +1,24 @@
 # src/layouts/main_tabs.py
-"""Main content area with tab navigation."""
+"""Main content area with tab navigation.
+
+Only the Combat tab's components are imported up front. The other tabs
+import theirs when first shown, so the API client, import/export and
+save/load machinery don't slow down startup.
+"""
 
 import streamlit as st
 from src.components.combat_overview import render_combat_overview
-from src.components.combatant_card import render_combatant_card
+from src.components.combatant_card import render_combatant_card_fragment, remember_summary_signature
+from src.components.combatant_grid import render_combatant_grid
 from src.components.death_save_prompt import render_death_save_prompt
-from src.components.player_character_form import render_player_character_form
-from src.components.monster_search import render_monster_search
-from src.components.add_combatant_form import render_add_combatant_form
-from src.components.conditions_reference import render_conditions_reference
-from src.components.save_load_manager import render_save_load_manager
-from src.config import DEFAULT_VIEW_MODE
-from src.constants import VIEW_MODES
+from src.components.tab_nav import render_tab_nav
+from src.utils.combat import ensure_combatant_ids
+from src.utils.profiler import profiled
+from src.config import DEFAULT_VIEW_MODE, WINDOWED_LIST_THRESHOLD, WINDOW_RADIUS
+from src.constants import MAIN_TABS, VIEW_MODES
 
 
+@profiled()
 def render_main_tabs() -> None:
     """Render the main content area with tabs."""
     
@@ -21,28 +26,18 @@ def render_main_tabs() -> None:
     if 'view_mode' not in st.session_state:
         st.session_state.view_mode = DEFAULT_VIEW_MODE
     
-    # Create tabs
-    tab_combat, tab_players, tab_monsters, tab_reference, tab_saveload = st.tabs([
-        "⚔️ Combat",
-        "👥 Players", 
-        "👹 Monsters",
-        "📖 Reference",
-        "💾 Save/Load",
-    ])
+    # Only the active tab is rendered, so hidden tabs cost nothing on rerun
+    active_tab = render_tab_nav(MAIN_TABS, key="main_tab")
     
-    with tab_combat:
+    if active_tab == "combat":
         _render_combat_tab()
-    
-    with tab_players:
+    elif active_tab == "players":
         _render_players_tab()
-    
-    with tab_monsters:
+    elif active_tab == "monsters":
         _render_monsters_tab()
-    
-    with tab_reference:
+    elif active_tab == "reference":
         _render_reference_tab()
-    
-    with tab_saveload:
+    else:
         _render_saveload_tab()
 
 
@@ -124,22 +119,158 @@ def _render_combatant_list() -> None:
     current_turn_index = st.session_state.get('current_turn_index', 0)
     view_mode = st.session_state.get('view_mode', DEFAULT_VIEW_MODE)
     
+    if view_mode == 'grid':
+        render_combatant_grid()
+        return
+    
+    # Card actions compare against this to decide between a card-only and a full rerun
+    remember_summary_signature()
+    
+    # Card widget keys are scoped to combatant ids
+    ensure_combatant_ids(combatants)
+    
+    if len(combatants) > WINDOWED_LIST_THRESHOLD:
+        _render_windowed_combatant_list(combatants, view_mode)
+        return
+    
     for idx, combatant in enumerate(combatants):
         is_current_turn = combat_active and idx == current_turn_index
+        _render_combatant_entry(combatant, idx, is_current_turn, view_mode)
+
+
+def _render_combatant_entry(combatant: dict, idx: int, is_current_turn: bool, view_mode: str) -> None:
+    """Render one full combatant card (with death save prompt on a downed player's turn)."""
+    
+    # Show death save prompt if it's a player's turn and they're at 0 HP
+    if is_current_turn:
+        is_player = combatant.get('combatant_type') == 'player'
+        at_zero_hp = combatant['current_hp'] == 0
         
-        # Show death save prompt if it's a player's turn and they're at 0 HP
-        if is_current_turn:
-            is_player = combatant.get('combatant_type') == 'player'
-            at_zero_hp = combatant['current_hp'] == 0
-            
-            if is_player and at_zero_hp:
-                render_death_save_prompt(combatant, idx)
-        
-        render_combatant_card(combatant, idx, is_current_turn, view_mode)
+        if is_player and at_zero_hp:
+            render_death_save_prompt(combatant, idx)
+    
+    render_combatant_card_fragment(idx, view_mode)
+
+
+def _render_windowed_combatant_list(combatants: list, view_mode: str) -> None:
+    """Render full cards only near the current turn (or jump target) and for pinned combatants.
+    
+    Everything else is collapsed into one table row per combatant, so the page
+    size stays roughly constant however large the encounter gets.
+    """
+    combat_active = st.session_state.get('combat_active', False)
+    current_turn_index = st.session_state.get('current_turn_index', 0)
+    ids = [c['id'] for c in combatants]
+    names = {c['id']: c['name'] for c in combatants}
+    
+    # Drop jump targets and pins that refer to removed combatants. These live
+    # outside the widget keys so they survive switching to another tab.
+    if st.session_state.get('list_jump_to') not in names:
+        st.session_state.list_jump_to = None
+    st.session_state.pinned_combatants = [
+        cid for cid in st.session_state.get('pinned_combatants', []) if cid in names
+    ]
+    st.session_state.list_jump_select = st.session_state.list_jump_to
+    st.session_state.pinned_select = st.session_state.pinned_combatants
+    
+    col_jump, col_turn, col_pin = st.columns([2, 1, 3])
+    
+    with col_jump:
+        st.selectbox(
+            "Jump to",
+            [None] + ids,
+            format_func=lambda cid: "Current turn" if cid is None else names[cid],
+            key="list_jump_select",
+            on_change=_copy_widget_value,
+            args=("list_jump_select", "list_jump_to"),
+        )
+    
+    with col_turn:
+        st.markdown("<div style='height: 1.75rem'></div>", unsafe_allow_html=True)
+        st.button("🎯 Current Turn", use_container_width=True, key="list_jump_current",
+                  on_click=_jump_to_current_turn)
+    
+    with col_pin:
+        st.multiselect(
+            "📌 Pinned",
+            ids,
+            format_func=names.get,
+            key="pinned_select",
+            on_change=_copy_widget_value,
+            args=("pinned_select", "pinned_combatants"),
+            help="Pinned combatants are always shown as full cards",
+        )
+    
+    jump_to = st.session_state.list_jump_to
+    center = ids.index(jump_to) if jump_to is not None else (current_turn_index if combat_active else 0)
+    count = len(combatants)
+    visible = {(center + offset) % count for offset in range(-WINDOW_RADIUS, WINDOW_RADIUS + 1)}
+    pinned = set(st.session_state.pinned_combatants)
+    visible.update(idx for idx, cid in enumerate(ids) if cid in pinned)
+    
+    st.caption(f"Showing {len(visible)} of {count} combatants in full · select a row to jump to it")
+    
+    collapsed = []
+    for idx, combatant in enumerate(combatants):
+        if idx not in visible:
+            collapsed.append(idx)
+            continue
+        if collapsed:
+            _render_collapsed_rows(combatants, collapsed)
+            collapsed = []
+        is_current_turn = combat_active and idx == current_turn_index
+        _render_combatant_entry(combatant, idx, is_current_turn, view_mode)
+    
+    if collapsed:
+        _render_collapsed_rows(combatants, collapsed)
+
+
+def _render_collapsed_rows(combatants: list, indices: list[int]) -> None:
+    """Render a run of collapsed combatants as a single table, one row each."""
+    
+    rows = []
+    for idx in indices:
+        c = combatants[idx]
+        hp = f"{c['current_hp']}/{c['max_hp']}"
+        if c['temp_hp'] > 0:
+            hp += f" (+{c['temp_hp']})"
+        rows.append({
+            'Init': c['initiative'],
+            'Name': c['name'],
+            'HP': hp,
+            'AC': c['ac'],
+            'Conditions': ", ".join(c['conditions']),
+        })
+    
+    key = f"collapsed_{combatants[indices[0]]['id']}"
+    ids = [combatants[idx]['id'] for idx in indices]
+    st.dataframe(
+        rows,
+        hide_index=True,
+        use_container_width=True,
+        key=key,
+        on_select=lambda: _jump_to_selected_row(key, ids),
+        selection_mode="single-row",
+    )
+
+
+def _jump_to_selected_row(table_key: str, ids: list[str]) -> None:
+    rows = st.session_state[table_key].selection.rows
+    if rows:
+        st.session_state.list_jump_to = ids[rows[0]]
+
+
+def _jump_to_current_turn() -> None:
+    st.session_state.list_jump_to = None
+
+
+def _copy_widget_value(widget_key: str, state_key: str) -> None:
+    st.session_state[state_key] = st.session_state[widget_key]
 
 
 def _render_players_tab() -> None:
     """Render the Players tab content."""
+    from src.components.player_character_form import render_player_character_form
     
     # Player character form already includes its own header
     render_player_character_form()
@@ -147,6 +278,8 @@ def _render_players_tab() -> None:
 
 def _render_monsters_tab() -> None:
     """Render the Monsters tab content."""
+    from src.components.monster_search import render_monster_search
+    from src.components.add_combatant_form import render_add_combatant_form
     
     # Monster search already includes its own header
     render_monster_search()
@@ -159,6 +292,7 @@ def _render_monsters_tab() -> None:
 
 def _render_reference_tab() -> None:
     """Render the Reference tab content."""
+    from src.components.conditions_reference import render_conditions_reference
     
     st.markdown("#### 📖 Quick Reference")
     st.caption("Click on a condition to see its effects")
@@ -168,6 +302,7 @@ def _render_reference_tab() -> None:
 
 def _render_saveload_tab() -> None:
     """Render the Save/Load tab content."""
+    from src.components.save_load_manager import render_save_load_manager
     
     # Save/load manager has its own header structure
     render_save_load_manager()
\ No newline at end of file
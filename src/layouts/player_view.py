@@ -0,0 +1,117 @@
+# src/layouts/player_view.py
+"""Read-only player page for a shared encounter (?view=player&player=<token>).
+
+Shows the turn order, an HP band per monster (exact HP for player
+characters) and conditions, and nothing the DM keeps private (notes,
+monster stats). It is opened with the encounter's player token, which the
+tracker itself doesn't accept. The page skips the tracker's styles and
+session setup. A single fragment polls the encounter every
+PLAYER_VIEW_POLL_SECONDS without blocking: a run only compares versions
+and re-sends the cached HTML, which is built once per version and shared
+by every viewer of the encounter.
+"""
+
+import html
+import threading
+import uuid
+import streamlit as st
+from src.config import PAGE_ICON, PAGE_TITLE, PLAYER_VIEW_POLL_SECONDS
+from src.constants import HP_BANDS
+from src.utils.encounter_registry import PLAYER_PARAM, EncounterSnapshot, get_encounter_registry
+from src.utils.view_models import get_hp_color
+
+# Encounter id -> (version, rendered HTML), shared by all sessions
+_html_cache: dict[str, tuple[int, str]] = {}
+_html_cache_lock = threading.Lock()
+
+
+def project_public_state(state: dict) -> list[dict]:
+    """What players may see of each combatant, in turn order."""
+    combat_active = state.get('combat_active', False)
+    current = state.get('current_turn_index', 0)
+    rows = []
+    for idx, combatant in enumerate(state.get('combatants', [])):
+        is_player = combatant.get('combatant_type') == 'player'
+        band = HP_BANDS[get_hp_color(combatant['current_hp'], combatant['max_hp'])]
+        rows.append({
+            'name': combatant['name'],
+            'is_player': is_player,
+            'is_current': combat_active and idx == current,
+            'hp': f"{combatant['current_hp']}/{combatant['max_hp']}" if is_player else band,
+            'band': band,
+            'conditions': list(combatant.get('conditions', [])),
+        })
+    return rows
+
+
+def _build_html(snapshot: EncounterSnapshot) -> str:
+    state = snapshot.state
+    if state.get('combat_active'):
+        heading = f"Round {state.get('round_number', 1)}"
+    else:
+        heading = "Waiting for combat to start"
+
+    rows = []
+    for row in project_public_state(state):
+        icon = "👥" if row['is_player'] else "👹"
+        style = "font-weight:bold; background:rgba(255, 200, 0, 0.15);" if row['is_current'] else ""
+        if row['band'] == HP_BANDS['gray']:
+            style += " opacity:0.5;"
+        marker = "▶" if row['is_current'] else ""
+        rows.append(
+            f"<tr style='{style}'><td>{marker}</td><td>{icon} {html.escape(row['name'])}</td>"
+            f"<td>{html.escape(row['hp'])}</td><td>{html.escape(', '.join(row['conditions']))}</td></tr>"
+        )
+    return (
+        f"<h4>{heading}</h4>"
+        "<table style='width:100%; border-collapse:collapse;'>"
+        "<tr><th></th><th style='text-align:left'>Name</th><th style='text-align:left'>HP</th>"
+        "<th style='text-align:left'>Conditions</th></tr>"
+        + "".join(rows) + "</table>"
+    )
+
+
+def get_public_html(encounter_id: str, snapshot: EncounterSnapshot) -> str:
+    """The player view of one version of an encounter (built once, for all viewers)."""
+    with _html_cache_lock:
+        cached = _html_cache.get(encounter_id)
+        if cached and cached[0] == snapshot.version:
+            return cached[1]
+    rendered = _build_html(snapshot)
+    with _html_cache_lock:
+        # Drop entries of encounters that no longer exist while we're here
+        registry = get_encounter_registry()
+        for stale in [eid for eid in _html_cache if registry.get(eid) is None]:
+            del _html_cache[stale]
+        _html_cache[encounter_id] = (snapshot.version, rendered)
+    return rendered
+
+
+def render_player_view() -> None:
+    """Render the player page for the encounter in the URL."""
+
+    st.markdown(f"### {PAGE_ICON} {PAGE_TITLE}")
+
+    encounter = get_encounter_registry().get_by_player_token(st.query_params.get(PLAYER_PARAM, ""))
+    if encounter is None:
+        st.info("No shared encounter here. Ask the DM for the player link.")
+        return
+    _render_live_order(encounter.encounter_id)
+
+
+@st.fragment(run_every=PLAYER_VIEW_POLL_SECONDS)
+def _render_live_order(encounter_id: str) -> None:
+    """Turn order, redrawn when the DM publishes a new version.
+
+    Never blocks, so idle viewers don't hold script threads. An unchanged
+    version re-sends the cached HTML (a fragment run that draws nothing
+    would clear it).
+    """
+    registry = get_encounter_registry()
+    encounter = registry.get(encounter_id)
+    if encounter is None:
+        st.info("This encounter is no longer shared.")
+        return
+    registry.touch_viewer(encounter_id, st.session_state.setdefault('encounter_viewer_id', uuid.uuid4().hex))
+
+    st.markdown(get_public_html(encounter_id, encounter.snapshot), unsafe_allow_html=True)
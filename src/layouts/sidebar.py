@@ -3,17 +3,28 @@
 
 import streamlit as st
 from src.components.combat_log import render_combat_log
+from src.components.encounter_share import render_encounter_share
+from src.config import DEBUG_MODE
+from src.utils.profiler import profiled
 
 
+@profiled()
 def render_sidebar() -> None:
     """Render the sidebar with combat log."""
     
     with st.sidebar:
-        # Combat Log takes the full sidebar
+        # Hosting/joining a shared encounter
+        render_encounter_share()
+        
+        # Combat Log takes the rest of the sidebar
         render_combat_log()
         
         st.divider()
         
+        if DEBUG_MODE:
+            from src.components.debug_panel import render_debug_panel
+            render_debug_panel()
+        
         # Footer with tips
         _render_sidebar_footer()
 
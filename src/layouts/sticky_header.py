@@ -6,10 +6,14 @@ from src.components.combat_controls import (
     render_turn_indicator,
     render_end_combat_warning,
 )
+from src.components.combat_overview import get_combat_stats
 from src.config import PAGE_TITLE, PAGE_ICON
 from src.utils.command_manager import undo_last_command, redo_last_command, can_undo, can_redo
+from src.utils.encounter_registry import is_read_only
+from src.utils.profiler import profiled
 
 
+@profiled()
 def render_sticky_header() -> None:
     """Render the sticky header with title, stats, and controls."""
     
@@ -31,19 +35,24 @@ def render_sticky_header() -> None:
 def _render_active_combat_header() -> None:
     """Render header when combat is active."""
     
-    combatants = st.session_state.get('combatants', [])
-    alive = sum(1 for c in combatants if c['current_hp'] > 0)
-    down = len(combatants) - alive
+    stats = get_combat_stats()
+    alive = stats['alive']
+    down = stats['total'] - alive
     
     # Row 1: Title (centered)
     st.markdown(f"<h2 style='text-align: center; margin: 0;'>{PAGE_ICON} {PAGE_TITLE}</h2>", unsafe_allow_html=True)
     
     # Row 2: Stats (small inline, centered)
     st.markdown(
-        f"<p style='text-align: center; margin: 0.25rem 0;'><strong>Total:</strong> {len(combatants)} · <strong>Alive:</strong> {alive} · <strong>Down:</strong> {down}</p>",
+        f"<p style='text-align: center; margin: 0.25rem 0;'><strong>Total:</strong> {stats['total']} · <strong>Alive:</strong> {alive} · <strong>Down:</strong> {down}</p>",
         unsafe_allow_html=True
     )
     
+    # Viewers of a shared encounter only follow along
+    if is_read_only():
+        render_turn_indicator()
+        return
+    
     # Row 3: Controls | Turn Indicator
     c_undo, c_redo, c_prev, c_next, c_end, c_turn = st.columns([0.4, 0.4, 0.6, 0.6, 0.6, 3])
     
@@ -81,13 +90,19 @@ def _render_inactive_combat_header() -> None:
     # Row 1: Title (centered)
     st.markdown(f"<h2 style='text-align: center; margin: 0;'>{PAGE_ICON} {PAGE_TITLE}</h2>", unsafe_allow_html=True)
     
-    if combatants:
-        alive = sum(1 for c in combatants if c['current_hp'] > 0)
-        down = len(combatants) - alive
+    if combatants and is_read_only():
+        st.markdown(
+            "<p style='text-align: center; color: #888; margin: 0.25rem 0;'>Waiting for the DM to start combat</p>",
+            unsafe_allow_html=True
+        )
+    elif combatants:
+        stats = get_combat_stats()
+        alive = stats['alive']
+        down = stats['total'] - alive
         
         # Row 2: Stats (small inline, centered)
         st.markdown(
-            f"<p style='text-align: center; margin: 0.25rem 0;'><strong>Total:</strong> {len(combatants)} · <strong>Alive:</strong> {alive} · <strong>Down:</strong> {down}</p>",
+            f"<p style='text-align: center; margin: 0.25rem 0;'><strong>Total:</strong> {stats['total']} · <strong>Alive:</strong> {alive} · <strong>Down:</strong> {down}</p>",
             unsafe_allow_html=True
         )
         
@@ -154,7 +169,5 @@ def _do_end():
 def _do_start():
     combatants = st.session_state.get('combatants', [])
     if combatants:
-        st.session_state.combatants.sort(
-            key=lambda x: (-x['initiative'], -x['dex_modifier'])
-        )
-        st.session_state.combat_active = True
\ No newline at end of file
+        from src.utils.combat import start_combat
+        start_combat()
\ No newline at end of file
@@ -1,25 +1,97 @@
 # src/styles/__init__.py
-"""Styling module for the D&D Combat Tracker."""
+"""Styling module for the D&D Combat Tracker.
 
+All styles are combined into one minified bundle when this module is
+imported. When static file serving is enabled (see `.streamlit/config.toml`)
+the bundle is written once to `static/styles.<hash>.css` and every rerun only
+sends a small link tag; otherwise it falls back to an inline style block.
+"""
+
+import hashlib
+import re
+from pathlib import Path
 import streamlit as st
 from .main import get_main_styles
 from .sidebar import get_sidebar_styles
 from .header import get_header_styles
 from .components import get_component_styles
 
+# Streamlit serves <app dir>/static at app/static when enableStaticServing is on
+STATIC_DIR = Path(__file__).parent.parent.parent / "static"
+
+_STYLE_TAG = re.compile(r"</?style>")
+_CSS_STRING = r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\''
+_CSS_COMMENTS = re.compile(rf"({_CSS_STRING})|/\*.*?\*/", re.DOTALL)
+_CSS_WHITESPACE = re.compile(
+    rf"({_CSS_STRING})"      # Strings are kept as-is
+    r"|\s*([{};,>])\s*"     # Space around punctuation
+    r"|(:)\s+"              # Space after a colon (not before: `a :hover` differs from `a:hover`)
+    r"|\s+"                 # Any other run of whitespace
+)
+
+
+def _minify_whitespace(match: re.Match) -> str:
+    string, punct, colon = match.groups()
+    return string or punct or colon or " "
+
+
+def minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace from a stylesheet."""
+    css = _CSS_COMMENTS.sub(lambda m: m.group(1) or "", css)
+    css = _CSS_WHITESPACE.sub(_minify_whitespace, css)
+    return css.replace(";}", "}").strip()
+
+
+def build_css_bundle() -> str:
+    """Combine all style sheets into one minified CSS string."""
+    sheets = [get_main_styles(), get_sidebar_styles(), get_header_styles(), get_component_styles()]
+    return minify_css("\n".join(_STYLE_TAG.sub("", sheet) for sheet in sheets))
+
+
+CSS_BUNDLE = build_css_bundle()
+CSS_HASH = hashlib.sha256(CSS_BUNDLE.encode()).hexdigest()[:12]
+CSS_FILENAME = f"styles.{CSS_HASH}.css"
+
+_bundle_written = False
+
+
+def _write_css_bundle() -> bool:
+    """Write the bundle to the static folder (once per process). Returns True if it is there."""
+    global _bundle_written
+    if _bundle_written:
+        return True
+    try:
+        STATIC_DIR.mkdir(exist_ok=True)
+        target = STATIC_DIR / CSS_FILENAME
+        if not target.exists():
+            target.write_text(CSS_BUNDLE)
+        # Remove bundles from older versions of the styles
+        for old in STATIC_DIR.glob("styles.*.css"):
+            if old != target:
+                old.unlink(missing_ok=True)
+        _bundle_written = True
+    except OSError:
+        pass  # Fall back to inline styles
+    return _bundle_written
+
 
 def apply_all_styles() -> None:
     """Apply all CSS styles to the Streamlit app."""
-    st.markdown(get_main_styles(), unsafe_allow_html=True)
-    st.markdown(get_sidebar_styles(), unsafe_allow_html=True)
-    st.markdown(get_header_styles(), unsafe_allow_html=True)
-    st.markdown(get_component_styles(), unsafe_allow_html=True)
+    if st.get_option("server.enableStaticServing") and _write_css_bundle():
+        # The content hash in the filename lets the browser cache it indefinitely
+        st.markdown(f'<link rel="stylesheet" href="app/static/{CSS_FILENAME}">', unsafe_allow_html=True)
+    else:
+        st.markdown(f"<style>{CSS_BUNDLE}</style>", unsafe_allow_html=True)
 
 
 __all__ = [
     "apply_all_styles",
+    "build_css_bundle",
+    "minify_css",
+    "CSS_BUNDLE",
+    "CSS_HASH",
     "get_main_styles",
     "get_sidebar_styles",
     "get_header_styles",
     "get_component_styles",
-]
\ No newline at end of file
+]
@@ -1,4 +1,5 @@
 # src/utils/combat.py (COMPLETE)
+import uuid
 import streamlit as st
 from src.utils.models import PlayerCombatant, MonsterCombatant, Combatant
 from src.utils.commands import (
@@ -13,10 +14,17 @@ from src.utils.commands import (
     SetExhaustionCommand,
     UpdateDeathSavesCommand,
     FullHealCommand,
+    BatchEditCommand,
     NextTurnCommand,
     PreviousTurnCommand,
+    AddEffectCommand,
+    EndEffectCommand,
+    BreakConcentrationCommand,
 )
 from src.utils.command_manager import execute_command, clear_command_stack
+from src.utils.combat_log_store import get_combat_log
+from src.utils.combat_stats import reset_combat_stats
+from src.utils.effects import get_effects_state, invalidate_effect_scheduler, reset_effects
 
 def initialize_combat_state():
     """Initialize all session state variables for combat tracking"""
@@ -32,8 +40,21 @@ def initialize_combat_state():
     if 'combat_active' not in st.session_state:
         st.session_state.combat_active = False
     
-    if 'combat_log' not in st.session_state:
-        st.session_state.combat_log = []
+    # Structured log store (see combat_log_store)
+    get_combat_log()
+    
+    # Timed conditions and spell effects (see effects)
+    get_effects_state()
+
+def new_combatant_id() -> str:
+    """Generate a stable id for a combatant (survives reordering and removals)"""
+    return uuid.uuid4().hex[:12]
+
+def ensure_combatant_ids(combatants: list[Combatant]) -> None:
+    """Give an id to any combatant that lacks one (e.g. from older saves)"""
+    for combatant in combatants:
+        if 'id' not in combatant:
+            combatant['id'] = new_combatant_id()
 
 def add_player_combatant(
     name: str,
@@ -50,6 +71,7 @@ def add_player_combatant(
 ) -> None:
     """Add a player character to combat"""
     player: PlayerCombatant = {
+        'id': new_combatant_id(),
         'combatant_type': 'player',
         'name': name,
         'initiative': initiative,
@@ -87,6 +109,7 @@ def add_monster_combatant(
 ) -> None:
     """Add a monster/NPC to combat"""
     monster: MonsterCombatant = {
+        'id': new_combatant_id(),
         'combatant_type': 'monster',
         'name': name,
         'initiative': initiative,
@@ -165,6 +188,37 @@ def full_heal(index: int) -> None:
     cmd = FullHealCommand(index)
     execute_command(cmd)
 
+def apply_batch_edit(changes: dict[int, dict]) -> None:
+    """Apply edits to many combatants at once ({index: {field: value}}) as one undo step"""
+    if not changes:
+        return
+    cmd = BatchEditCommand(changes)
+    execute_command(cmd)
+
+def add_effect(index: int, name: str, duration: str, source_index: int | None = None,
+               condition: str | None = None, concentration: bool = False) -> None:
+    """Start a timed effect on a combatant (duration: a key of EFFECT_DURATIONS)"""
+    cmd = AddEffectCommand(index, name, duration, source_index, condition, concentration)
+    execute_command(cmd)
+
+def end_effect(effect_id: str) -> None:
+    """End an effect before its time"""
+    cmd = EndEffectCommand(effect_id)
+    execute_command(cmd)
+
+def break_concentration(index: int) -> None:
+    """End everything a combatant is concentrating on"""
+    cmd = BreakConcentrationCommand(index)
+    execute_command(cmd)
+
+def start_combat() -> None:
+    """Sort by initiative (highest first, DEX modifier breaking ties) and start round 1"""
+    st.session_state.combatants.sort(
+        key=lambda x: (-x['initiative'], -x['dex_modifier'])
+    )
+    invalidate_effect_scheduler()  # Positions changed in place
+    st.session_state.combat_active = True
+
 def next_turn() -> None:
     """Advance to the next turn"""
     cmd = NextTurnCommand()
@@ -181,14 +235,14 @@ def end_combat() -> None:
     st.session_state.combatants = []
     st.session_state.current_turn_index = 0
     st.session_state.round_number = 1
+    reset_combat_stats([])
+    reset_effects()
     clear_command_stack()
 
 # Keep legacy log_event for any direct calls
 def log_event(message: str):
     """Add an event to the combat log (legacy - prefer commands)"""
-    if 'combat_log' not in st.session_state:
-        st.session_state.combat_log = []
-    st.session_state.combat_log.append(message)
+    get_combat_log().append(message, round_number=st.session_state.get('round_number', 1))
 
 # Legacy function for backward compatibility
 def add_combatant(name: str, initiative: int, dex_modifier: int, max_hp: int, ac: int, speed: int = 30):
@@ -0,0 +1,255 @@
+# src/utils/combat_log_store.py
+"""Bounded, indexed store for combat log events.
+
+The newest LOG_RING_CAPACITY events are kept in memory; older ones are
+spilled to an append-only ``data/logs/<id>.jsonl`` file. In-memory events
+are indexed by round and actor so recent activity can be filtered without
+scanning every entry; spilled events are found by scanning the file, so
+memory stays bounded however long the combat runs.
+"""
+
+import json
+import time
+import uuid
+import weakref
+from collections import deque
+from datetime import datetime
+from typing import Callable, Iterable, Iterator
+import streamlit as st
+from src.config import LOG_RING_CAPACITY, LOG_SPILL_MAX_AGE_HOURS
+from src.utils.data_manager import LOG_DIR
+from src.utils.models import LogEntry
+
+
+# Stores alive in this process; their spill files are never purged, however old
+_live_stores: 'weakref.WeakSet[CombatLogStore]' = weakref.WeakSet()
+
+
+class CombatLogStore:
+    """Combat log with an in-memory ring of recent events and a disk spill for the rest."""
+
+    def __init__(self, capacity: int = LOG_RING_CAPACITY):
+        self.capacity = capacity
+        self._ring: deque[LogEntry] = deque()
+        self._next_seq = 0
+        self._spilled = 0  # Events moved to the spill file (seqs 0 to _spilled - 1)
+        self._spill_path = LOG_DIR / f"{uuid.uuid4().hex}.jsonl"
+        self._spilled_rounds: set[int] = set()  # Rounds with at least one spilled event
+        # Seqs of the in-memory events per round / actor, ascending
+        self._by_round: dict[int, deque[int]] = {}
+        self._by_actor: dict[str, deque[int]] = {}
+        self.actor_names: dict[str, str] = {}
+        _live_stores.add(self)
+
+    def __len__(self) -> int:
+        return self._next_seq
+
+    def __bool__(self) -> bool:
+        return self._next_seq > 0
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        yield from self._scan_spilled()
+        yield from self._ring
+
+    @property
+    def spilled_count(self) -> int:
+        """Number of events that only exist on disk."""
+        return self._spilled
+
+    # =========================================================================
+    # Writing
+    # =========================================================================
+    def append(self, message: str, event_type: str = "note", actor_id: str | None = None,
+               actor: str | None = None, round_number: int | None = None) -> LogEntry:
+        """Record an event and return it."""
+        entry: LogEntry = {
+            'seq': self._next_seq,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'event_type': event_type,
+            'message': message,
+        }
+        if round_number is not None:
+            entry['round'] = round_number
+        if actor_id is not None:
+            entry['actor_id'] = actor_id
+            entry['actor'] = actor or self.actor_names.get(actor_id, actor_id)
+        self._add(entry)
+        return entry
+
+    def extend(self, entries: Iterable[LogEntry | str]) -> None:
+        """Add previously recorded events (plain strings from older saves are accepted)."""
+        for entry in entries:
+            if isinstance(entry, str):
+                self.append(entry, event_type="legacy")
+            else:
+                self._add({**entry, 'seq': self._next_seq})
+
+    def _add(self, entry: LogEntry) -> None:
+        seq = entry['seq']
+        self._next_seq = seq + 1
+        if 'round' in entry:
+            self._by_round.setdefault(entry['round'], deque()).append(seq)
+        if 'actor_id' in entry:
+            self._by_actor.setdefault(entry['actor_id'], deque()).append(seq)
+            self.actor_names[entry['actor_id']] = entry.get('actor', entry['actor_id'])
+
+        self._ring.append(entry)
+        if len(self._ring) > self.capacity:
+            self._spill(max(1, self.capacity // 4))
+
+    def _spill(self, count: int) -> None:
+        """Move the `count` oldest in-memory events to the spill file."""
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+        with open(self._spill_path, 'ab') as f:
+            for _ in range(count):
+                entry = self._ring.popleft()
+                f.write((json.dumps(entry) + "\n").encode())
+                # The oldest in-memory event is first in its index entries
+                if 'round' in entry:
+                    _drop_oldest(self._by_round, entry['round'])
+                    self._spilled_rounds.add(entry['round'])
+                if 'actor_id' in entry:
+                    _drop_oldest(self._by_actor, entry['actor_id'])
+        self._spilled += count
+
+    def spill_to(self, keep: int) -> int:
+        """Spill all but the `keep` newest in-memory events to disk; returns how many moved."""
+        count = max(0, len(self._ring) - keep)
+        if count:
+            self._spill(count)
+        return count
+
+    def clear(self) -> None:
+        """Remove all events (and the spill file)."""
+        self.discard()
+        self.__init__(self.capacity)
+
+    def discard(self) -> None:
+        """Delete the spill file; call when the store is being replaced."""
+        self._spill_path.unlink(missing_ok=True)
+
+    # =========================================================================
+    # Reading
+    # =========================================================================
+    def _scan_spilled(self, limit: int | None = None) -> Iterator[LogEntry]:
+        """Spilled events, oldest first (the first `limit` of them, if given)."""
+        count = self._spilled if limit is None else min(limit, self._spilled)
+        if not count:
+            return
+        with open(self._spill_path, 'rb') as f:
+            for _, line in zip(range(count), f):
+                yield json.loads(line)
+
+    def snapshot(self) -> Callable[[], Iterator[LogEntry]]:
+        """Freeze the current events for reading later, e.g. from another thread.
+        
+        Returns a function that iterates exactly the events logged so far,
+        however the log grows or spills meanwhile: it copies the in-memory
+        ring now and reads only the lines of the (append-only) spill file
+        that already exist.
+        """
+        spilled = self._spilled
+        ring = list(self._ring)
+
+        def iterate() -> Iterator[LogEntry]:
+            yield from self._scan_spilled(spilled)
+            yield from ring
+
+        return iterate
+
+    def get(self, seqs: Iterable[int]) -> list[LogEntry]:
+        """Fetch events by sequence number (ascending), from memory or disk."""
+        seqs = list(seqs)
+        on_disk = {seq for seq in seqs if seq < self._spilled}
+        entries = [entry for entry in self._scan_spilled() if entry['seq'] in on_disk] if on_disk else []
+        entries.extend(self._ring[seq - self._spilled] for seq in seqs if seq >= self._spilled)
+        return entries
+
+    def recent(self, limit: int | None = None) -> list[LogEntry]:
+        """In-memory events, newest first."""
+        entries = list(reversed(self._ring))
+        return entries if limit is None else entries[:limit]
+
+    def filter(self, round_number: int | None = None, actor_id: str | None = None) -> list[LogEntry]:
+        """Events for a round and/or actor, oldest first.
+        
+        In-memory events come from the indexes; the spill file is scanned
+        only when it may hold matches.
+        """
+        if round_number is None and actor_id is None:
+            return list(self)
+        entries = []
+        if self._spilled and (round_number is None or round_number in self._spilled_rounds):
+            entries = [
+                entry for entry in self._scan_spilled()
+                if (round_number is None or entry.get('round') == round_number)
+                and (actor_id is None or entry.get('actor_id') == actor_id)
+            ]
+        candidates = None
+        if round_number is not None:
+            candidates = self._by_round.get(round_number, ())
+        if actor_id is not None:
+            by_actor = self._by_actor.get(actor_id, ())
+            candidates = by_actor if candidates is None else sorted(set(candidates) & set(by_actor))
+        entries.extend(self._ring[seq - self._spilled] for seq in candidates)
+        return entries
+
+    def rounds(self) -> list[int]:
+        """Rounds that have at least one event."""
+        return sorted(self._spilled_rounds.union(self._by_round))
+
+    def to_list(self) -> list[LogEntry]:
+        """All events, oldest first (export format)."""
+        return list(self)
+
+    def messages(self) -> list[str]:
+        """Plain message text of all events, oldest first."""
+        return [entry['message'] for entry in self]
+
+
+def _drop_oldest(index: dict, key) -> None:
+    seqs = index[key]
+    seqs.popleft()
+    if not seqs:
+        del index[key]
+
+
+def _purge_stale_spills() -> None:
+    """Delete spill files left behind by sessions that ended long ago.
+    
+    A live session may not have spilled for a while, so files of stores that
+    still exist are kept regardless of age.
+    """
+    if not LOG_DIR.exists():
+        return
+    cutoff = time.time() - LOG_SPILL_MAX_AGE_HOURS * 3600
+    live = {store._spill_path for store in list(_live_stores)}
+    for path in LOG_DIR.glob("*.jsonl"):
+        if path in live:
+            continue
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+
+def get_combat_log() -> CombatLogStore:
+    """Get the session's combat log store (created on first use)."""
+    if not isinstance(st.session_state.get('combat_log'), CombatLogStore):
+        _purge_stale_spills()
+        store = CombatLogStore()
+        store.extend(st.session_state.get('combat_log') or [])
+        st.session_state.combat_log = store
+    return st.session_state.combat_log
+
+
+def reset_combat_log(entries: Iterable[LogEntry | str] = ()) -> CombatLogStore:
+    """Replace the session's combat log, e.g. with the log from a loaded save."""
+    old = st.session_state.get('combat_log')
+    if isinstance(old, CombatLogStore):
+        old.discard()
+    store = CombatLogStore()
+    store.extend(entries)
+    st.session_state.combat_log = store
+    return store
@@ -0,0 +1,185 @@
+# src/utils/combat_stats.py
+"""Incrementally maintained combat statistics.
+
+Each metric is a per-combatant contribution; the store keeps every
+combatant's current contribution and the running totals, so a command that
+changes one combatant updates the stats in O(1) instead of rescanning the
+whole list. Commands are applied through `command_manager`, which records
+the change so undo can revert it exactly.
+
+New metrics are added with `register_metric` (per-combatant totals) or
+`register_derived_metric` (computed from the totals on read).
+
+The store also keeps a `ConditionIndex` (see `conditions.py`): each
+contribution ends with the combatant's condition bitmask, so the index
+follows the same updates and undos as the totals.
+"""
+
+from typing import Callable
+import streamlit as st
+from src.config import DEBUG_MODE
+from src.utils.conditions import ConditionIndex, combatant_mask
+
+# Per-combatant metrics: name -> contribution of one combatant
+METRICS: dict[str, Callable[[dict], int]] = {
+    'total': lambda c: 1,
+    'alive': lambda c: int(c['current_hp'] > 0),
+    'unconscious': lambda c: int(c['current_hp'] == 0),
+    'players': lambda c: int(_is_player(c)),
+    'monsters': lambda c: int(not _is_player(c)),
+    'players_alive': lambda c: int(_is_player(c) and c['current_hp'] > 0),
+    'monsters_alive': lambda c: int(not _is_player(c) and c['current_hp'] > 0),
+    'conditioned': lambda c: int(bool(c['conditions'])),
+    'exhausted': lambda c: int(c['exhaustion'] > 0),
+    'stabilized': lambda c: int(c['current_hp'] == 0 and c.get('is_stable', False)),
+    'party_hp': lambda c: c['current_hp'] if _is_player(c) else 0,
+    'party_max_hp': lambda c: c['max_hp'] if _is_player(c) else 0,
+    'hp_pool': lambda c: c['current_hp'] + c['temp_hp'],
+}
+
+# Metrics computed from the totals (and the store) when read
+DERIVED_METRICS: dict[str, Callable[[dict, 'CombatStats'], float | int]] = {
+    'party_hp_pct': lambda totals, store: (
+        round(100 * totals['party_hp'] / totals['party_max_hp']) if totals['party_max_hp'] else 0
+    ),
+    'damage_this_round': lambda totals, store: store.damage_by_round.get(st.session_state.get('round_number', 1), 0),
+}
+
+# (combatant key, old contribution, new contribution, round, hp lost); a
+# contribution is one value per metric followed by the condition bitmask
+StatsChange = tuple[str, tuple | None, tuple | None, int, int]
+
+
+def _is_player(combatant: dict) -> bool:
+    return combatant.get('combatant_type') == 'player'
+
+
+def _combatant_key(combatant: dict) -> str:
+    return combatant.get('id', combatant['name'])
+
+
+def register_metric(name: str, contribution: Callable[[dict], int]) -> None:
+    """Add a per-combatant metric; existing stores are rebuilt on next access."""
+    METRICS[name] = contribution
+
+
+def register_derived_metric(name: str, compute: Callable[[dict, 'CombatStats'], float | int]) -> None:
+    """Add a metric computed from the totals when the stats are read."""
+    DERIVED_METRICS[name] = compute
+
+
+class CombatStats:
+    """Running totals of all per-combatant metrics, HP lost per round and who has which condition."""
+
+    def __init__(self, combatants: list | None = None):
+        self.metric_names = tuple(METRICS)
+        self.totals = [0] * len(self.metric_names)
+        self.damage_by_round: dict[int, int] = {}
+        self.conditions = ConditionIndex()
+        self._contributions: dict[str, tuple] = {}
+        for combatant in combatants or []:
+            self._set(_combatant_key(combatant), self.contribution(combatant))
+
+    def __len__(self) -> int:
+        return len(self._contributions)
+
+    def contribution(self, combatant: dict) -> tuple:
+        """One combatant's contribution to each metric, then its condition bitmask"""
+        return (*(METRICS[name](combatant) for name in self.metric_names), combatant_mask(combatant))
+
+    def _set(self, key: str, new: tuple | None) -> tuple | None:
+        """Replace a combatant's contribution, adjusting the totals; returns the old one"""
+        old = self._contributions.pop(key, None)
+        if old is not None:
+            for i, value in zip(range(len(self.totals)), old):
+                self.totals[i] -= value
+        if new is not None:
+            self._contributions[key] = new
+            for i, value in zip(range(len(self.totals)), new):
+                self.totals[i] += value
+        self.conditions.move(key, old[-1] if old else 0, new[-1] if new else 0)
+        return old
+
+    def update(self, combatant: dict, round_number: int) -> StatsChange:
+        """Re-count a changed (or added) combatant"""
+        key = _combatant_key(combatant)
+        new = self.contribution(combatant)
+        old = self._set(key, new)
+        hp_lost = 0
+        if old is not None:
+            pool = self.metric_names.index('hp_pool')
+            hp_lost = max(0, old[pool] - new[pool])
+            if hp_lost:
+                self.damage_by_round[round_number] = self.damage_by_round.get(round_number, 0) + hp_lost
+        return key, old, new, round_number, hp_lost
+
+    def remove(self, key: str, round_number: int) -> StatsChange:
+        """Stop counting a removed combatant"""
+        return key, self._set(key, None), None, round_number, 0
+
+    def revert(self, changes: list[StatsChange]) -> None:
+        """Undo recorded changes, newest first"""
+        for key, old, _new, round_number, hp_lost in reversed(changes):
+            self._set(key, old)
+            if hp_lost:
+                self.damage_by_round[round_number] -= hp_lost
+                if not self.damage_by_round[round_number]:
+                    del self.damage_by_round[round_number]
+
+    def as_dict(self) -> dict:
+        """Totals and derived metrics by name"""
+        totals = dict(zip(self.metric_names, self.totals))
+        for name, compute in DERIVED_METRICS.items():
+            totals[name] = compute(totals, self)
+        return totals
+
+    def verify(self, combatants: list) -> list[str]:
+        """Compare the running totals with a full recount; returns the metrics that differ"""
+        expected = CombatStats(combatants)
+        mismatched = [
+            name for name, have, want in zip(self.metric_names, self.totals, expected.totals)
+            if have != want
+        ]
+        if self.conditions.masks != expected.conditions.masks:
+            mismatched.append('conditions index')
+        return mismatched
+
+
+def get_combat_stats_store() -> CombatStats:
+    """Get the session's stats store, rebuilding it if it is missing or stale."""
+    combatants = st.session_state.get('combatants', [])
+    store = st.session_state.get('combat_stats')
+    if (
+        not isinstance(store, CombatStats)
+        or store.metric_names != tuple(METRICS)
+        or not hasattr(store, 'conditions')  # Created before the condition index existed
+        or len(store) != len(combatants)  # Cheap guard against changes made outside commands
+    ):
+        store = reset_combat_stats(combatants, keep_damage=store if isinstance(store, CombatStats) else None)
+    return store
+
+
+def reset_combat_stats(combatants: list, keep_damage: CombatStats | None = None) -> CombatStats:
+    """Recount everything, e.g. after loading a save or ending combat."""
+    store = CombatStats(combatants)
+    if keep_damage is not None:
+        store.damage_by_round = keep_damage.damage_by_round
+    st.session_state.combat_stats = store
+    return store
+
+
+def get_condition_index() -> ConditionIndex:
+    """Which combatants (by id) have each condition, maintained by commands like the stats."""
+    return get_combat_stats_store().conditions
+
+
+def read_combat_stats() -> dict:
+    """Current stats by name; in debug mode, also check them against a full recount."""
+    store = get_combat_stats_store()
+    if DEBUG_MODE:
+        combatants = st.session_state.get('combatants', [])
+        mismatched = store.verify(combatants)
+        if mismatched:
+            st.warning(f"Combat stats out of sync ({', '.join(mismatched)}); recounted.")
+            store = reset_combat_stats(combatants, keep_damage=store)
+    return store.as_dict()
@@ -2,7 +2,11 @@
 """Command execution and undo/redo management."""
 
 import streamlit as st
-from src.utils.command_stack import Command
+from src.utils.command_stack import Command, next_revision
+from src.utils.combat_log_store import get_combat_log
+from src.utils.combat_stats import CombatStats, get_combat_stats_store
+from src.utils.encounter_registry import is_read_only, publish_session_encounter
+from src.utils.profiler import profiled
 from src.config import MAX_COMMAND_HISTORY
 
 
@@ -14,12 +18,19 @@ def initialize_command_stack():
         st.session_state.command_stack_position = -1
 
 
+@profiled()
 def execute_command(command: Command) -> None:
     """Execute a command and add it to the undo stack."""
+    if is_read_only():
+        return  # Viewers of a shared encounter can't change it
     initialize_command_stack()
+    stats = get_combat_stats_store()
     
     # Execute the command
     command.execute()
+    _stamp_revisions(command)
+    _update_stats(command, stats)
+    _store_summary(command)
     
     # Clear any "redo" history if we're not at the end
     if st.session_state.command_stack_position < len(st.session_state.command_stack) - 1:
@@ -36,25 +47,70 @@ def execute_command(command: Command) -> None:
         st.session_state.command_stack_position -= 1
     
     # Add to combat log
-    if 'combat_log' not in st.session_state:
-        st.session_state.combat_log = []
-    st.session_state.combat_log.append(command.description())
+    _log_command(command, command.summary)
+    
+    publish_session_encounter(force=True)
+
+
+def _store_summary(command: Command) -> None:
+    """Compute the description once, while the state it refers to is current."""
+    command.summary = command.description()
+
+
+def _stamp_revisions(command: Command) -> None:
+    """Give the combatants a command changed a new revision (invalidates their view models)."""
+    if not hasattr(command, 'touched_indices'):
+        return
+    combatants = st.session_state.get('combatants', [])
+    revision = next_revision()
+    for index in command.touched_indices():
+        if 0 <= index < len(combatants):
+            combatants[index]['revision'] = revision
+
+
+def _update_stats(command: Command, stats: CombatStats) -> None:
+    """Re-count the combatants a command changed; the changes are kept on the command for undo."""
+    if not hasattr(command, 'touched_indices'):
+        return
+    combatants = st.session_state.get('combatants', [])
+    round_number = st.session_state.get('round_number', 1)
+    changes = [stats.remove(key, round_number) for key in command.removed_keys()]
+    for index in command.touched_indices():
+        if 0 <= index < len(combatants):
+            changes.append(stats.update(combatants[index], round_number))
+    command.stats_changes = changes
+
+
+def _log_command(command: Command, message: str, event_type: str | None = None) -> None:
+    """Record a command in the combat log with its round, actor and type."""
+    actor = command.resolve_actor() if hasattr(command, 'resolve_actor') else None
+    actor_id, actor_name = actor if actor else (None, None)
+    get_combat_log().append(
+        message,
+        event_type=event_type or type(command).__name__.removesuffix('Command'),
+        actor_id=actor_id,
+        actor=actor_name,
+        round_number=st.session_state.get('round_number', 1),
+    )
 
 
 def undo_last_command() -> bool:
     """Undo the last command. Returns True if successful."""
     initialize_command_stack()
     
-    if st.session_state.command_stack_position < 0:
+    if is_read_only() or st.session_state.command_stack_position < 0:
         return False  # Nothing to undo
     
     command = st.session_state.command_stack[st.session_state.command_stack_position]
+    stats = get_combat_stats_store()
     command.undo()
+    stats.revert(getattr(command, 'stats_changes', []))
     st.session_state.command_stack_position -= 1
     
     # Update combat log
-    st.session_state.combat_log.append(f"⏪ UNDO: {command.description()}")
+    _log_command(command, f"⏪ UNDO: {command.summary}", event_type="Undo")
     
+    publish_session_encounter(force=True)
     return True
 
 
@@ -62,16 +118,21 @@ def redo_last_command() -> bool:
     """Redo the last undone command. Returns True if successful."""
     initialize_command_stack()
     
-    if st.session_state.command_stack_position >= len(st.session_state.command_stack) - 1:
+    if is_read_only() or st.session_state.command_stack_position >= len(st.session_state.command_stack) - 1:
         return False  # Nothing to redo
     
     st.session_state.command_stack_position += 1
     command = st.session_state.command_stack[st.session_state.command_stack_position]
+    stats = get_combat_stats_store()
     command.execute()
+    _stamp_revisions(command)
+    _update_stats(command, stats)
+    _store_summary(command)
     
     # Update combat log
-    st.session_state.combat_log.append(f"⏩ REDO: {command.description()}")
+    _log_command(command, f"⏩ REDO: {command.summary}", event_type="Redo")
     
+    publish_session_encounter(force=True)
     return True
 
 
@@ -87,10 +148,16 @@ def can_redo() -> bool:
     return st.session_state.command_stack_position < len(st.session_state.command_stack) - 1
 
 
-def get_command_history() -> list[tuple[str, str]]:
-    """Get list of (description, technical_description) tuples for display."""
+def get_command_history() -> list[str]:
+    """Get the stored description of each command on the stack, oldest first."""
+    initialize_command_stack()
+    return [cmd.summary for cmd in st.session_state.command_stack]
+
+
+def get_command_details(position: int) -> str:
+    """Get the technical description of the command at a stack position."""
     initialize_command_stack()
-    return [(cmd.description(), cmd.technical_description()) for cmd in st.session_state.command_stack]
+    return st.session_state.command_stack[position].technical_description()
 
 
 def clear_command_stack():
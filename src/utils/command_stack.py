@@ -2,10 +2,29 @@
 from typing import Protocol, Any
 from copy import deepcopy
 import streamlit as st
+from src.config import COMPACT_SNAPSHOTS
+from src.utils.compact import CompactCombatants
+from src.utils.profiler import record_deepcopy
+
+def next_revision() -> int:
+    """Bump and return the session-wide revision counter"""
+    st.session_state.revision = st.session_state.get('revision', 0) + 1
+    return st.session_state.revision
+
+def _snapshot(key: str, value):
+    """Independent copy of a session value for a command's before/after state"""
+    if COMPACT_SNAPSHOTS and key == 'combatants' and isinstance(value, list):
+        try:
+            return CompactCombatants.from_combatants(value)
+        except (KeyError, TypeError, OverflowError):
+            pass  # Not schema-shaped (e.g. a half-built combatant); copy it as is
+    return deepcopy(value)
 
 class Command(Protocol):
     """Protocol for commands that can be undone"""
     
+    summary: str
+    
     def execute(self) -> None:
         """Execute the command"""
         ...
@@ -25,22 +44,64 @@ class Command(Protocol):
 class CombatCommand:
     """Base class for combat commands with undo support"""
     
+    summary: str = ""  # description() as of the last execute, set by command_manager
+    
     def __init__(self):
         self.before_state: dict[str, Any] = {}
         self.after_state: dict[str, Any] = {}
     
     def capture_state(self, keys: list[str]) -> dict:
-        """Capture specific parts of session state"""
-        return {
-            key: deepcopy(st.session_state.get(key))
+        """Capture specific parts of session state
+        
+        With COMPACT_SNAPSHOTS, combatants are stored as a CompactCombatants
+        table; `state['combatants'][i]['current_hp']` still works.
+        """
+        state = {
+            key: _snapshot(key, st.session_state.get(key))
             for key in keys
         }
+        record_deepcopy(state)
+        return state
     
     def restore_state(self, state: dict) -> None:
         """Restore captured state"""
         for key, value in state.items():
-            st.session_state[key] = deepcopy(value)
+            if isinstance(value, CompactCombatants):
+                st.session_state[key] = value.to_combatants()
+            else:
+                st.session_state[key] = deepcopy(value)
     
     def technical_description(self) -> str:
         """Default technical description - can be overridden"""
-        return self.description()
\ No newline at end of file
+        return self.description()
+    
+    def touched_indices(self) -> list[int]:
+        """Indices of the combatants changed by execute(); their revision is bumped.
+        
+        The default uses `self.index` when the command has one.
+        """
+        index = getattr(self, 'index', None)
+        return [] if index is None else [index]
+    
+    def removed_keys(self) -> list[str]:
+        """Ids of the combatants removed by execute(), for the combat stats"""
+        return []
+    
+    def resolve_actor(self) -> tuple[str, str] | None:
+        """(id, name) of the combatant this command acted on, for the combat log.
+        
+        Called right after execute(). The default uses `self.index` when the
+        command has one.
+        """
+        return self.actor_at(getattr(self, 'index', None))
+    
+    @staticmethod
+    def actor_at(index: int | None) -> tuple[str, str] | None:
+        """(id, name) of the combatant at `index`, if it has an id"""
+        combatants = st.session_state.get('combatants', [])
+        if index is None or not 0 <= index < len(combatants):
+            return None
+        combatant = combatants[index]
+        if 'id' not in combatant:
+            return None
+        return combatant['id'], combatant['name']
\ No newline at end of file
@@ -1,4 +1,10 @@
 from src.utils.command_stack import CombatCommand
+from src.constants import EFFECT_DURATIONS
+from src.utils.effects import (
+    concentration_dc, concentration_effects, effect_indices, effect_label, end_concentration, end_effect,
+    expire_effects, expired_after_current_turn, forget_combatant, new_effect, pop_due_effects,
+    restore_expired_effects, start_effect,
+)
 from src.utils.models import Combatant, PlayerCombatant, MonsterCombatant
 import streamlit as st
 
@@ -18,6 +24,14 @@ class AddCombatantCommand(CombatCommand):
     def description(self) -> str:
         return f"Added {self.combatant['name']} to combat"
     
+    def touched_indices(self) -> list[int]:
+        return [len(st.session_state.combatants) - 1]
+    
+    def resolve_actor(self) -> tuple[str, str] | None:
+        if 'id' not in self.combatant:
+            return None
+        return self.combatant['id'], self.combatant['name']
+    
     def technical_description(self) -> str:
         ctype = self.combatant.get('combatant_type', 'unknown')
         return f"AddCombatant(name={self.combatant['name']}, type={ctype}, init={self.combatant['initiative']})"
@@ -27,17 +41,24 @@ class RemoveCombatantCommand(CombatCommand):
         super().__init__()
         self.index = index
         self.combatant_name = ""
+        self.actor = None
+        self.ended_targets: list[int] = []
     
     def execute(self) -> None:
-        self.before_state = self.capture_state(['combatants', 'current_turn_index'])
-        self.combatant_name = st.session_state.combatants[self.index]['name']
+        self.before_state = self.capture_state(['combatants', 'current_turn_index', 'effects'])
+        combatant = st.session_state.combatants[self.index]
+        self.combatant_name = combatant['name']
+        self.actor = self.actor_at(self.index)
+        ended = forget_combatant(combatant.get('id', combatant['name']))
+        # Others whose conditions came from its concentration, at their positions after the removal
+        self.ended_targets = [i - (i > self.index) for i in effect_indices(ended) if i != self.index]
         st.session_state.combatants.pop(self.index)
         
         # Adjust current turn index if needed
         if st.session_state.current_turn_index >= len(st.session_state.combatants) and len(st.session_state.combatants) > 0:
             st.session_state.current_turn_index = 0
         
-        self.after_state = self.capture_state(['combatants', 'current_turn_index'])
+        self.after_state = self.capture_state(['combatants', 'current_turn_index', 'effects'])
     
     def undo(self) -> None:
         self.restore_state(self.before_state)
@@ -45,6 +66,15 @@ class RemoveCombatantCommand(CombatCommand):
     def description(self) -> str:
         return f"Removed {self.combatant_name} from combat"
     
+    def touched_indices(self) -> list[int]:
+        return self.ended_targets  # The combatant is gone; only others its effects were on
+    
+    def removed_keys(self) -> list[str]:
+        return [self.actor[0] if self.actor else self.combatant_name]
+    
+    def resolve_actor(self) -> tuple[str, str] | None:
+        return self.actor
+    
     def technical_description(self) -> str:
         return f"RemoveCombatant(index={self.index}, name={self.combatant_name})"
 
@@ -54,9 +84,11 @@ class ApplyDamageCommand(CombatCommand):
         self.index = index
         self.damage = damage
         self.combatant_name = ""
+        self.concentration_dc = None
+        self.lost_concentration = []
     
     def execute(self) -> None:
-        self.before_state = self.capture_state(['combatants'])
+        self.before_state = self.capture_state(['combatants', 'effects'])
         combatant = st.session_state.combatants[self.index]
         self.combatant_name = combatant['name']
         
@@ -71,14 +103,32 @@ class ApplyDamageCommand(CombatCommand):
         else:
             combatant['current_hp'] = max(0, combatant['current_hp'] - self.damage)
         
-        self.after_state = self.capture_state(['combatants'])
+        # Concentration: lost at 0 HP, otherwise the caster must make a save
+        self.concentration_dc = None
+        self.lost_concentration = []
+        key = combatant.get('id', combatant['name'])
+        if concentration_effects(key):
+            if combatant['current_hp'] == 0:
+                self.lost_concentration = end_concentration(key)
+            else:
+                self.concentration_dc = concentration_dc(self.damage)
+        
+        self.after_state = self.capture_state(['combatants', 'effects'])
     
     def undo(self) -> None:
         self.restore_state(self.before_state)
     
     def description(self) -> str:
         combatant = st.session_state.combatants[self.index] if self.index < len(st.session_state.combatants) else {'current_hp': '?', 'max_hp': '?'}
-        return f"{self.combatant_name} took {self.damage} damage (HP: {combatant['current_hp']}/{combatant['max_hp']})"
+        msg = f"{self.combatant_name} took {self.damage} damage (HP: {combatant['current_hp']}/{combatant['max_hp']})"
+        if self.lost_concentration:
+            msg += f" - 🧠 lost concentration ({', '.join(effect_label(e) for e in self.lost_concentration)})"
+        elif self.concentration_dc:
+            msg += f" - 🧠 concentration save DC {self.concentration_dc}"
+        return msg
+    
+    def touched_indices(self) -> list[int]:
+        return sorted({self.index, *effect_indices(self.lost_concentration)})
     
     def technical_description(self) -> str:
         return f"ApplyDamage(index={self.index}, damage={self.damage})"
@@ -328,15 +378,57 @@ class FullHealCommand(CombatCommand):
     def technical_description(self) -> str:
         return f"FullHeal(index={self.index})"
 
+class BatchEditCommand(CombatCommand):
+    """Apply field edits to several combatants as one undoable step"""
+    def __init__(self, changes: dict[int, dict]):
+        super().__init__()
+        self.changes = changes  # {index: {field: new_value}}
+        self.combatant_names: list[str] = []
+    
+    def execute(self) -> None:
+        self.before_state = self.capture_state(['combatants'])
+        self.combatant_names = []
+        for index, fields in self.changes.items():
+            combatant = st.session_state.combatants[index]
+            self.combatant_names.append(combatant['name'])
+            old_hp = combatant['current_hp']
+            for field, value in fields.items():
+                combatant[field] = list(value) if isinstance(value, list) else value
+            
+            # Reset death saves if brought back up from 0
+            if old_hp == 0 and combatant['current_hp'] > 0:
+                combatant['death_saves'] = {'successes': 0, 'failures': 0}
+                combatant['is_stable'] = False
+        self.after_state = self.capture_state(['combatants'])
+    
+    def undo(self) -> None:
+        self.restore_state(self.before_state)
+    
+    def description(self) -> str:
+        names = ", ".join(self.combatant_names[:3])
+        if len(self.combatant_names) > 3:
+            names += f" +{len(self.combatant_names) - 3} more"
+        return f"📝 Bulk edit: {len(self.combatant_names)} combatant(s) updated ({names})"
+    
+    def technical_description(self) -> str:
+        return f"BatchEdit(changes={self.changes})"
+    
+    def touched_indices(self) -> list[int]:
+        return list(self.changes)
+
 class NextTurnCommand(CombatCommand):
     def __init__(self):
         super().__init__()
         self.new_round = False
         self.new_combatant_name = ""
         self.skipped_count = 0
+        self.expired = []
+    
+    def resolve_actor(self) -> tuple[str, str] | None:
+        return self.actor_at(st.session_state.current_turn_index)
     
     def execute(self) -> None:
-        self.before_state = self.capture_state(['current_turn_index', 'round_number'])
+        self.before_state = self.capture_state(['current_turn_index', 'round_number', 'effects'])
         
         self.skipped_count = 0
         
@@ -377,6 +469,12 @@ class NextTurnCommand(CombatCommand):
         if len(st.session_state.combatants) > 0:
             self.new_combatant_name = st.session_state.combatants[st.session_state.current_turn_index]['name']
         
+        # End the effects whose time came between the old turn and this one
+        due = pop_due_effects()
+        if any('condition' in effect for effect in due):
+            self.before_state.update(self.capture_state(['combatants']))
+        self.expired = expire_effects(due)
+        
         self.after_state = self.capture_state(['current_turn_index', 'round_number'])
     
     def undo(self) -> None:
@@ -391,8 +489,14 @@ class NextTurnCommand(CombatCommand):
         if self.skipped_count > 0:
             msg += f" (skipped {self.skipped_count} unconscious monster(s))"
         
+        if self.expired:
+            msg += f" · ⌛ ended: {', '.join(effect_label(e) for e in self.expired)}"
+        
         return msg
     
+    def touched_indices(self) -> list[int]:
+        return effect_indices(self.expired)
+    
     def technical_description(self) -> str:
         return f"NextTurn(to_index={self.after_state.get('current_turn_index')}, round={self.after_state.get('round_number')}, skipped={self.skipped_count})"
 
@@ -402,9 +506,13 @@ class PreviousTurnCommand(CombatCommand):
         self.prev_round = False
         self.prev_combatant_name = ""
         self.skipped_count = 0
+        self.restored = []
+    
+    def resolve_actor(self) -> tuple[str, str] | None:
+        return self.actor_at(st.session_state.current_turn_index)
     
     def execute(self) -> None:
-        self.before_state = self.capture_state(['current_turn_index', 'round_number'])
+        self.before_state = self.capture_state(['current_turn_index', 'round_number', 'effects'])
         
         self.skipped_count = 0
         
@@ -445,6 +553,12 @@ class PreviousTurnCommand(CombatCommand):
         if len(st.session_state.combatants) > 0:
             self.prev_combatant_name = st.session_state.combatants[st.session_state.current_turn_index]['name']
         
+        # Bring back the effects that expired after this turn started
+        entries = expired_after_current_turn()
+        if any(removed for _, removed in entries):
+            self.before_state.update(self.capture_state(['combatants']))
+        self.restored = restore_expired_effects(entries)
+        
         self.after_state = self.capture_state(['current_turn_index', 'round_number'])
     
     def undo(self) -> None:
@@ -459,7 +573,112 @@ class PreviousTurnCommand(CombatCommand):
         if self.skipped_count > 0:
             msg += f" (skipped {self.skipped_count} unconscious monster(s))"
         
+        if self.restored:
+            msg += f" · ⏳ back in effect: {', '.join(effect_label(e) for e in self.restored)}"
+        
+        return msg
+    
+    def touched_indices(self) -> list[int]:
+        return effect_indices(self.restored)
+    
+    def technical_description(self) -> str:
+        return f"PreviousTurn(to_index={self.after_state.get('current_turn_index')}, round={self.after_state.get('round_number')}, skipped={self.skipped_count})"
+
+class AddEffectCommand(CombatCommand):
+    """Start a timed condition or spell effect on a combatant"""
+    def __init__(self, index: int, name: str, duration: str, source_index: int | None = None,
+                 condition: str | None = None, concentration: bool = False):
+        super().__init__()
+        self.index = index
+        self.name = name
+        self.duration = duration
+        self.source_index = index if source_index is None else source_index
+        self.condition = condition
+        self.concentration = concentration
+        self.combatant_name = ""
+        self.source_name = ""
+        self.ended = []
+    
+    def execute(self) -> None:
+        self.before_state = self.capture_state(['combatants', 'effects'])
+        self.combatant_name = st.session_state.combatants[self.index]['name']
+        self.source_name = st.session_state.combatants[self.source_index]['name']
+        effect = new_effect(self.name, self.index, self.duration, self.source_index, self.condition, self.concentration)
+        self.ended = start_effect(effect)
+        self.after_state = self.capture_state(['combatants', 'effects'])
+    
+    def undo(self) -> None:
+        self.restore_state(self.before_state)
+    
+    def description(self) -> str:
+        msg = f"{self.combatant_name} gained {self.name} ({EFFECT_DURATIONS[self.duration].lower()})"
+        if self.concentration:
+            msg += f" - 🧠 {self.source_name} concentrating"
+        if self.ended:
+            msg += f", no longer on {', '.join(effect_label(e) for e in self.ended)}"
         return msg
     
+    def touched_indices(self) -> list[int]:
+        return sorted({self.index, *effect_indices(self.ended)})
+    
+    def technical_description(self) -> str:
+        return (f"AddEffect(index={self.index}, name={self.name}, duration={self.duration}, "
+                f"source={self.source_index}, condition={self.condition}, concentration={self.concentration})")
+
+class EndEffectCommand(CombatCommand):
+    """End an effect early (e.g. a successful save)"""
+    def __init__(self, effect_id: str):
+        super().__init__()
+        self.effect_id = effect_id
+        self.effect = None
+        self.label = ""
+    
+    def execute(self) -> None:
+        self.before_state = self.capture_state(['combatants', 'effects'])
+        self.effect = end_effect(self.effect_id)
+        self.label = effect_label(self.effect) if self.effect else "effect"
+        self.after_state = self.capture_state(['combatants', 'effects'])
+    
+    def undo(self) -> None:
+        self.restore_state(self.before_state)
+    
+    def description(self) -> str:
+        return f"⌛ {self.label} ended"
+    
+    def touched_indices(self) -> list[int]:
+        return effect_indices([self.effect]) if self.effect else []
+    
+    def resolve_actor(self) -> tuple[str, str] | None:
+        indices = self.touched_indices()
+        return self.actor_at(indices[0]) if indices else None
+    
+    def technical_description(self) -> str:
+        return f"EndEffect(id={self.effect_id})"
+
+class BreakConcentrationCommand(CombatCommand):
+    """End everything a combatant is concentrating on"""
+    def __init__(self, index: int):
+        super().__init__()
+        self.index = index
+        self.combatant_name = ""
+        self.ended = []
+    
+    def execute(self) -> None:
+        self.before_state = self.capture_state(['combatants', 'effects'])
+        combatant = st.session_state.combatants[self.index]
+        self.combatant_name = combatant['name']
+        self.ended = end_concentration(combatant.get('id', combatant['name']))
+        self.after_state = self.capture_state(['combatants', 'effects'])
+    
+    def undo(self) -> None:
+        self.restore_state(self.before_state)
+    
+    def description(self) -> str:
+        spells = ", ".join(sorted({e['name'] for e in self.ended})) or "nothing"
+        return f"🧠 {self.combatant_name} lost concentration on {spells}"
+    
+    def touched_indices(self) -> list[int]:
+        return sorted({self.index, *effect_indices(self.ended)})
+    
     def technical_description(self) -> str:
-        return f"PreviousTurn(to_index={self.after_state.get('current_turn_index')}, round={self.after_state.get('round_number')}, skipped={self.skipped_count})"
\ No newline at end of file
+        return f"BreakConcentration(index={self.index})"
\ No newline at end of file
@@ -0,0 +1,292 @@
+# src/utils/compact.py
+"""Compact struct-of-arrays storage for combatants.
+
+A `CompactCombatants` table keeps each numeric field in a typed `array`
+column (4 or 8 bytes per combatant), the 14 standard conditions as a
+bitmask, and the strings as plain lists that share the original string
+objects. Copying a table copies the columns, never individual combatants,
+which makes it the format for undo snapshots (see
+`CombatCommand.capture_state`).
+
+`table[i]` returns a `CombatantRow`, a dict-like view that reads and writes
+the columns, so code written against combatant dicts can use it as is.
+`to_combatants()` converts back to the dicts of the JSON schema.
+
+Conditions come back in `CONDITIONS` order (then any non-standard ones in
+the order they were added), not necessarily the order they were applied.
+"""
+
+from array import array
+from collections.abc import Iterator, MutableMapping
+from copy import deepcopy
+
+from src.utils.conditions import decode_conditions, encode_conditions
+from src.utils.models import Combatant
+
+# Required integer fields of every combatant ('i': 32-bit)
+INT_FIELDS = ('initiative', 'dex_modifier', 'max_hp', 'current_hp', 'temp_hp', 'ac', 'speed', 'exhaustion')
+# Integer fields only some combatants have ('q': 64-bit, _ABSENT when missing)
+OPTIONAL_INT_FIELDS = ('revision', 'level', 'proficiency_bonus')
+# String fields every combatant has
+STR_FIELDS = ('name', 'notes', 'combatant_type')
+# String fields only some combatants have (None when missing)
+OPTIONAL_STR_FIELDS = ('id', 'class_name', 'cr', 'monster_type', 'size')
+
+_ABSENT = -(1 << 63)
+
+# Bits of the per-row flags byte
+_STABLE = 1
+_HAS_ALERT_SET = 2
+_HAS_ALERT = 4
+
+# Key order of the dicts built by to_combatants() (matches models.py)
+FIELD_ORDER = (
+    'id', 'revision', 'name', 'initiative', 'dex_modifier', 'max_hp', 'current_hp', 'temp_hp',
+    'ac', 'speed', 'conditions', 'exhaustion', 'death_saves', 'is_stable', 'notes',
+    'combatant_type', 'class_name', 'level', 'proficiency_bonus', 'has_alert',
+    'cr', 'monster_type', 'size',
+)
+_KNOWN_FIELDS = frozenset(FIELD_ORDER)
+
+
+class CompactCombatants:
+    """Combatants stored column by column."""
+
+    __slots__ = (
+        '_ints', '_optional_ints', '_strs', '_optional_strs',
+        '_conditions', '_other_conditions', '_successes', '_failures', '_flags', '_extras',
+    )
+
+    def __init__(self):
+        self._ints = {field: array('i') for field in INT_FIELDS}
+        self._optional_ints = {field: array('q') for field in OPTIONAL_INT_FIELDS}
+        self._strs: dict[str, list[str]] = {field: [] for field in STR_FIELDS}
+        self._optional_strs: dict[str, list[str | None]] = {field: [] for field in OPTIONAL_STR_FIELDS}
+        self._conditions = array('I')
+        self._other_conditions: list[list[str] | None] = []  # Conditions outside CONDITIONS
+        self._successes = array('b')
+        self._failures = array('b')
+        self._flags = bytearray()
+        self._extras: list[dict | None] = []  # Keys the schema doesn't know about
+
+    @classmethod
+    def from_combatants(cls, combatants: list[Combatant]) -> 'CompactCombatants':
+        """Build a table from (validated) combatant dicts."""
+        table = cls()
+        for combatant in combatants:
+            table.append(combatant)
+        return table
+
+    def append(self, combatant: Combatant) -> None:
+        """Add a combatant dict as the last row."""
+        for field, column in self._ints.items():
+            column.append(combatant[field])
+        for field, column in self._optional_ints.items():
+            column.append(combatant.get(field, _ABSENT))
+        for field, column in self._strs.items():
+            column.append(combatant[field])
+        for field, column in self._optional_strs.items():
+            column.append(combatant.get(field))
+
+        mask, other = encode_conditions(combatant['conditions'])
+        self._conditions.append(mask)
+        self._other_conditions.append(other)
+        death_saves = combatant['death_saves']
+        self._successes.append(death_saves['successes'])
+        self._failures.append(death_saves['failures'])
+
+        flags = _STABLE if combatant['is_stable'] else 0
+        if 'has_alert' in combatant:
+            flags |= _HAS_ALERT_SET | (_HAS_ALERT if combatant['has_alert'] else 0)
+        self._flags.append(flags)
+
+        extras = {key: deepcopy(value) for key, value in combatant.items() if key not in _KNOWN_FIELDS}
+        self._extras.append(extras or None)
+
+    def copy(self) -> 'CompactCombatants':
+        """Independent copy: one copy per column, shared (immutable) strings."""
+        table = CompactCombatants.__new__(CompactCombatants)
+        table._ints = {field: column[:] for field, column in self._ints.items()}
+        table._optional_ints = {field: column[:] for field, column in self._optional_ints.items()}
+        table._strs = {field: column[:] for field, column in self._strs.items()}
+        table._optional_strs = {field: column[:] for field, column in self._optional_strs.items()}
+        table._conditions = self._conditions[:]
+        # Rows replace these lists/dicts instead of mutating them, so sharing is safe
+        table._other_conditions = self._other_conditions[:]
+        table._successes = self._successes[:]
+        table._failures = self._failures[:]
+        table._flags = self._flags[:]
+        table._extras = self._extras[:]
+        return table
+
+    def __len__(self) -> int:
+        return len(self._flags)
+
+    def __getitem__(self, index: int) -> 'CombatantRow':
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("combatant index out of range")
+        return CombatantRow(self, index)
+
+    def __iter__(self) -> Iterator['CombatantRow']:
+        return (CombatantRow(self, index) for index in range(len(self)))
+
+    # =========================================================================
+    # Fields
+    # =========================================================================
+    def get_field(self, index: int, key: str):
+        """Value of one field of one row, as it appears in a combatant dict.
+
+        Raises:
+            KeyError: If the row has no such field
+        """
+        if key in self._ints:
+            return self._ints[key][index]
+        if key in self._strs:
+            return self._strs[key][index]
+        if key in self._optional_ints:
+            value = self._optional_ints[key][index]
+            if value == _ABSENT:
+                raise KeyError(key)
+            return value
+        if key in self._optional_strs:
+            value = self._optional_strs[key][index]
+            if value is None:
+                raise KeyError(key)
+            return value
+        if key == 'conditions':
+            return decode_conditions(self._conditions[index], self._other_conditions[index])
+        if key == 'death_saves':
+            return {'successes': self._successes[index], 'failures': self._failures[index]}
+        if key == 'is_stable':
+            return bool(self._flags[index] & _STABLE)
+        if key == 'has_alert':
+            if not self._flags[index] & _HAS_ALERT_SET:
+                raise KeyError(key)
+            return bool(self._flags[index] & _HAS_ALERT)
+        extras = self._extras[index]
+        if extras is None or key not in extras:
+            raise KeyError(key)
+        return extras[key]
+
+    def set_field(self, index: int, key: str, value) -> None:
+        """Assign one field of one row."""
+        if key in self._ints:
+            self._ints[key][index] = value
+        elif key in self._strs:
+            self._strs[key][index] = value
+        elif key in self._optional_ints:
+            self._optional_ints[key][index] = value
+        elif key in self._optional_strs:
+            self._optional_strs[key][index] = value
+        elif key == 'conditions':
+            self._conditions[index], self._other_conditions[index] = encode_conditions(value)
+        elif key == 'death_saves':
+            self._successes[index] = value['successes']
+            self._failures[index] = value['failures']
+        elif key == 'is_stable':
+            self._flags[index] = (self._flags[index] & ~_STABLE) | (_STABLE if value else 0)
+        elif key == 'has_alert':
+            self._flags[index] = (self._flags[index] & _STABLE) | _HAS_ALERT_SET | (_HAS_ALERT if value else 0)
+        else:
+            self._extras[index] = {**(self._extras[index] or {}), key: value}
+
+    def delete_field(self, index: int, key: str) -> None:
+        """Remove an optional field from one row.
+
+        Raises:
+            KeyError: If the field is missing or required
+        """
+        self.get_field(index, key)  # KeyError if missing
+        if key in self._optional_ints:
+            self._optional_ints[key][index] = _ABSENT
+        elif key in self._optional_strs:
+            self._optional_strs[key][index] = None
+        elif key == 'has_alert':
+            self._flags[index] &= _STABLE
+        elif key in _KNOWN_FIELDS:
+            raise KeyError(f"{key} is required")
+        else:
+            extras = {k: v for k, v in self._extras[index].items() if k != key}
+            self._extras[index] = extras or None
+
+    def row_keys(self, index: int) -> list[str]:
+        """Fields present in one row, in schema order (then any extra keys)."""
+        keys = [key for key in FIELD_ORDER if self.has_field(index, key)]
+        if self._extras[index]:
+            keys.extend(self._extras[index])
+        return keys
+
+    def has_field(self, index: int, key: str) -> bool:
+        if key in self._optional_ints:
+            return self._optional_ints[key][index] != _ABSENT
+        if key in self._optional_strs:
+            return self._optional_strs[key][index] is not None
+        if key == 'has_alert':
+            return bool(self._flags[index] & _HAS_ALERT_SET)
+        if key in _KNOWN_FIELDS:
+            return True
+        return bool(self._extras[index]) and key in self._extras[index]
+
+    # =========================================================================
+    # Conversion
+    # =========================================================================
+    def to_combatant(self, index: int) -> Combatant:
+        """One row as a new combatant dict."""
+        combatant = {}
+        for key in FIELD_ORDER:
+            if key in self._ints:
+                combatant[key] = self._ints[key][index]
+            elif key in self._strs:
+                combatant[key] = self._strs[key][index]
+            elif self.has_field(index, key):
+                combatant[key] = self.get_field(index, key)
+        if self._extras[index]:
+            combatant.update(deepcopy(self._extras[index]))
+        return combatant
+
+    def to_combatants(self) -> list[Combatant]:
+        """All rows as new combatant dicts (the JSON schema of models.py)."""
+        return [self.to_combatant(index) for index in range(len(self))]
+
+
+class CombatantRow(MutableMapping):
+    """Dict-like view of one row of a CompactCombatants table.
+
+    Reads and writes go straight to the table's columns. Values that are
+    containers ('conditions', 'death_saves') are built on each read, so
+    change them by assigning a new value, e.g.
+    `row['conditions'] = [*row['conditions'], "Prone"]`.
+    """
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: CompactCombatants, index: int):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, key: str):
+        return self._table.get_field(self._index, key)
+
+    def __setitem__(self, key: str, value) -> None:
+        self._table.set_field(self._index, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self._table.delete_field(self._index, key)
+
+    def __contains__(self, key) -> bool:
+        return self._table.has_field(self._index, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table.row_keys(self._index))
+
+    def __len__(self) -> int:
+        return len(self._table.row_keys(self._index))
+
+    def __repr__(self) -> str:
+        return f"CombatantRow({self.to_dict()!r})"
+
+    def to_dict(self) -> Combatant:
+        """This row as a new combatant dict."""
+        return self._table.to_combatant(self._index)
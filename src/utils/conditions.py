@@ -0,0 +1,112 @@
+# src/utils/conditions.py
+"""Condition bitmasks and the index of which combatants have each condition.
+
+A combatant's standard conditions (`CONDITIONS`) map to one bit each, so a
+set of conditions is an int: adding, removing and testing are single bit
+operations, and masks compare and combine with `&`, `|` and `^`. Combatant
+dicts and save files keep the `conditions` list; `encode_conditions` and
+`decode_conditions` convert between the two.
+
+`ConditionIndex` maps each condition to the keys (ids) of the combatants
+that have it. It lives in the combat stats store, which `command_manager`
+keeps in sync with every command and reverts on undo.
+"""
+
+from collections.abc import Iterable
+
+from src.constants import CONDITIONS
+
+# Condition name -> bit
+CONDITION_BITS: dict[str, int] = {name: 1 << position for position, name in enumerate(CONDITIONS)}
+_NAMES_BY_BIT: dict[int, str] = {bit: name for name, bit in CONDITION_BITS.items()}
+
+
+def encode_conditions(conditions: Iterable[str]) -> tuple[int, list[str] | None]:
+    """Split conditions into a bitmask of the standard ones and a list of any others."""
+    mask = 0
+    other = None
+    for condition in conditions:
+        bit = CONDITION_BITS.get(condition)
+        if bit is not None:
+            mask |= bit
+        elif other is None:
+            other = [condition]
+        elif condition not in other:
+            other.append(condition)
+    return mask, other
+
+
+def decode_conditions(mask: int, other: list[str] | None = None) -> list[str]:
+    """Condition names for a bitmask (plus non-standard ones), in CONDITIONS order."""
+    names = [name for name, bit in CONDITION_BITS.items() if mask & bit] if mask else []
+    if other:
+        names.extend(other)
+    return names
+
+
+def conditions_mask(names: Iterable[str]) -> int:
+    """Bitmask of standard condition names.
+
+    Raises:
+        KeyError: If a name is not one of CONDITIONS
+    """
+    mask = 0
+    for name in names:
+        mask |= CONDITION_BITS[name]
+    return mask
+
+
+def combatant_mask(combatant: dict) -> int:
+    """Bitmask of a combatant's standard conditions."""
+    return encode_conditions(combatant['conditions'])[0]
+
+
+class ConditionIndex:
+    """Which combatants have each condition, updated one combatant at a time."""
+
+    def __init__(self):
+        self.masks: dict[str, int] = {}  # Combatant key -> mask (only combatants with conditions)
+        self._holders: dict[str, set[str]] = {name: set() for name in CONDITIONS}
+
+    def __len__(self) -> int:
+        """Number of combatants with at least one standard condition"""
+        return len(self.masks)
+
+    def move(self, key: str, old_mask: int, new_mask: int) -> None:
+        """Record that a combatant's conditions changed from `old_mask` to `new_mask`."""
+        changed = old_mask ^ new_mask
+        while changed:
+            bit = changed & -changed  # Lowest changed bit
+            changed ^= bit
+            if new_mask & bit:
+                self._holders[_NAMES_BY_BIT[bit]].add(key)
+            else:
+                self._holders[_NAMES_BY_BIT[bit]].discard(key)
+        if new_mask:
+            self.masks[key] = new_mask
+        else:
+            self.masks.pop(key, None)
+
+    def mask(self, key: str) -> int:
+        """A combatant's condition mask (0 if unknown or condition-free)."""
+        return self.masks.get(key, 0)
+
+    def has(self, key: str, condition: str) -> bool:
+        return bool(self.masks.get(key, 0) & CONDITION_BITS[condition])
+
+    def with_condition(self, condition: str) -> set[str]:
+        """Keys of the combatants that have a condition (don't modify the result)."""
+        return self._holders[condition]
+
+    def with_all(self, conditions: Iterable[str]) -> set[str]:
+        """Keys of the combatants that have every one of the conditions."""
+        sets = sorted((self._holders[name] for name in conditions), key=len)
+        return set.intersection(*sets) if sets else set(self.masks)
+
+    def with_any(self, conditions: Iterable[str]) -> set[str]:
+        """Keys of the combatants that have at least one of the conditions."""
+        return set().union(*(self._holders[name] for name in conditions))
+
+    def counts(self) -> dict[str, int]:
+        """Number of combatants per condition, for the conditions anyone has."""
+        return {name: len(holders) for name, holders in self._holders.items() if holders}
@@ -1,14 +1,39 @@
 # src/utils/data_manager.py
 from pathlib import Path
 import json
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 import streamlit as st
+from src.config import STORAGE_BACKEND, SQLITE_FILENAME, HISTORY_FOLDER, LOGS_FOLDER
+from src.utils.sqlite_store import SQLiteStore, StoredEntry
 
 # Define data directory path (relative to project root)
 DATA_DIR = Path(__file__).parent.parent.parent / "data"
 COMBAT_DIR = DATA_DIR / "combats"
 PLAYER_DIR = DATA_DIR / "players"
 MONSTER_DIR = DATA_DIR / "monsters"
+HISTORY_DIR = DATA_DIR / HISTORY_FOLDER
+LOG_DIR = DATA_DIR / LOGS_FOLDER
+SQLITE_DB_FILE = DATA_DIR / SQLITE_FILENAME
+
+AUTO_ROSTER_NAME = "auto_roster"
+AUTO_LIBRARY_NAME = "auto_library"
+
+_sqlite_store: SQLiteStore | None = None
+
+def use_sqlite() -> bool:
+    """Whether saves go to the SQLite database instead of JSON files"""
+    return STORAGE_BACKEND == "sqlite"
+
+def get_sqlite_store() -> SQLiteStore:
+    """Get the shared SQLite store (created on first use)"""
+    global _sqlite_store
+    if _sqlite_store is None:
+        _sqlite_store = SQLiteStore(SQLITE_DB_FILE)
+    return _sqlite_store
+
+def _strip_json_extension(filename: str) -> str:
+    return filename[:-len('.json')] if filename.endswith('.json') else filename
 
 def initialize_data_directories():
     """Create data directories if they don't exist"""
@@ -17,27 +42,48 @@ def initialize_data_directories():
     PLAYER_DIR.mkdir(exist_ok=True)
     MONSTER_DIR.mkdir(exist_ok=True)
 
-def get_combat_files():
-    """Get list of saved combat files"""
+# Directory listings, keyed by directory: (directory mtime, files newest first)
+_listing_cache: dict[Path, tuple[int, list[Path]]] = {}
+
+def _list_json_files(directory: Path) -> list[Path]:
+    """List the JSON files in a data directory, newest first.
+    
+    The listing is cached until the directory's mtime changes (a file was
+    added, removed or renamed) or a save overwrites an existing file.
+    """
     initialize_data_directories()
-    files = list(COMBAT_DIR.glob("*.json"))
+    dir_mtime = directory.stat().st_mtime_ns
+    cached = _listing_cache.get(directory)
+    if cached is not None and cached[0] == dir_mtime:
+        return list(cached[1])
+    
+    files = list(directory.glob("*.json"))
     # Sort by modification time, newest first
     files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-    return files
+    _listing_cache[directory] = (dir_mtime, files)
+    return list(files)
+
+def _invalidate_listing(directory: Path) -> None:
+    """Drop a cached listing (overwriting a file doesn't change the directory mtime)"""
+    _listing_cache.pop(directory, None)
+
+def get_combat_files():
+    """Get list of saved combat files"""
+    if use_sqlite():
+        return get_sqlite_store().list_combats()
+    return _list_json_files(COMBAT_DIR)
 
 def get_player_roster_files():
     """Get list of saved player roster files"""
-    initialize_data_directories()
-    files = list(PLAYER_DIR.glob("*.json"))
-    files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-    return files
+    if use_sqlite():
+        return get_sqlite_store().list_rosters()
+    return _list_json_files(PLAYER_DIR)
 
 def get_monster_library_files():
     """Get list of saved monster library files"""
-    initialize_data_directories()
-    files = list(MONSTER_DIR.glob("*.json"))
-    files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-    return files
+    if use_sqlite():
+        return get_sqlite_store().list_libraries()
+    return _list_json_files(MONSTER_DIR)
 
 def save_combat_to_file(combat_data: dict, filename: str = None) -> tuple[bool, str, Path]:
     """Save combat data to a file in the data directory
@@ -52,6 +98,11 @@ def save_combat_to_file(combat_data: dict, filename: str = None) -> tuple[bool,
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"combat_{timestamp}.json"
         
+        if use_sqlite():
+            name = _strip_json_extension(filename)
+            get_sqlite_store().save_combat(name, combat_data)
+            return True, f"Combat saved to {name}", StoredEntry('combat', name, datetime.now().isoformat())
+        
         # Ensure .json extension
         if not filename.endswith('.json'):
             filename += '.json'
@@ -60,6 +111,7 @@ def save_combat_to_file(combat_data: dict, filename: str = None) -> tuple[bool,
         
         with open(filepath, 'w') as f:
             json.dump(combat_data, f, indent=2)
+        _invalidate_listing(COMBAT_DIR)
         
         return True, f"Combat saved to {filepath.name}", filepath
     
@@ -73,8 +125,13 @@ def load_combat_from_file(filepath: Path) -> tuple[bool, str, dict]:
         tuple: (success, message, data)
     """
     try:
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        if isinstance(filepath, StoredEntry):
+            data = get_sqlite_store().load_combat(filepath.stem)
+            if data is None:
+                return False, f"Error loading combat: {filepath.name} not found", None
+        else:
+            with open(filepath, 'r') as f:
+                data = json.load(f)
         
         return True, f"Combat loaded from {filepath.name}", data
     
@@ -88,7 +145,10 @@ def delete_combat_file(filepath: Path) -> tuple[bool, str]:
         tuple: (success, message)
     """
     try:
-        filepath.unlink()
+        if isinstance(filepath, StoredEntry):
+            get_sqlite_store().delete_combat(filepath.stem)
+        else:
+            filepath.unlink()
         return True, f"Deleted {filepath.name}"
     except Exception as e:
         return False, f"Error deleting file: {str(e)}"
@@ -106,6 +166,11 @@ def save_player_roster_to_file(roster_data: dict, filename: str = None) -> tuple
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"players_{timestamp}.json"
         
+        if use_sqlite():
+            name = _strip_json_extension(filename)
+            get_sqlite_store().save_roster(name, roster_data)
+            return True, f"Player roster saved to {name}", StoredEntry('roster', name, datetime.now().isoformat())
+        
         if not filename.endswith('.json'):
             filename += '.json'
         
@@ -113,6 +178,7 @@ def save_player_roster_to_file(roster_data: dict, filename: str = None) -> tuple
         
         with open(filepath, 'w') as f:
             json.dump(roster_data, f, indent=2)
+        _invalidate_listing(PLAYER_DIR)
         
         return True, f"Player roster saved to {filepath.name}", filepath
     
@@ -126,8 +192,13 @@ def load_player_roster_from_file(filepath: Path) -> tuple[bool, str, dict]:
         tuple: (success, message, data)
     """
     try:
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        if isinstance(filepath, StoredEntry):
+            data = get_sqlite_store().load_roster(filepath.stem)
+            if data is None:
+                return False, f"Error loading roster: {filepath.name} not found", None
+        else:
+            with open(filepath, 'r') as f:
+                data = json.load(f)
         
         return True, f"Player roster loaded from {filepath.name}", data
     
@@ -141,7 +212,10 @@ def delete_player_roster_file(filepath: Path) -> tuple[bool, str]:
         tuple: (success, message)
     """
     try:
-        filepath.unlink()
+        if isinstance(filepath, StoredEntry):
+            get_sqlite_store().delete_roster(filepath.stem)
+        else:
+            filepath.unlink()
         return True, f"Deleted {filepath.name}"
     except Exception as e:
         return False, f"Error deleting file: {str(e)}"
@@ -159,6 +233,11 @@ def save_monster_library_to_file(library_data: dict, filename: str = None) -> tu
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"monsters_{timestamp}.json"
         
+        if use_sqlite():
+            name = _strip_json_extension(filename)
+            get_sqlite_store().save_library(name, library_data)
+            return True, f"Monster library saved to {name}", StoredEntry('library', name, datetime.now().isoformat())
+        
         if not filename.endswith('.json'):
             filename += '.json'
         
@@ -166,6 +245,7 @@ def save_monster_library_to_file(library_data: dict, filename: str = None) -> tu
         
         with open(filepath, 'w') as f:
             json.dump(library_data, f, indent=2)
+        _invalidate_listing(MONSTER_DIR)
         
         return True, f"Monster library saved to {filepath.name}", filepath
     
@@ -179,8 +259,13 @@ def load_monster_library_from_file(filepath: Path) -> tuple[bool, str, dict]:
         tuple: (success, message, data)
     """
     try:
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        if isinstance(filepath, StoredEntry):
+            data = get_sqlite_store().load_library(filepath.stem)
+            if data is None:
+                return False, f"Error loading library: {filepath.name} not found", None
+        else:
+            with open(filepath, 'r') as f:
+                data = json.load(f)
         
         return True, f"Monster library loaded from {filepath.name}", data
     
@@ -194,7 +279,10 @@ def delete_monster_library_file(filepath: Path) -> tuple[bool, str]:
         tuple: (success, message)
     """
     try:
-        filepath.unlink()
+        if isinstance(filepath, StoredEntry):
+            get_sqlite_store().delete_library(filepath.stem)
+        else:
+            filepath.unlink()
         return True, f"Deleted {filepath.name}"
     except Exception as e:
         return False, f"Error deleting file: {str(e)}"
@@ -216,26 +304,36 @@ def auto_save_player_roster():
             'version': '1.0'
         }
         
+        if use_sqlite():
+            get_sqlite_store().save_roster(AUTO_ROSTER_NAME, roster_data)
+            return
+        
         with open(AUTO_SAVE_ROSTER_FILE, 'w') as f:
             json.dump(roster_data, f, indent=2)
     except Exception:
         pass  # Silently fail auto-save
 
-def auto_load_player_roster():
-    """Auto-load the player roster on startup"""
-    if AUTO_SAVE_ROSTER_FILE.exists():
+def read_auto_player_roster() -> dict | None:
+    """Read the auto-saved player roster without touching session state (safe off the main thread)"""
+    if use_sqlite() or AUTO_SAVE_ROSTER_FILE.exists():
         try:
-            with open(AUTO_SAVE_ROSTER_FILE, 'r') as f:
-                data = json.load(f)
-            
-            if 'players' in data:
-                if 'player_roster' not in st.session_state:
-                    st.session_state.player_roster = {}
-                st.session_state.player_roster = data['players']
-                return True
+            if use_sqlite():
+                data = get_sqlite_store().load_roster(AUTO_ROSTER_NAME) or {}
+            else:
+                with open(AUTO_SAVE_ROSTER_FILE, 'r') as f:
+                    data = json.load(f)
+            return data.get('players')
         except Exception:
             pass  # Silently fail auto-load
-    return False
+    return None
+
+def auto_load_player_roster():
+    """Auto-load the player roster on startup"""
+    players = read_auto_player_roster()
+    if players is None:
+        return False
+    st.session_state.player_roster = players
+    return True
 
 def auto_save_monster_library():
     """Auto-save the current monster library"""
@@ -250,30 +348,62 @@ def auto_save_monster_library():
             'version': '1.0'
         }
         
+        if use_sqlite():
+            get_sqlite_store().save_library(AUTO_LIBRARY_NAME, library_data)
+            return
+        
         with open(AUTO_SAVE_LIBRARY_FILE, 'w') as f:
             json.dump(library_data, f, indent=2)
     except Exception:
         pass  # Silently fail auto-save
 
-def auto_load_monster_library():
-    """Auto-load the monster library on startup"""
-    if AUTO_SAVE_LIBRARY_FILE.exists():
+def read_auto_monster_library() -> dict | None:
+    """Read the auto-saved monster library without touching session state (safe off the main thread)"""
+    if use_sqlite() or AUTO_SAVE_LIBRARY_FILE.exists():
         try:
-            with open(AUTO_SAVE_LIBRARY_FILE, 'r') as f:
-                data = json.load(f)
-            
-            if 'monsters' in data:
-                if 'saved_monsters' not in st.session_state:
-                    st.session_state.saved_monsters = {}
-                st.session_state.saved_monsters = data['monsters']
-                return True
+            if use_sqlite():
+                data = get_sqlite_store().load_library(AUTO_LIBRARY_NAME) or {}
+            else:
+                with open(AUTO_SAVE_LIBRARY_FILE, 'r') as f:
+                    data = json.load(f)
+            return data.get('monsters')
         except Exception:
             pass  # Silently fail auto-load
-    return False
+    return None
+
+def auto_load_monster_library():
+    """Auto-load the monster library on startup"""
+    monsters = read_auto_monster_library()
+    if monsters is None:
+        return False
+    st.session_state.saved_monsters = monsters
+    return True
+
+# Background auto-load: files are read on a worker thread, and the result is
+# applied to the session by the script thread once it's ready
+_auto_load_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="auto-load")
+
+def start_auto_load() -> Future:
+    """Read the auto-saved roster and library on a worker thread.
+    
+    Returns:
+        Future resolving to (players, monsters); either is None if there was nothing to load
+    """
+    return _auto_load_executor.submit(lambda: (read_auto_player_roster(), read_auto_monster_library()))
+
+def apply_auto_load(players: dict | None, monsters: dict | None) -> None:
+    """Put auto-loaded data into the session, keeping anything added while it was loading"""
+    if players is not None:
+        st.session_state.player_roster = {**players, **st.session_state.get('player_roster', {})}
+    if monsters is not None:
+        st.session_state.saved_monsters = {**monsters, **st.session_state.get('saved_monsters', {})}
 
 def format_file_time(filepath: Path) -> str:
     """Format file modification time for display"""
-    mtime = datetime.fromtimestamp(filepath.stat().st_mtime)
+    if isinstance(filepath, StoredEntry):
+        mtime = datetime.fromtimestamp(filepath.mtime)
+    else:
+        mtime = datetime.fromtimestamp(filepath.stat().st_mtime)
     now = datetime.now()
     
     # If today, show time
@@ -290,4 +420,25 @@ def format_file_time(filepath: Path) -> str:
     
     # Otherwise full date
     else:
-        return mtime.strftime("%b %d, %Y at %I:%M %p")
\ No newline at end of file
+        return mtime.strftime("%b %d, %Y at %I:%M %p")
+
+def find_saved_combats_with(combatant_name: str) -> list[str]:
+    """Names of saved combats that include a combatant with this name.
+    
+    Uses the indexed SQLite store when enabled, otherwise scans the JSON saves.
+    """
+    if use_sqlite():
+        return get_sqlite_store().find_combats_with(combatant_name)
+    
+    target = combatant_name.lower().strip()
+    matches = []
+    for filepath in get_combat_files():
+        success, _, data = load_combat_from_file(filepath)
+        if not success:
+            continue
+        for combatant in data.get('combatants', []):
+            name = combatant.get('name', '').lower()
+            if name == target or name.startswith(target + ' '):
+                matches.append(filepath.stem)
+                break
+    return sorted(matches)
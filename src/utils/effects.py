@@ -0,0 +1,371 @@
+# src/utils/effects.py
+"""Timed conditions and spell effects that end on a given turn.
+
+An effect ends at the start or end of one combatant's turn (its anchor) in
+a given round, e.g. "until the end of the goblin's next turn" or "1 minute"
+(10 rounds). The effects are session state (`st.session_state.effects`):
+the commands that change them capture it like the combatants, so undo
+restores both.
+
+`EffectScheduler` is a cache over that state: a heap of expiries keyed by
+(round, initiative position, trigger). NextTurnCommand pops the effects
+due by the new turn, O(log n) each; PreviousTurnCommand brings back the
+ones whose expiry is ahead again. The heap is rebuilt when the effects
+state is replaced (undo, load) or the turn order changes.
+
+Concentration uses the same effects: each concentration effect records
+its caster (source). Starting a different concentration spell, or the
+caster dropping to 0 HP, ends the caster's other concentration effects.
+"""
+
+import heapq
+import itertools
+import uuid
+import streamlit as st
+from src.config import EXPIRED_EFFECTS_KEPT, ROUNDS_PER_MINUTE
+from src.constants import CONCENTRATION_DC_MAX, CONCENTRATION_DC_MIN
+from src.utils.models import Effect
+
+# At one position, start-of-turn expiries come before end-of-turn ones
+TRIGGER_ORDER = {'start': 0, 'end': 1}
+
+# Rounds an effect lasts, for the fixed durations in EFFECT_DURATIONS
+DURATION_ROUNDS = {
+    'minute': ROUNDS_PER_MINUTE,
+    'ten_minutes': 10 * ROUNDS_PER_MINUTE,
+}
+
+TurnPoint = tuple[int, int, int]  # (round, initiative position, trigger order)
+
+
+def _key(combatant: dict) -> str:
+    return combatant.get('id', combatant['name'])
+
+
+# =============================================================================
+# State
+# =============================================================================
+def get_effects_state() -> dict:
+    """The session's effects.
+
+    Returns:
+        {'active': {effect id: Effect}, 'expired': [[Effect, condition removed], ...]}
+        with 'expired' in the order the effects expired
+    """
+    if st.session_state.get('effects') is None:  # Also None when an undo restores a pre-effects snapshot
+        reset_effects()
+    return st.session_state.effects
+
+
+def reset_effects(active: list[Effect] | None = None) -> None:
+    """Replace all effects, e.g. after loading a save or ending combat."""
+    st.session_state.effects = {'active': {effect['id']: effect for effect in active or []}, 'expired': []}
+
+
+def active_effects() -> list[Effect]:
+    return list(get_effects_state()['active'].values())
+
+
+def effects_on(combatant: dict) -> list[Effect]:
+    """Active effects on a combatant."""
+    key = _key(combatant)
+    return [effect for effect in get_effects_state()['active'].values() if effect['target_id'] == key]
+
+
+def concentration_of(combatant: dict) -> list[Effect]:
+    """Active effects a combatant is concentrating on."""
+    return concentration_effects(_key(combatant))
+
+
+def concentration_effects(combatant_key: str) -> list[Effect]:
+    """Active effects a combatant is concentrating on."""
+    return [
+        effect for effect in get_effects_state()['active'].values()
+        if effect['concentration'] and effect.get('source_id') == combatant_key
+    ]
+
+
+# =============================================================================
+# Scheduler
+# =============================================================================
+class EffectScheduler:
+    """Heap of effect expiries keyed by (round, initiative position, trigger)."""
+
+    def __init__(self, state: dict, combatants: list):
+        self.state = state
+        self.combatants = combatants
+        self.size = len(combatants)
+        self.positions = {_key(combatant): index for index, combatant in enumerate(combatants)}
+        self._seq = itertools.count()  # Tie-breaker: effects at the same point expire in the order added
+        self._heap = [self._entry(effect) for effect in state['active'].values() if effect['expires_round']]
+        heapq.heapify(self._heap)
+
+    def matches(self, state: dict, combatants: list) -> bool:
+        """Whether this scheduler was built for this state and (unchanged) turn order"""
+        return state is self.state and combatants is self.combatants and len(combatants) == self.size
+
+    def expiry_point(self, effect: Effect) -> TurnPoint:
+        # An anchor that left the fight expires the effect at the start of its round
+        position = self.positions.get(effect['anchor_id'], -1)
+        return effect['expires_round'], position, TRIGGER_ORDER[effect['trigger']]
+
+    def _entry(self, effect: Effect) -> tuple:
+        return (*self.expiry_point(effect), next(self._seq), effect['id'])
+
+    def push(self, effect: Effect) -> None:
+        """Schedule an active effect (no-op if it has no set end)"""
+        if effect['expires_round']:
+            heapq.heappush(self._heap, self._entry(effect))
+
+    def pop_due(self, point: TurnPoint) -> list[Effect]:
+        """Take the active effects that expire at or before `point` off the heap, soonest first.
+
+        Entries of effects that already ended are dropped on the way.
+        """
+        active = self.state['active']
+        due = []
+        while self._heap and self._heap[0][:3] <= point:
+            effect = active.get(heapq.heappop(self._heap)[4])
+            if effect is not None:
+                due.append(effect)
+        return due
+
+    def next_expiry(self) -> TurnPoint | None:
+        """When the next effect expires"""
+        active = self.state['active']
+        while self._heap and self._heap[0][4] not in active:
+            heapq.heappop(self._heap)
+        return self._heap[0][:3] if self._heap else None
+
+
+def get_effect_scheduler() -> EffectScheduler:
+    """The session's scheduler, rebuilt if the effects or the turn order were replaced."""
+    state = get_effects_state()
+    combatants = st.session_state.get('combatants', [])
+    scheduler = st.session_state.get('effect_scheduler')
+    if not isinstance(scheduler, EffectScheduler) or not scheduler.matches(state, combatants):
+        scheduler = EffectScheduler(state, combatants)
+        st.session_state.effect_scheduler = scheduler
+    return scheduler
+
+
+def invalidate_effect_scheduler() -> None:
+    """Rebuild the scheduler on next use; call after reordering the combatants in place."""
+    if 'effect_scheduler' in st.session_state:
+        del st.session_state['effect_scheduler']
+
+
+def current_turn_point() -> TurnPoint:
+    """The start of the current turn"""
+    return st.session_state.round_number, st.session_state.current_turn_index, TRIGGER_ORDER['start']
+
+
+# =============================================================================
+# Starting and ending effects
+# =============================================================================
+def new_effect(name: str, target_index: int, duration: str, source_index: int | None = None,
+               condition: str | None = None, concentration: bool = False) -> Effect:
+    """Build an effect that starts now.
+
+    Args:
+        name: Spell or effect name (the condition's name for plain conditions)
+        target_index: Combatant affected
+        duration: Key of EFFECT_DURATIONS
+        source_index: Combatant that caused it (default: the target)
+        condition: Condition added now and removed when the effect ends
+        concentration: The source concentrates on it
+    """
+    combatants = st.session_state.combatants
+    source_index = target_index if source_index is None else source_index
+    expires_round, anchor_index, trigger = expiry_for(duration, source_index, target_index)
+    effect = {
+        'id': uuid.uuid4().hex[:12],
+        'name': name,
+        'target_id': _key(combatants[target_index]),
+        'source_id': _key(combatants[source_index]),
+        'concentration': concentration,
+        'anchor_id': _key(combatants[anchor_index]),
+        'trigger': trigger,
+        'expires_round': expires_round,
+    }
+    if condition:
+        effect['condition'] = condition
+    return effect
+
+
+def expiry_for(duration: str, source_index: int, target_index: int) -> tuple[int, int, str]:
+    """(round, anchor index, trigger) at which an effect starting now ends.
+
+    "Next turn" is the combatant's turn later this round if it hasn't come
+    yet, otherwise next round's. The round is 0 for 'permanent'.
+    """
+    round_number = st.session_state.round_number
+    current = st.session_state.current_turn_index if st.session_state.combat_active else -1
+
+    def next_turn_round(position: int) -> int:
+        return round_number if position > current else round_number + 1
+
+    if duration == 'permanent':
+        return 0, source_index, 'end'
+    if duration == 'source_start':
+        return next_turn_round(source_index), source_index, 'start'
+    if duration == 'source_end':
+        return next_turn_round(source_index), source_index, 'end'
+    if duration == 'target_end':
+        return next_turn_round(target_index), target_index, 'end'
+    if duration in DURATION_ROUNDS:
+        # Ends when the turn it started on comes round again, N rounds later
+        anchor = current if current >= 0 else source_index
+        return round_number + DURATION_ROUNDS[duration], anchor, 'start'
+    raise ValueError(f"Unknown duration: {duration}")
+
+
+def start_effect(effect: Effect) -> list[Effect]:
+    """Make an effect active and add its condition.
+
+    A concentration effect ends the source's concentration on anything else
+    (targets of the same spell share it).
+
+    Returns:
+        The concentration effects that ended
+    """
+    ended = []
+    if effect['concentration']:
+        ended = end_concentration(effect['source_id'], keep=effect['name'])
+    scheduler = get_effect_scheduler()
+    get_effects_state()['active'][effect['id']] = effect
+    scheduler.push(effect)
+    if 'condition' in effect:
+        _set_condition(effect['target_id'], effect['condition'], True)
+    return ended
+
+
+def end_effect(effect_id: str) -> Effect | None:
+    """End an effect early (removing its condition); returns it if it was active."""
+    effect = get_effects_state()['active'].pop(effect_id, None)
+    if effect is not None:
+        _release_condition(effect)
+    return effect
+
+
+def end_concentration(combatant_key: str, keep: str | None = None) -> list[Effect]:
+    """End the effects a combatant concentrates on (except the spell named `keep`)."""
+    ended = [effect for effect in concentration_effects(combatant_key) if effect['name'] != keep]
+    for effect in ended:
+        end_effect(effect['id'])
+    return ended
+
+
+def forget_combatant(combatant_key: str) -> list[Effect]:
+    """End the effects on, or concentrated on by, a combatant leaving the fight."""
+    ended = [
+        effect for effect in get_effects_state()['active'].values()
+        if effect['target_id'] == combatant_key or (effect['concentration'] and effect.get('source_id') == combatant_key)
+    ]
+    for effect in ended:
+        end_effect(effect['id'])
+    return ended
+
+
+def _release_condition(effect: Effect) -> bool:
+    """Remove an ended effect's condition unless another active effect still grants it."""
+    if 'condition' not in effect:
+        return False
+    for other in get_effects_state()['active'].values():
+        if other['target_id'] == effect['target_id'] and other.get('condition') == effect['condition']:
+            return False
+    return _set_condition(effect['target_id'], effect['condition'], False)
+
+
+def _set_condition(combatant_key: str, condition: str, present: bool) -> bool:
+    """Add/remove a condition on a combatant; returns whether it changed."""
+    index = get_effect_scheduler().positions.get(combatant_key)
+    if index is None:
+        return False
+    conditions = st.session_state.combatants[index]['conditions']
+    if present and condition not in conditions:
+        conditions.append(condition)
+        return True
+    if not present and condition in conditions:
+        conditions.remove(condition)
+        return True
+    return False
+
+
+# =============================================================================
+# Turn changes
+# =============================================================================
+def pop_due_effects() -> list[Effect]:
+    """Effects due to expire by the start of the current turn (call after advancing)."""
+    return get_effect_scheduler().pop_due(current_turn_point())
+
+
+def expire_effects(effects: list[Effect]) -> list[Effect]:
+    """End effects whose time is up, remembering them for Previous Turn."""
+    state = get_effects_state()
+    for effect in effects:
+        del state['active'][effect['id']]
+        state['expired'].append([effect, _release_condition(effect)])
+    del state['expired'][:-EXPIRED_EFFECTS_KEPT]
+    return effects
+
+
+def expired_after_current_turn() -> list[list]:
+    """Expired entries whose expiry is after the start of the current turn (call after going back)."""
+    scheduler = get_effect_scheduler()
+    point = current_turn_point()
+    expired = get_effects_state()['expired']
+    count = 0
+    while count < len(expired) and scheduler.expiry_point(expired[-1 - count][0]) > point:
+        count += 1
+    return expired[len(expired) - count:]
+
+
+def restore_expired_effects(entries: list[list]) -> list[Effect]:
+    """Make expired effects active again (and re-add the conditions they removed).
+
+    Args:
+        entries: The newest expired entries, from expired_after_current_turn()
+    """
+    scheduler = get_effect_scheduler()
+    state = get_effects_state()
+    del state['expired'][len(state['expired']) - len(entries):]
+    restored = []
+    for effect, removed in reversed(entries):
+        state['active'][effect['id']] = effect
+        scheduler.push(effect)
+        if removed:
+            _set_condition(effect['target_id'], effect['condition'], True)
+        restored.append(effect)
+    return restored
+
+
+# =============================================================================
+# Display
+# =============================================================================
+def effect_indices(effects: list[Effect]) -> list[int]:
+    """Positions of the combatants the effects are on"""
+    positions = get_effect_scheduler().positions
+    return sorted({positions[effect['target_id']] for effect in effects if effect['target_id'] in positions})
+
+
+def _name_of(combatant_key: str) -> str:
+    index = get_effect_scheduler().positions.get(combatant_key)
+    return "?" if index is None else st.session_state.combatants[index]['name']
+
+
+def effect_label(effect: Effect) -> str:
+    """e.g. 'Bless on Aria'"""
+    return f"{effect['name']} on {_name_of(effect['target_id'])}"
+
+
+def describe_expiry(effect: Effect) -> str:
+    """When an effect ends, e.g. 'until the end of Goblin's turn (round 3)'"""
+    if not effect['expires_round']:
+        return "while concentrating" if effect['concentration'] else "until removed"
+    return f"until the {effect['trigger']} of {_name_of(effect['anchor_id'])}'s turn (round {effect['expires_round']})"
+
+
+def concentration_dc(damage: int) -> int:
+    """DC of the Constitution save to keep concentrating after taking damage"""
+    return min(CONCENTRATION_DC_MAX, max(CONCENTRATION_DC_MIN, damage // 2))
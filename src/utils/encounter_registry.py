@@ -0,0 +1,361 @@
+# src/utils/encounter_registry.py
+"""Process-wide registry of shared encounters.
+
+st.session_state is per browser tab, so on its own every refresh or extra
+device starts from an empty tracker. An encounter published to the registry
+is shared by every session attached to it: one writer (the DM, identified by
+a secret token) and any number of read-only viewers.
+
+Each publish replaces the encounter's snapshot under the encounter's lock and
+bumps its version; snapshots are never mutated afterwards. Viewers keep
+references to the published snapshot rather than copies, so a table with
+eight viewers holds one copy of the encounter, not nine. Combatants with an
+unchanged id and revision are reused from the previous snapshot, so a publish
+after one command copies one combatant.
+"""
+
+import secrets
+import threading
+import time
+import uuid
+from copy import deepcopy
+from dataclasses import dataclass, field
+import streamlit as st
+from src.config import ENCOUNTER_IDLE_HOURS, ENCOUNTER_VIEWER_TIMEOUT, MAX_SHARED_ENCOUNTERS
+from src.utils.combat_stats import reset_combat_stats
+
+# Session keys that make up the shared encounter
+SHARED_KEYS = ('combatants', 'current_turn_index', 'round_number', 'combat_active')
+
+# Every attached session has ?encounter=<id>. The writer's URL also carries
+# its token, so a refresh re-attaches it as the writer.
+ENCOUNTER_PARAM = 'encounter'
+WRITER_PARAM = 'writer'
+
+# ?view=player&player=<token> selects the lightweight player page (see
+# layouts/player_view). The player token only opens that page, never the
+# tracker, so players can't see exact monster HP, AC or notes.
+VIEW_PARAM = 'view'
+PLAYER_VIEW = 'player'
+PLAYER_PARAM = 'player'
+
+
+class EncounterAccessError(PermissionError):
+    """A session tried to change an encounter it isn't the writer of."""
+
+
+class VersionConflict(RuntimeError):
+    """The encounter was published since the version a change was based on."""
+
+
+@dataclass(frozen=True)
+class EncounterSnapshot:
+    """One published version of an encounter (never mutated once published)."""
+    version: int
+    state: dict  # SHARED_KEYS -> value
+    published_at: float
+
+
+@dataclass
+class Encounter:
+    """A shared encounter: its current snapshot and the sessions watching it."""
+    encounter_id: str
+    name: str
+    writer_token: str
+    snapshot: EncounterSnapshot
+    player_token: str = field(default_factory=lambda: secrets.token_urlsafe(12))  # For the player page only
+    viewers: dict[str, float] = field(default_factory=dict)  # Viewer id -> last seen (time.time())
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def version(self) -> int:
+        return self.snapshot.version
+
+    def active_viewers(self, timeout: float = ENCOUNTER_VIEWER_TIMEOUT) -> int:
+        """Number of viewers seen within the last `timeout` seconds"""
+        cutoff = time.time() - timeout
+        return sum(1 for seen in list(self.viewers.values()) if seen >= cutoff)
+
+
+def freeze_state(state: dict, previous: EncounterSnapshot | None = None) -> dict:
+    """Copy the shared keys of a session for publishing.
+
+    Combatants whose (id, revision) matches one in `previous` reuse that copy;
+    like the view-model cache, this relies on every command bumping the
+    revision of the combatants it changes.
+    """
+    reusable = {}
+    if previous is not None:
+        reusable = {
+            (c['id'], c['revision']): c
+            for c in previous.state['combatants'] if 'id' in c and 'revision' in c
+        }
+    frozen = {key: deepcopy(state.get(key)) for key in SHARED_KEYS if key != 'combatants'}
+    frozen['combatants'] = [
+        reusable.get((c.get('id'), c.get('revision'))) or deepcopy(c)
+        for c in state.get('combatants', [])
+    ]
+    return frozen
+
+
+class EncounterRegistry:
+    """Thread-safe store of shared encounters, keyed by encounter id."""
+
+    def __init__(self):
+        self._lock = threading.Lock()  # Guards the dict; each encounter has its own lock
+        self._encounters: dict[str, Encounter] = {}
+
+    def __len__(self) -> int:
+        return len(self._encounters)
+
+    def get(self, encounter_id: str) -> Encounter | None:
+        return self._encounters.get(encounter_id)
+
+    def get_by_player_token(self, player_token: str) -> Encounter | None:
+        """The encounter a player link points to."""
+        for encounter in self.list_encounters():
+            if secrets.compare_digest(encounter.player_token, player_token or ""):
+                return encounter
+        return None
+
+    def list_encounters(self) -> list[Encounter]:
+        with self._lock:
+            return list(self._encounters.values())
+
+    def create(self, state: dict, name: str = "") -> tuple[str, str]:
+        """Publish a new encounter from a session's state.
+
+        Returns:
+            (encounter id, writer token)
+        """
+        encounter_id = uuid.uuid4().hex[:8]
+        writer_token = secrets.token_urlsafe(16)
+        snapshot = EncounterSnapshot(version=1, state=freeze_state(state), published_at=time.time())
+        with self._lock:
+            self._prune_locked()
+            self._encounters[encounter_id] = Encounter(encounter_id, name, writer_token, snapshot)
+        return encounter_id, writer_token
+
+    def publish(self, encounter_id: str, writer_token: str, state: dict, base_version: int) -> int:
+        """Replace the encounter's state with a new version.
+
+        Args:
+            base_version: The version the writer's state was based on
+
+        Returns:
+            The new version
+
+        Raises:
+            EncounterAccessError: Unknown encounter or wrong writer token
+            VersionConflict: Someone else published since `base_version`
+        """
+        encounter = self._checked(encounter_id, writer_token)
+        # Copy outside the lock; only the swap needs serializing
+        previous = encounter.snapshot
+        frozen = freeze_state(state, previous)
+        with encounter.lock:
+            if encounter.version != base_version:
+                raise VersionConflict(f"encounter is at version {encounter.version}, not {base_version}")
+            encounter.snapshot = EncounterSnapshot(encounter.version + 1, frozen, time.time())
+            return encounter.version
+
+    def touch_viewer(self, encounter_id: str, viewer_id: str) -> None:
+        """Record that a viewer is still watching."""
+        encounter = self.get(encounter_id)
+        if encounter is not None:
+            encounter.viewers[viewer_id] = time.time()
+
+    def detach_viewer(self, encounter_id: str, viewer_id: str) -> None:
+        encounter = self.get(encounter_id)
+        if encounter is not None:
+            encounter.viewers.pop(viewer_id, None)
+
+    def close(self, encounter_id: str, writer_token: str) -> None:
+        """Stop sharing an encounter (writer only)."""
+        self._checked(encounter_id, writer_token)
+        with self._lock:
+            self._encounters.pop(encounter_id, None)
+
+    def _checked(self, encounter_id: str, writer_token: str) -> Encounter:
+        encounter = self.get(encounter_id)
+        if encounter is None or not secrets.compare_digest(encounter.writer_token, writer_token or ""):
+            raise EncounterAccessError(f"not the writer of encounter {encounter_id}")
+        return encounter
+
+    def _prune_locked(self) -> None:
+        # Drop idle encounters, then the longest-idle ones beyond the cap
+        cutoff = time.time() - ENCOUNTER_IDLE_HOURS * 3600
+        for encounter_id in [e.encounter_id for e in self._encounters.values() if e.snapshot.published_at < cutoff]:
+            del self._encounters[encounter_id]
+        by_age = sorted(self._encounters.values(), key=lambda e: e.snapshot.published_at)
+        for encounter in by_age[:max(0, len(by_age) - MAX_SHARED_ENCOUNTERS + 1)]:
+            del self._encounters[encounter.encounter_id]
+
+
+@st.cache_resource
+def get_encounter_registry() -> EncounterRegistry:
+    """The registry shared by every session of this server process."""
+    return EncounterRegistry()
+
+
+# =============================================================================
+# Session attachment
+# =============================================================================
+def _session_signature() -> tuple:
+    """Changes whenever a command or load changes the shared keys (cheap to compute)"""
+    return (
+        st.session_state.get('revision', 0),
+        len(st.session_state.get('combatants', [])),
+        st.session_state.get('current_turn_index', 0),
+        st.session_state.get('round_number', 1),
+        st.session_state.get('combat_active', False),
+    )
+
+
+def get_encounter_role() -> str | None:
+    """'writer', 'viewer', or None when the session isn't attached to a shared encounter."""
+    return st.session_state.get('encounter_role')
+
+
+def is_read_only() -> bool:
+    """Whether this session views someone else's encounter (and must not change it)."""
+    return get_encounter_role() == 'viewer'
+
+
+def get_session_encounter() -> Encounter | None:
+    """The shared encounter this session is attached to, if it still exists."""
+    encounter_id = st.session_state.get('encounter_id')
+    return get_encounter_registry().get(encounter_id) if encounter_id else None
+
+
+def _apply_snapshot(snapshot: EncounterSnapshot, copy: bool) -> None:
+    """Load a snapshot into the session; writers get their own copy, viewers share it."""
+    for key, value in snapshot.state.items():
+        st.session_state[key] = deepcopy(value) if copy else value
+    st.session_state.encounter_version = snapshot.version
+    st.session_state.encounter_signature = _session_signature()
+    reset_combat_stats(st.session_state.combatants)
+
+
+def host_encounter(name: str = "") -> str:
+    """Share this session's encounter; this session becomes its writer.
+
+    Returns:
+        The encounter id (what viewers join with)
+    """
+    state = {key: st.session_state.get(key) for key in SHARED_KEYS}
+    encounter_id, token = get_encounter_registry().create(state, name)
+    st.session_state.encounter_id = encounter_id
+    st.session_state.encounter_token = token
+    st.session_state.encounter_role = 'writer'
+    st.session_state.encounter_version = 1
+    st.session_state.encounter_signature = _session_signature()
+    st.query_params[ENCOUNTER_PARAM] = encounter_id
+    st.query_params[WRITER_PARAM] = token
+    return encounter_id
+
+
+def join_encounter(encounter_id: str, writer_token: str | None = None) -> tuple[bool, str]:
+    """Attach this session to a shared encounter (as writer if the token matches).
+
+    Returns:
+        Tuple of (success, message)
+    """
+    encounter = get_encounter_registry().get(encounter_id.strip())
+    if encounter is None:
+        return False, f"No shared encounter '{encounter_id}'"
+
+    is_writer = bool(writer_token) and secrets.compare_digest(encounter.writer_token, writer_token)
+    st.session_state.encounter_id = encounter.encounter_id
+    st.session_state.encounter_role = 'writer' if is_writer else 'viewer'
+    if is_writer:
+        st.session_state.encounter_token = writer_token
+    else:
+        st.session_state.pop('encounter_token', None)
+        st.session_state.encounter_viewer_id = st.session_state.get('encounter_viewer_id') or uuid.uuid4().hex
+    _apply_snapshot(encounter.snapshot, copy=is_writer)
+
+    st.query_params[ENCOUNTER_PARAM] = encounter.encounter_id
+    if is_writer:
+        st.query_params[WRITER_PARAM] = writer_token
+    elif WRITER_PARAM in st.query_params:
+        del st.query_params[WRITER_PARAM]
+    role = "writer" if is_writer else "viewer"
+    return True, f"Joined {encounter.name or encounter.encounter_id} as {role}"
+
+
+def leave_encounter() -> None:
+    """Detach from the shared encounter; a writer also stops sharing it."""
+    registry = get_encounter_registry()
+    encounter_id = st.session_state.get('encounter_id')
+    if encounter_id:
+        if get_encounter_role() == 'writer':
+            try:
+                registry.close(encounter_id, st.session_state.get('encounter_token'))
+            except EncounterAccessError:
+                pass  # Already gone
+        else:
+            registry.detach_viewer(encounter_id, st.session_state.get('encounter_viewer_id', ''))
+            # The viewer's state is shared with the registry; give it a private copy
+            for key in SHARED_KEYS:
+                if key in st.session_state:
+                    st.session_state[key] = deepcopy(st.session_state[key])
+
+    for key in ('encounter_id', 'encounter_token', 'encounter_role', 'encounter_version', 'encounter_signature'):
+        st.session_state.pop(key, None)
+    for param in (ENCOUNTER_PARAM, WRITER_PARAM):
+        if param in st.query_params:
+            del st.query_params[param]
+
+
+def publish_session_encounter(force: bool = False) -> None:
+    """Publish this session's state if it is the writer and something changed.
+
+    Args:
+        force: Publish even if the cheap change signature is unchanged
+            (undo restores old revisions, so it can't be detected that way)
+    """
+    if get_encounter_role() != 'writer':
+        return
+    signature = _session_signature()
+    if not force and signature == st.session_state.get('encounter_signature'):
+        return
+
+    registry = get_encounter_registry()
+    encounter_id = st.session_state.encounter_id
+    try:
+        st.session_state.encounter_version = registry.publish(
+            encounter_id,
+            st.session_state.get('encounter_token'),
+            {key: st.session_state.get(key) for key in SHARED_KEYS},
+            st.session_state.get('encounter_version', 0),
+        )
+        st.session_state.encounter_signature = signature
+    except VersionConflict:
+        # Another tab with the writer link published first; take its state
+        _apply_snapshot(registry.get(encounter_id).snapshot, copy=True)
+    except EncounterAccessError:
+        # The encounter was closed or pruned; carry on as a private encounter
+        leave_encounter()
+
+
+def sync_encounter() -> None:
+    """Per-rerun hook: attach from the URL, pull newer versions, publish changes."""
+    if 'encounter_id' not in st.session_state:
+        encounter_id = st.query_params.get(ENCOUNTER_PARAM)
+        if encounter_id and not join_encounter(encounter_id, st.query_params.get(WRITER_PARAM))[0]:
+            # Stale link (e.g. after a server restart); continue as a private encounter
+            leave_encounter()
+        return
+
+    encounter = get_session_encounter()
+    if encounter is None:
+        leave_encounter()
+        return
+
+    if get_encounter_role() == 'viewer':
+        get_encounter_registry().touch_viewer(encounter.encounter_id, st.session_state.encounter_viewer_id)
+        if encounter.version != st.session_state.get('encounter_version'):
+            _apply_snapshot(encounter.snapshot, copy=False)
+    else:
+        publish_session_encounter()
@@ -0,0 +1,46 @@
+# src/utils/headless.py
+"""Run the combat logic without a Streamlit server (benchmarks, scripts).
+
+The utils only touch Streamlit through `st.session_state`, so swapping it
+for a plain dict-like object is enough to drive commands, persistence and
+search scoring from ordinary Python.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator
+import streamlit as st
+
+
+class HeadlessSessionState(dict):
+    """dict with attribute access, standing in for st.session_state."""
+
+    def __getattr__(self, key: str):
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(f"{key} not found in session_state.") from None
+
+    def __setattr__(self, key: str, value) -> None:
+        self[key] = value
+
+    def __delattr__(self, key: str) -> None:
+        try:
+            del self[key]
+        except KeyError:
+            raise AttributeError(f"{key} not found in session_state.") from None
+
+
+@contextmanager
+def headless_session(initial: dict | None = None) -> Iterator[HeadlessSessionState]:
+    """Replace st.session_state with a fresh HeadlessSessionState for the duration.
+
+    Args:
+        initial: Optional starting contents of the session state
+    """
+    state = HeadlessSessionState(initial or {})
+    previous = st.session_state
+    st.session_state = state
+    try:
+        yield state
+    finally:
+        st.session_state = previous
@@ -1,50 +1,371 @@
 # src/utils/import_export.py
 """JSON export/import functionality for combat state, rosters, and libraries."""
 
+import codecs
+import io
 import json
+import re
+import tempfile
+from typing import IO, Iterable, Iterator
 import streamlit as st
 from datetime import datetime
-from src.config import EXPORT_VERSION, ROSTER_VERSION, LIBRARY_VERSION
+from src.config import (
+    EXPORT_VERSION, ROSTER_VERSION, LIBRARY_VERSION, EXPORT_SPOOL_MAX_BYTES, DEFAULT_MERGE_POLICY,
+)
+from src.utils.merge import merge_entries
+from src.utils.combat import ensure_combatant_ids
+from src.utils.command_stack import next_revision
+from src.utils.combat_log_store import get_combat_log, reset_combat_log
+from src.utils.combat_stats import reset_combat_stats
+from src.utils.effects import active_effects, reset_effects
+from src.utils.models import LogEntry
+from src.utils.schema import (
+    SchemaError, LEGACY_VERSION, ENTRY_VALIDATORS,
+    validate_combatant, upgrade_combat_state, upgrade_entries, document_version,
+)
 
+# Number of list entries serialized per yielded chunk when streaming
+STREAM_BATCH_SIZE = 256
 
-def export_combat_state() -> str:
-    """Export current combat state to JSON string."""
-    state = {
+# Session key: file uploader key -> file_id of the last upload imported from it
+IMPORTED_UPLOADS_KEY = 'imported_uploads'
+
+# Characters read from the source per refill when stream parsing
+STREAM_READ_SIZE = 64 * 1024
+
+
+# =============================================================================
+# Streaming serialization
+# =============================================================================
+def _encode_value(value, level: int) -> str:
+    """Encode a value as indented JSON nested `level` deep (matches indent=2)."""
+    text = json.dumps(value, indent=2)
+    if level and '\n' in text:
+        text = text.replace('\n', '\n' + '  ' * level)
+    return text
+
+
+def _iter_json_list(items: Iterable, level: int) -> Iterator[str]:
+    """Yield an indented JSON array one batch of entries at a time."""
+    pad = '\n' + '  ' * (level + 1)
+    first = True
+    batch = []
+    for item in items:
+        batch.append(('[' if first else ',') + pad + _encode_value(item, level + 1))
+        first = False
+        if len(batch) >= STREAM_BATCH_SIZE:
+            yield ''.join(batch)
+            batch = []
+    if first:
+        yield '[]'
+        return
+    batch.append('\n' + '  ' * level + ']')
+    yield ''.join(batch)
+
+
+def _iter_json_dict(items: Iterable[tuple[str, object]], level: int) -> Iterator[str]:
+    """Yield an indented JSON object one batch of entries at a time."""
+    pad = '\n' + '  ' * (level + 1)
+    first = True
+    batch = []
+    for key, value in items:
+        batch.append(('{' if first else ',') + pad + json.dumps(key) + ': ' + _encode_value(value, level + 1))
+        first = False
+        if len(batch) >= STREAM_BATCH_SIZE:
+            yield ''.join(batch)
+            batch = []
+    if first:
+        yield '{}'
+        return
+    batch.append('\n' + '  ' * level + '}')
+    yield ''.join(batch)
+
+
+def _iter_json_document(fields: dict) -> Iterator[str]:
+    """Yield a top-level JSON object, streaming list/dict values entry by entry."""
+    yield '{'
+    for position, (key, value) in enumerate(fields.items()):
+        yield ('' if position == 0 else ',') + '\n  ' + json.dumps(key) + ': '
+        if isinstance(value, (list, Iterator)):
+            yield from _iter_json_list(value, 1)
+        elif isinstance(value, dict):
+            yield from _iter_json_dict(value.items(), 1)
+        else:
+            yield _encode_value(value, 1)
+    yield '\n}'
+
+
+def write_json_chunks(chunks: Iterable[str], sink: IO[str]) -> None:
+    """Write streamed JSON chunks to a text file-like sink."""
+    for chunk in chunks:
+        sink.write(chunk)
+
+
+def spool_json_chunks(chunks: Iterable[str]) -> IO[bytes]:
+    """Encode streamed JSON chunks into a rewound temporary file.
+    
+    Small exports stay in memory; large ones roll over to disk, so building a
+    download never holds the whole document as a Python string.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_BYTES, mode='w+b')
+    for chunk in chunks:
+        spool.write(chunk.encode('utf-8'))
+    spool.seek(0)
+    return spool
+
+
+def _combat_state_fields(combat_log: Iterable[LogEntry]) -> dict:
+    return {
         'combatants': st.session_state.combatants,
         'current_turn_index': st.session_state.current_turn_index,
         'round_number': st.session_state.round_number,
         'combat_active': st.session_state.combat_active,
-        'combat_log': st.session_state.combat_log,
+        'combat_log': combat_log,
+        'effects': active_effects(),
         'export_timestamp': datetime.now().isoformat(),
         'version': EXPORT_VERSION,
     }
-    return json.dumps(state, indent=2)
 
 
-def import_combat_state(json_str: str) -> tuple[bool, str]:
-    """Import combat state from JSON string.
+def get_combat_state() -> dict:
+    """Collect the current combat state as an export-format dict (not copied).
+    
+    The log is read into a list, including events spilled to disk; exports
+    should use `iter_combat_state_json`, which streams it instead.
+    """
+    return _combat_state_fields(get_combat_log().to_list())
+
+
+def iter_combat_state_json(state: dict | None = None) -> Iterator[str]:
+    """Stream the combat state as JSON, one batch of combatants/log entries at a time."""
+    if state is None:
+        state = _combat_state_fields(iter(get_combat_log()))
+    return _iter_json_document(state)
+
+
+def export_combat_state() -> str:
+    """Export current combat state to JSON string."""
+    return ''.join(iter_combat_state_json())
+
+
+def combat_state_download():
+    """Return a deferred download callable for the current combat.
+    
+    The state is captured now (by reference) and the log as a snapshot, since
+    Streamlit calls the download function outside the script thread while
+    the log may still be growing. Everything is read and serialized only
+    when the user actually clicks download.
+    """
+    events = get_combat_log().snapshot()
+    state = _combat_state_fields(())
+    return lambda: spool_json_chunks(iter_combat_state_json({**state, 'combat_log': events()}))
+
+
+# =============================================================================
+# Streaming parsing
+# =============================================================================
+class JsonStreamReader:
+    """Incremental JSON reader over a text stream.
+    
+    Reads the source in chunks and decodes one value at a time, so array and
+    object entries can be validated and loaded as they arrive instead of
+    parsing the whole document up front.
+    """
+    
+    _WHITESPACE = re.compile(r'[ \t\n\r]*')
+    
+    def __init__(self, source: IO[str] | str):
+        self._source = io.StringIO(source) if isinstance(source, str) else source
+        self._scan_once = json.JSONDecoder().scan_once
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+    
+    def _fill(self, min_size: int = STREAM_READ_SIZE) -> bool:
+        """Read more text into the buffer. Returns False at end of input."""
+        if self._eof:
+            return False
+        chunk = self._source.read(max(min_size, STREAM_READ_SIZE))
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode('utf-8')
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+    
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buffer, self._pos)
+    
+    def peek(self) -> str | None:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            self._pos = self._WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return None
+    
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self._error(f"Expected '{char}'")
+        self._pos += 1
+    
+    def read_value(self):
+        """Decode and return the next complete JSON value."""
+        if self.peek() is None:
+            raise self._error("Unexpected end of input")
+        while True:
+            try:
+                value, end = self._scan_once(self._buffer, self._pos)
+            except (json.JSONDecodeError, StopIteration):
+                # Incomplete value: grow the buffer geometrically and retry
+                if not self._fill(len(self._buffer) - self._pos):
+                    raise self._error("Invalid or truncated JSON value") from None
+                continue
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and not self._eof and self._fill():
+                continue
+            self._pos = end
+            return value
+    
+    def iter_array(self) -> Iterator:
+        """Yield the entries of the next JSON array one at a time."""
+        self.expect('[')
+        if self.peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self.read_value()
+            if self.peek() == ',':
+                self._pos += 1
+            else:
+                self.expect(']')
+                return
+    
+    def iter_object(self) -> Iterator[str]:
+        """Yield the keys of the next JSON object.
+        
+        After each key the caller must consume its value with `read_value`,
+        `iter_array` or `iter_object` before advancing the iterator.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise self._error("Object keys must be strings")
+            self.expect(':')
+            yield key
+            if self.peek() == ',':
+                self._pos += 1
+            else:
+                self.expect('}')
+                return
+    
+    def iter_object_items(self) -> Iterator[tuple[str, object]]:
+        """Yield (key, value) pairs of the next JSON object one at a time."""
+        for key in self.iter_object():
+            yield key, self.read_value()
+
+
+def is_new_upload(uploaded_file, uploader_key: str) -> bool:
+    """Whether a file uploader's file hasn't been imported yet; marks it as imported.
+    
+    The uploader keeps returning its file on every rerun, including the one
+    right after an import, which would import it again (and replace the
+    merge report with an "all unchanged" one).
+    """
+    imported = st.session_state.setdefault(IMPORTED_UPLOADS_KEY, {})
+    if imported.get(uploader_key) == uploaded_file.file_id:
+        return False
+    imported[uploader_key] = uploaded_file.file_id
+    return True
+
+
+def open_text_stream(binary_file: IO[bytes]) -> IO[str]:
+    """Wrap an uploaded (binary) file for streaming import without reading it all."""
+    binary_file.seek(0)
+    return codecs.getreader('utf-8')(binary_file)
+
+
+def read_combat_state_stream(source: IO[str] | str) -> dict:
+    """Parse a combat export incrementally, validating combatants as they stream.
+    
+    Current-version files are validated in this single pass; older files are
+    migrated and then validated once fully read.
+    
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+        SchemaError: If a value is malformed (with its location)
+    """
+    reader = JsonStreamReader(source)
+    state = {}
+    pending_error = None
+    for key in reader.iter_object():
+        if key == 'combatants':
+            combatants = []
+            for position, combatant in enumerate(reader.iter_array()):
+                if pending_error is None:
+                    try:
+                        validate_combatant(combatant)
+                    except SchemaError as e:
+                        # Only fatal if no migration runs; the version comes last
+                        pending_error = e.prefixed(position).prefixed('combatants')
+                combatants.append(combatant)
+            state[key] = combatants
+        elif key == 'combat_log':
+            state[key] = list(reader.iter_array())
+        else:
+            state[key] = reader.read_value()
+    return upgrade_combat_state(state, combatants_checked=True, pending_error=pending_error)
+
+
+def _apply_combat_state(state: dict) -> tuple[bool, str]:
+    """Assign a validated combat state to the session."""
+    ensure_combatant_ids(state['combatants'])
+    # Revisions from the file may not match this session's cached view models
+    revision = next_revision()
+    for combatant in state['combatants']:
+        combatant['revision'] = revision
+    st.session_state.combatants = state['combatants']
+    st.session_state.current_turn_index = state['current_turn_index']
+    st.session_state.round_number = state['round_number']
+    st.session_state.combat_active = state['combat_active']
+    reset_combat_log(state.get('combat_log', []))
+    reset_combat_stats(state['combatants'])
+    reset_effects(state.get('effects', []))
+    
+    return True, "Combat state loaded successfully!"
+
+
+def load_combat_state(state: dict) -> tuple[bool, str]:
+    """Validate (upgrading older versions) and load a parsed combat state dict.
     
     Returns:
         Tuple of (success, message)
     """
     try:
-        state = json.loads(json_str)
-        
-        # Validate required fields
-        required_fields = ['combatants', 'current_turn_index', 'round_number', 'combat_active']
-        if not all(field in state for field in required_fields):
-            return False, "Invalid combat state file: missing required fields"
-        
-        # Load state
-        st.session_state.combatants = state['combatants']
-        st.session_state.current_turn_index = state['current_turn_index']
-        st.session_state.round_number = state['round_number']
-        st.session_state.combat_active = state['combat_active']
-        st.session_state.combat_log = state.get('combat_log', [])
-        
-        return True, "Combat state loaded successfully!"
+        return _apply_combat_state(upgrade_combat_state(state))
+    except SchemaError as e:
+        return False, f"Invalid combat state file: {e}"
+
+
+def import_combat_state(json_str: str | IO[str]) -> tuple[bool, str]:
+    """Import combat state from a JSON string or text stream.
+    
+    Returns:
+        Tuple of (success, message)
+    """
+    try:
+        return _apply_combat_state(read_combat_state_stream(json_str))
     except json.JSONDecodeError:
         return False, "Invalid JSON format"
+    except SchemaError as e:
+        return False, f"Invalid combat state file: {e}"
     except Exception as e:
         return False, f"Error loading combat state: {str(e)}"
 
@@ -55,98 +376,197 @@ def get_export_filename() -> str:
     return f"dnd_combat_{timestamp}.json"
 
 
-def export_monster_library() -> str:
-    """Export saved monsters to JSON string."""
+def get_monster_library_state() -> dict:
     if 'saved_monsters' not in st.session_state:
         st.session_state.saved_monsters = {}
     
-    library = {
+    return {
         'monsters': st.session_state.saved_monsters,
         'export_timestamp': datetime.now().isoformat(),
         'version': LIBRARY_VERSION,
     }
-    return json.dumps(library, indent=2)
 
 
-def import_monster_library(json_str: str) -> tuple[bool, str]:
-    """Import monster library from JSON string.
+def iter_monster_library_json(library: dict | None = None) -> Iterator[str]:
+    """Stream the monster library as JSON, a batch of monsters at a time."""
+    return _iter_json_document(library if library is not None else get_monster_library_state())
+
+
+def export_monster_library() -> str:
+    """Export saved monsters to JSON string."""
+    return ''.join(iter_monster_library_json())
+
+
+def monster_library_download():
+    """Return a deferred download callable for the monster library."""
+    library = get_monster_library_state()
+    return lambda: spool_json_chunks(iter_monster_library_json(library))
+
+
+def read_entries_stream(source: IO[str] | str, kind: str) -> dict | None:
+    """Stream the entries of a roster/library document, validating them as they arrive.
+    
+    Returns the (upgraded) entries keyed by id, or None if the document has
+    no entries section.
+    """
+    entries_key, validate = ENTRY_VALIDATORS[kind]
+    reader = JsonStreamReader(source)
+    entries = None
+    version = LEGACY_VERSION
+    pending_error = None
+    for key in reader.iter_object():
+        if key == 'version':
+            version = reader.read_value()
+            continue
+        if key != entries_key:
+            reader.read_value()
+            continue
+        entries = {}
+        for entry_id, entry in reader.iter_object_items():
+            if pending_error is None:
+                try:
+                    validate(entry)
+                except SchemaError as e:
+                    pending_error = e.prefixed(entry_id).prefixed(entries_key)
+            entries[entry_id] = entry
+    if entries is None:
+        return None
+    return upgrade_entries(kind, entries, version, pending_error)
+
+
+def _validated_entries(document: dict, kind: str) -> dict | None:
+    """Validate and upgrade the entries of an already-parsed roster/library document."""
+    entries_key, validate = ENTRY_VALIDATORS[kind]
+    if not isinstance(document, dict) or not isinstance(document.get(entries_key), dict):
+        return None
+    pending_error = None
+    for entry_id, entry in document[entries_key].items():
+        try:
+            validate(entry)
+        except SchemaError as e:
+            pending_error = e.prefixed(entry_id).prefixed(entries_key)
+            break
+    return upgrade_entries(kind, document[entries_key], document_version(document), pending_error)
+
+
+def _merge_into(state_key: str, entries: dict, policy: str, noun: str) -> tuple[bool, str]:
+    """Merge entries into a session collection and remember the report for the UI."""
+    if state_key not in st.session_state:
+        st.session_state[state_key] = {}
+    report = merge_entries(st.session_state[state_key], entries, policy)
+    st.session_state[f'merge_report_{state_key}'] = report
+    return True, report.summary(noun)
+
+
+def import_monster_library(json_str: str | IO[str], policy: str = DEFAULT_MERGE_POLICY) -> tuple[bool, str]:
+    """Import monster library from a JSON string or text stream.
+    
+    Args:
+        json_str: Library JSON (string or text stream)
+        policy: How to resolve monsters that already exist (see MERGE_POLICIES)
     
     Returns:
         Tuple of (success, message)
     """
     try:
-        library = json.loads(json_str)
-        
-        if 'monsters' not in library:
+        entries = read_entries_stream(json_str, 'library')
+        if entries is None:
             return False, "Invalid monster library file"
         
-        # Initialize if doesn't exist
-        if 'saved_monsters' not in st.session_state:
-            st.session_state.saved_monsters = {}
-        
-        # Merge imported monsters (don't overwrite existing)
-        imported_count = 0
-        for monster_id, monster_data in library['monsters'].items():
-            if monster_id not in st.session_state.saved_monsters:
-                st.session_state.saved_monsters[monster_id] = monster_data
-                imported_count += 1
-        
-        return True, f"Imported {imported_count} monster(s)"
+        return _merge_into('saved_monsters', entries, policy, "monster")
     except json.JSONDecodeError:
         return False, "Invalid JSON format"
     except Exception as e:
         return False, f"Error importing library: {str(e)}"
 
 
+def merge_monster_library(library: dict, policy: str = DEFAULT_MERGE_POLICY) -> tuple[bool, str]:
+    """Merge an already-parsed monster library (e.g. loaded from disk).
+    
+    Returns:
+        Tuple of (success, message)
+    """
+    try:
+        entries = _validated_entries(library, 'library')
+        if entries is None:
+            return False, "Invalid monster library file"
+        
+        return _merge_into('saved_monsters', entries, policy, "monster")
+    except Exception as e:
+        return False, f"Error importing library: {str(e)}"
+
+
 def get_monster_library_filename() -> str:
     """Generate a filename for monster library export."""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     return f"dnd_monsters_{timestamp}.json"
 
 
-def export_player_roster_data() -> str:
-    """Export player roster to JSON string."""
+def get_player_roster_state() -> dict:
     if 'player_roster' not in st.session_state:
         st.session_state.player_roster = {}
     
-    roster = {
+    return {
         'players': st.session_state.player_roster,
         'export_timestamp': datetime.now().isoformat(),
         'version': ROSTER_VERSION,
     }
-    return json.dumps(roster, indent=2)
 
 
-def import_player_roster_data(json_str: str) -> tuple[bool, str]:
-    """Import player roster from JSON string.
+def iter_player_roster_json(roster: dict | None = None) -> Iterator[str]:
+    """Stream the player roster as JSON, a batch of players at a time."""
+    return _iter_json_document(roster if roster is not None else get_player_roster_state())
+
+
+def export_player_roster_data() -> str:
+    """Export player roster to JSON string."""
+    return ''.join(iter_player_roster_json())
+
+
+def player_roster_download():
+    """Return a deferred download callable for the player roster."""
+    roster = get_player_roster_state()
+    return lambda: spool_json_chunks(iter_player_roster_json(roster))
+
+
+def import_player_roster_data(json_str: str | IO[str], policy: str = DEFAULT_MERGE_POLICY) -> tuple[bool, str]:
+    """Import player roster from a JSON string or text stream.
+    
+    Args:
+        json_str: Roster JSON (string or text stream)
+        policy: How to resolve players that already exist (see MERGE_POLICIES)
     
     Returns:
         Tuple of (success, message)
     """
     try:
-        roster = json.loads(json_str)
-        
-        if 'players' not in roster:
+        entries = read_entries_stream(json_str, 'roster')
+        if entries is None:
             return False, "Invalid player roster file"
         
-        # Initialize if doesn't exist
-        if 'player_roster' not in st.session_state:
-            st.session_state.player_roster = {}
-        
-        # Merge imported players (don't overwrite existing)
-        imported_count = 0
-        for player_id, player_data in roster['players'].items():
-            if player_id not in st.session_state.player_roster:
-                st.session_state.player_roster[player_id] = player_data
-                imported_count += 1
-        
-        return True, f"Imported {imported_count} player(s)"
+        return _merge_into('player_roster', entries, policy, "player")
     except json.JSONDecodeError:
         return False, "Invalid JSON format"
     except Exception as e:
         return False, f"Error importing roster: {str(e)}"
 
 
+def merge_player_roster(roster: dict, policy: str = DEFAULT_MERGE_POLICY) -> tuple[bool, str]:
+    """Merge an already-parsed player roster (e.g. loaded from disk).
+    
+    Returns:
+        Tuple of (success, message)
+    """
+    try:
+        entries = _validated_entries(roster, 'roster')
+        if entries is None:
+            return False, "Invalid player roster file"
+        
+        return _merge_into('player_roster', entries, policy, "player")
+    except Exception as e:
+        return False, f"Error importing roster: {str(e)}"
+
+
 def get_player_roster_filename() -> str:
     """Generate a filename for player roster export."""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -0,0 +1,201 @@
+# src/utils/memory.py
+"""Memory accounting for the session state, undo stack and caches.
+
+`measure_session_memory` reports the deep size of the big session values.
+That includes every before/after snapshot held by the undo stack.
+`enforce_memory_budgets` trims whatever exceeds MEMORY_BUDGETS, and
+`run_memory_maintenance` (called once per rerun) does so every
+MEMORY_CHECK_INTERVAL reruns. With tracing on, `record_allocation_diff`
+keeps the tracemalloc allocation growth since the previous rerun.
+"""
+
+import sys
+import tracemalloc
+import types
+from collections import deque
+from typing import Callable
+import streamlit as st
+from src.config import MEMORY_BUDGETS, MEMORY_CHECK_INTERVAL, MEMORY_TOP_ALLOCATIONS
+
+TRACE_KEY = 'memory_trace_enabled'
+
+# Session values that are measured, in display order
+MEASURED_KEYS = (
+    'combatants',
+    'command_stack',
+    'combat_log',
+    'monster_search_cache',
+    'view_model_cache',
+    'saved_monsters',
+    'player_roster',
+)
+
+_NOT_FOLLOWED = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def deep_sizeof(obj, _seen: set | None = None) -> int:
+    """Approximate total size in bytes of an object and everything it references.
+
+    Shared objects are counted once. Containers, instance __dict__s and
+    __slots__ are followed; classes, modules and functions are not.
+    """
+    seen = set() if _seen is None else _seen
+    stack = [obj]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _NOT_FOLLOWED):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset, deque)):
+            stack.extend(current)
+        elif isinstance(current, (str, bytes, int, float, bool)) or current is None:
+            continue
+        else:
+            if hasattr(current, '__dict__'):
+                stack.append(vars(current))
+            for slot in getattr(type(current), '__slots__', ()):
+                if hasattr(current, slot):
+                    stack.append(getattr(current, slot))
+    return total
+
+
+def measure_session_memory() -> dict[str, int]:
+    """Deep size in bytes of each measured session value (missing ones are 0).
+
+    The 'command_stack' entry includes every command's before/after
+    snapshot; 'command_snapshots' breaks out just those snapshots.
+    """
+    sizes = {key: deep_sizeof(st.session_state.get(key)) if key in st.session_state else 0 for key in MEASURED_KEYS}
+    seen: set = set()
+    sizes['command_snapshots'] = sum(
+        deep_sizeof(getattr(command, 'before_state', None), seen) + deep_sizeof(getattr(command, 'after_state', None), seen)
+        for command in st.session_state.get('command_stack', [])
+    )
+    return sizes
+
+
+# =============================================================================
+# Budgets
+# =============================================================================
+def _trim_command_stack(budget: int) -> str | None:
+    stack = st.session_state.get('command_stack', [])
+    removed = 0
+    # Drop the oldest undo steps, but always keep the most recent one
+    while len(stack) > 1 and deep_sizeof(stack) > budget:
+        drop = max(1, len(stack) // 4)
+        del stack[:drop]
+        removed += drop
+        st.session_state.command_stack_position = max(-1, st.session_state.get('command_stack_position', -1) - drop)
+    return f"dropped {removed} oldest undo step(s)" if removed else None
+
+
+def _trim_combat_log(budget: int) -> str | None:
+    log = st.session_state.get('combat_log')
+    if not hasattr(log, 'spill_to'):
+        return None
+    moved = 0
+    keep = len(log.recent())
+    while keep > 1 and deep_sizeof(log) > budget:
+        keep //= 2
+        moved += log.spill_to(keep)
+    return f"spilled {moved} log event(s) to disk" if moved else None
+
+
+def _trim_mapping(key: str, budget: int) -> str | None:
+    cache = st.session_state.get(key)
+    if not cache:
+        return None
+    removed = 0
+    # Insertion order is oldest first (view_model_cache moves hits to the end)
+    while cache and deep_sizeof(cache) > budget:
+        for old in list(cache)[:max(1, len(cache) // 4)]:
+            del cache[old]
+            removed += 1
+    return f"dropped {removed} cached entries" if removed else None
+
+
+TRIMMERS: dict[str, Callable[[int], str | None]] = {
+    'command_stack': _trim_command_stack,
+    'combat_log': _trim_combat_log,
+    'monster_search_cache': lambda budget: _trim_mapping('monster_search_cache', budget),
+    'view_model_cache': lambda budget: _trim_mapping('view_model_cache', budget),
+}
+
+
+def enforce_memory_budgets(budgets: dict[str, int] | None = None) -> list[str]:
+    """Trim every budgeted session value that is over its budget.
+
+    Args:
+        budgets: Bytes per key (default: MEMORY_BUDGETS)
+
+    Returns:
+        One message per trimmed value
+    """
+    actions = []
+    for key, budget in (budgets or MEMORY_BUDGETS).items():
+        trim = TRIMMERS.get(key)
+        if trim is None or key not in st.session_state:
+            continue
+        action = trim(budget)
+        if action:
+            actions.append(f"{key}: {action}")
+    return actions
+
+
+# =============================================================================
+# Allocation tracing
+# =============================================================================
+def record_allocation_diff() -> None:
+    """Store the top allocation growth since the previous traced rerun.
+
+    tracemalloc is process-wide, so concurrent sessions show up in each
+    other's diffs; use it on a quiet server.
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ))
+    previous = st.session_state.get('memory_snapshot')
+    st.session_state.memory_snapshot = snapshot
+    if previous is None:
+        return
+    st.session_state.memory_alloc_diff = [
+        {
+            'location': str(stat.traceback[0]),
+            'size_diff': stat.size_diff,
+            'count_diff': stat.count_diff,
+            'size': stat.size,
+        }
+        for stat in snapshot.compare_to(previous, 'lineno')[:MEMORY_TOP_ALLOCATIONS]
+    ]
+
+
+def stop_allocation_tracing() -> None:
+    """Stop tracemalloc and drop the stored snapshot."""
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    st.session_state.pop('memory_snapshot', None)
+    st.session_state.pop('memory_alloc_diff', None)
+
+
+def run_memory_maintenance() -> None:
+    """Per-rerun hook: periodic budget checks, and allocation diffs when tracing."""
+    count = st.session_state.get('memory_rerun_count', 0) + 1
+    st.session_state.memory_rerun_count = count
+    if count % MEMORY_CHECK_INTERVAL == 0:
+        actions = enforce_memory_budgets()
+        if actions:
+            st.session_state.memory_last_trim = actions
+
+    if st.session_state.get(TRACE_KEY, False):
+        record_allocation_diff()
+    elif 'memory_snapshot' in st.session_state:
+        stop_allocation_tracing()
@@ -0,0 +1,90 @@
+# src/utils/merge.py
+"""Merge imported roster players / library monsters into the local collection.
+
+Entries are matched by id with dict lookups and compared by content hash, so
+a merge is a single O(n) pass however many entries are imported. Conflicts
+(same id, different content) are resolved by a policy, and field-level diffs
+are reported for every entry that changed.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+
+MERGE_POLICIES: dict[str, str] = {
+    'keep_local': "Keep local",
+    'take_incoming': "Take incoming",
+    'newest': "Newest wins",
+}
+
+# Fields that change on every save without changing the entry itself
+VOLATILE_FIELDS = frozenset({'saved_at'})
+
+
+@dataclass
+class MergeReport:
+    """Summary of what a merge did, by entry name."""
+    added: list[str] = field(default_factory=list)
+    updated: list[tuple[str, list[str]]] = field(default_factory=list)
+    skipped: list[tuple[str, list[str]]] = field(default_factory=list)
+    unchanged: int = 0
+
+    def summary(self, noun: str) -> str:
+        return (
+            f"{len(self.added)} {noun}(s) added, {len(self.updated)} updated, "
+            f"{len(self.skipped)} skipped, {self.unchanged} unchanged"
+        )
+
+
+def content_hash(entry: dict) -> str:
+    """Stable hash of an entry's content, ignoring volatile fields."""
+    content = {k: v for k, v in entry.items() if k not in VOLATILE_FIELDS}
+    encoded = json.dumps(content, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(encoded.encode()).hexdigest()
+
+
+def field_diff(local: dict, incoming: dict) -> list[str]:
+    """Top-level fields whose values differ between two versions of an entry."""
+    keys = (local.keys() | incoming.keys()) - VOLATILE_FIELDS
+    return sorted(k for k in keys if local.get(k) != incoming.get(k))
+
+
+def _incoming_wins(local: dict, incoming: dict, policy: str) -> bool:
+    if policy == 'take_incoming':
+        return True
+    if policy == 'newest':
+        # Entries without a timestamp count as oldest; ties keep the local copy
+        return incoming.get('saved_at', '') > local.get('saved_at', '')
+    return False
+
+
+def merge_entries(local: dict, incoming: dict, policy: str = 'keep_local') -> MergeReport:
+    """Merge `incoming` entries into `local` (in place) according to `policy`.
+
+    Args:
+        local: Entries keyed by id (e.g. st.session_state.player_roster)
+        incoming: Imported entries keyed by id
+        policy: One of MERGE_POLICIES
+
+    Returns:
+        MergeReport describing added, updated and skipped entries
+    """
+    if policy not in MERGE_POLICIES:
+        raise ValueError(f"Unknown merge policy: {policy}")
+
+    report = MergeReport()
+    for entry_id, entry in incoming.items():
+        current = local.get(entry_id)
+        name = entry.get('name', entry_id)
+
+        if current is None:
+            local[entry_id] = entry
+            report.added.append(name)
+        elif content_hash(current) == content_hash(entry):
+            report.unchanged += 1
+        elif _incoming_wins(current, entry, policy):
+            report.updated.append((name, field_diff(current, entry)))
+            local[entry_id] = entry
+        else:
+            report.skipped.append((name, field_diff(current, entry)))
+    return report
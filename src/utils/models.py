@@ -7,6 +7,8 @@ class DeathSaves(TypedDict):
 
 class BaseCombatant(TypedDict):
     """Base combatant fields shared by all"""
+    id: NotRequired[str]
+    revision: NotRequired[int]  # Bumped by commands; keys cached view models
     name: str
     initiative: int
     dex_modifier: int
@@ -37,4 +39,50 @@ class MonsterCombatant(BaseCombatant):
     size: NotRequired[str]
 
 # Union type for any combatant
-Combatant = PlayerCombatant | MonsterCombatant
\ No newline at end of file
+Combatant = PlayerCombatant | MonsterCombatant
+
+class LogEntry(TypedDict):
+    """One event in the combat log"""
+    seq: int
+    timestamp: str
+    event_type: str
+    message: str
+    round: NotRequired[int]
+    actor_id: NotRequired[str]
+    actor: NotRequired[str]
+
+class Effect(TypedDict):
+    """A condition or spell effect that ends at the start/end of a given turn"""
+    id: str
+    name: str
+    target_id: str
+    condition: NotRequired[str]  # Added with the effect, removed when it ends
+    source_id: NotRequired[str]  # Combatant that caused it (the caster, for concentration)
+    concentration: bool
+    anchor_id: str  # Combatant whose turn ends the effect
+    trigger: Literal['start', 'end']
+    expires_round: int  # 0: no set end (until removed or concentration ends)
+
+class RosterPlayer(TypedDict):
+    """Player character saved in the roster"""
+    name: str
+    class_name: str
+    level: int
+    proficiency_bonus: int
+    max_hp: int
+    ac: int
+    speed: NotRequired[int]
+    dex_modifier: int
+    initiative_bonus: int
+    has_alert: NotRequired[bool]
+    notes: NotRequired[str]
+    saved_at: NotRequired[str]
+
+class SavedMonster(TypedDict):
+    """Monster saved in the library"""
+    name: str
+    source: str
+    source_title: str
+    raw_data: dict
+    parsed_stats: dict
+    saved_at: NotRequired[str]
@@ -1,6 +1,7 @@
 # src/utils/monster_api.py
 """Open5e API integration for monster search."""
 
+import hashlib
 import requests
 import random
 from difflib import SequenceMatcher
@@ -170,6 +171,13 @@ def get_cache_stats() -> tuple[int, int]:
     return total_searches, total_monsters
 
 
+def monster_id(monster_data: dict) -> str:
+    """Stable id for an API monster (name + source document)."""
+    return hashlib.md5(
+        f"{monster_data['name']}_{monster_data.get('document__slug', '')}".encode()
+    ).hexdigest()
+
+
 def parse_monster_stats(monster_data: dict) -> dict:
     """Parse monster data from Open5e API into combatant format."""
     
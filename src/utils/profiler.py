@@ -0,0 +1,193 @@
+# src/utils/profiler.py
+"""Opt-in per-rerun profiling of render functions and commands.
+
+Functions decorated with `@profiled()` (or code wrapped in `profile_span`)
+are timed while profiling is on, nested inside the rerun that called them.
+Each finished rerun is kept in a per-session ring buffer with its spans,
+call counts and the bytes deep-copied by command snapshots. When profiling
+is off the wrapper costs one session lookup per call.
+
+Profiling is enabled by PROFILER_ENABLED or, per session, by the toggle in
+the debug panel.
+"""
+
+import functools
+import json
+import pickle
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Iterator
+import streamlit as st
+from src.config import PROFILER_ENABLED, PROFILER_MAX_RERUNS
+
+ENABLED_KEY = 'profiler_enabled'
+
+
+@dataclass
+class Span:
+    """One timed call within a rerun."""
+    name: str
+    start: float  # Seconds since the rerun started
+    depth: int
+    duration: float = 0.0
+    deepcopy_bytes: int = 0
+
+
+@dataclass
+class RerunProfile:
+    """All spans recorded during one script run (or fragment run)."""
+    label: str
+    started_at: float  # Wall clock (time.time())
+    spans: list[Span] = field(default_factory=list)
+    duration: float = 0.0
+    deepcopy_bytes: int = 0
+
+    def call_stats(self) -> dict[str, dict]:
+        """Calls, total time and deepcopy bytes per span name"""
+        stats: dict[str, dict] = {}
+        for span in self.spans:
+            entry = stats.setdefault(span.name, {'calls': 0, 'seconds': 0.0, 'deepcopy_bytes': 0})
+            entry['calls'] += 1
+            entry['seconds'] += span.duration
+            entry['deepcopy_bytes'] += span.deepcopy_bytes
+        return stats
+
+
+class Profiler:
+    """Per-session recorder: the rerun in progress and a ring buffer of finished ones."""
+
+    def __init__(self, max_reruns: int = PROFILER_MAX_RERUNS):
+        self.runs: deque[RerunProfile] = deque(maxlen=max_reruns)
+        self._current: RerunProfile | None = None
+        self._origin = 0.0
+        self._stack: list[Span] = []
+
+    def begin(self, label: str) -> None:
+        self._current = RerunProfile(label=label, started_at=time.time())
+        self._origin = time.perf_counter()
+        self._stack = []
+
+    def end(self) -> None:
+        if self._current is None:
+            return
+        self._current.duration = time.perf_counter() - self._origin
+        self.runs.append(self._current)
+        self._current = None
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        # Spans outside a rerun (fragment reruns, headless use) get a rerun of their own
+        owns_rerun = self._current is None
+        if owns_rerun:
+            self.begin(name)
+        span = Span(name=name, start=time.perf_counter() - self._origin, depth=len(self._stack))
+        self._current.spans.append(span)
+        self._stack.append(span)
+        try:
+            yield
+        finally:
+            span.duration = time.perf_counter() - self._origin - span.start
+            self._stack.pop()
+            if owns_rerun:
+                self.end()
+
+    def add_deepcopy_bytes(self, size: int) -> None:
+        if self._current is None:
+            return
+        self._current.deepcopy_bytes += size
+        if self._stack:
+            self._stack[-1].deepcopy_bytes += size
+
+
+def is_enabled() -> bool:
+    """Whether profiling is on for this session."""
+    return st.session_state.get(ENABLED_KEY, PROFILER_ENABLED)
+
+
+def get_profiler() -> Profiler:
+    """Get the session's profiler (created on first use)."""
+    profiler = st.session_state.get('profiler')
+    if not isinstance(profiler, Profiler):
+        profiler = st.session_state.profiler = Profiler()
+    return profiler
+
+
+@contextmanager
+def profile_rerun(label: str = "rerun") -> Iterator[None]:
+    """Wrap a whole script run; spans inside it are grouped under one rerun."""
+    if not is_enabled():
+        yield
+        return
+    profiler = get_profiler()
+    profiler.begin(label)
+    try:
+        yield
+    finally:
+        profiler.end()
+
+
+@contextmanager
+def profile_span(name: str) -> Iterator[None]:
+    """Time a block as one span of the current rerun."""
+    if not is_enabled():
+        yield
+        return
+    with get_profiler().span(name):
+        yield
+
+
+def profiled(name: str | None = None) -> Callable:
+    """Decorator: time every call of the function as a span named `name` (default: qualified name)."""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not is_enabled():
+                return func(*args, **kwargs)
+            with get_profiler().span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_deepcopy(value) -> None:
+    """Count the (pickled) size of a snapshot that was just deep-copied."""
+    if not is_enabled():
+        return
+    try:
+        size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return
+    get_profiler().add_deepcopy_bytes(size)
+
+
+# =============================================================================
+# Export
+# =============================================================================
+def export_profile_json(runs: list[RerunProfile]) -> str:
+    """Recorded reruns as JSON."""
+    return json.dumps([asdict(run) for run in runs], indent=2)
+
+
+def export_chrome_trace(runs: list[RerunProfile]) -> str:
+    """Recorded reruns in Chrome trace event format (chrome://tracing, Perfetto)."""
+    events = []
+    if runs:
+        origin = runs[0].started_at
+        for run in runs:
+            offset_us = (run.started_at - origin) * 1_000_000
+            events.append({
+                'name': run.label, 'ph': 'X', 'pid': 1, 'tid': 1,
+                'ts': offset_us, 'dur': run.duration * 1_000_000,
+                'args': {'deepcopy_bytes': run.deepcopy_bytes},
+            })
+            for span in run.spans:
+                events.append({
+                    'name': span.name, 'ph': 'X', 'pid': 1, 'tid': 1,
+                    'ts': offset_us + span.start * 1_000_000, 'dur': span.duration * 1_000_000,
+                    'args': {'deepcopy_bytes': span.deepcopy_bytes},
+                })
+    return json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'})
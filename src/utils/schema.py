@@ -0,0 +1,337 @@
+# src/utils/schema.py
+"""Schema validation and version migration for saved combats, rosters and libraries.
+
+Validators are compiled once from the TypedDicts in `models.py` into plain
+closures, so checking a file is a single pass with no per-field reflection.
+Errors carry the exact location of the bad value, e.g.
+``combatants[3].death_saves.failures: expected int, got str``.
+
+Older files are upgraded through a chain of migrations keyed on the version
+string stored in each file (`EXPORT_VERSION`, `ROSTER_VERSION`,
+`LIBRARY_VERSION`).
+"""
+
+from typing import Any, Callable, Literal, get_args, get_origin, get_type_hints, is_typeddict
+from src.config import EXPORT_VERSION, ROSTER_VERSION, LIBRARY_VERSION
+from src.utils.models import PlayerCombatant, MonsterCombatant, RosterPlayer, SavedMonster, LogEntry, Effect
+
+
+class SchemaError(ValueError):
+    """A value in a loaded file does not match the expected schema."""
+
+    def __init__(self, message: str, path: str = ""):
+        self.message = message
+        self.path = path
+        super().__init__(f"{path}: {message}" if path else message)
+
+    def prefixed(self, key: str | int) -> "SchemaError":
+        """Return this error with `key` prepended to its location."""
+        head = f"[{key}]" if isinstance(key, int) else key
+        if not self.path:
+            path = head
+        elif self.path.startswith('['):
+            path = head + self.path
+        else:
+            path = f"{head}.{self.path}"
+        return SchemaError(self.message, path)
+
+
+Checker = Callable[[Any], None]
+
+
+# =============================================================================
+# Validator compilation
+# =============================================================================
+def _type_name(value) -> str:
+    return 'null' if value is None else type(value).__name__
+
+
+def _exact_type(expected: type) -> Checker:
+    # `type(x) is int` rejects bools, which isinstance would let through
+    def check(value):
+        if type(value) is not expected:
+            raise SchemaError(f"expected {expected.__name__}, got {_type_name(value)}")
+    return check
+
+
+def _list_of(item_check: Checker) -> Checker:
+    def check(value):
+        if type(value) is not list:
+            raise SchemaError(f"expected list, got {_type_name(value)}")
+        for position, item in enumerate(value):
+            try:
+                item_check(item)
+            except SchemaError as e:
+                raise e.prefixed(position) from None
+    return check
+
+
+def _literal(allowed: tuple) -> Checker:
+    allowed_set = frozenset(allowed)
+    def check(value):
+        if value not in allowed_set:
+            raise SchemaError(f"expected one of {sorted(allowed_set)}, got {value!r}")
+    return check
+
+
+def compile_validator(tp) -> Checker:
+    """Compile a type annotation (TypedDicts, primitives, lists, Literals) to a checker."""
+    if is_typeddict(tp):
+        return _compile_typed_dict(tp)
+    origin = get_origin(tp)
+    if origin is list:
+        (item_type,) = get_args(tp)
+        return _list_of(compile_validator(item_type))
+    if origin is Literal:
+        return _literal(get_args(tp))
+    if tp is dict or origin is dict:
+        return _exact_type(dict)
+    if tp in (int, str, bool):
+        return _exact_type(tp)
+    raise TypeError(f"Unsupported schema type: {tp!r}")
+
+
+def _compile_typed_dict(td) -> Checker:
+    hints = get_type_hints(td)
+    fields = [(key, key in td.__required_keys__, compile_validator(hint)) for key, hint in hints.items()]
+
+    def check(value):
+        if type(value) is not dict:
+            raise SchemaError(f"expected object, got {_type_name(value)}")
+        for key, required, field_check in fields:
+            if key in value:
+                try:
+                    field_check(value[key])
+                except SchemaError as e:
+                    raise e.prefixed(key) from None
+            elif required:
+                raise SchemaError(f"missing required field '{key}'")
+    return check
+
+
+_check_player = compile_validator(PlayerCombatant)
+_check_monster = compile_validator(MonsterCombatant)
+validate_roster_player = compile_validator(RosterPlayer)
+validate_saved_monster = compile_validator(SavedMonster)
+_check_log_entry = compile_validator(LogEntry)
+_check_effect = compile_validator(Effect)
+
+
+def validate_combatant(value) -> None:
+    """Validate one combatant against the player or monster schema.
+
+    Raises:
+        SchemaError: With the location of the first invalid field
+    """
+    if type(value) is dict and value.get('combatant_type') == 'player':
+        _check_player(value)
+    else:
+        _check_monster(value)
+
+
+def _validate_combat_fields(state: dict) -> None:
+    """Validate the top-level (non-combatant) fields of a combat state."""
+    for key, expected in (('current_turn_index', int), ('round_number', int), ('combat_active', bool)):
+        if key not in state:
+            raise SchemaError(f"missing required field '{key}'")
+        if type(state[key]) is not expected:
+            raise SchemaError(f"expected {expected.__name__}, got {_type_name(state[key])}", key)
+
+    combatants = state.get('combatants')
+    if type(combatants) is not list:
+        raise SchemaError(f"expected list, got {_type_name(combatants)}", 'combatants')
+    if combatants and not 0 <= state['current_turn_index'] < len(combatants):
+        raise SchemaError(f"turn index {state['current_turn_index']} is out of range", 'current_turn_index')
+    if state['round_number'] < 1:
+        raise SchemaError("round number must be at least 1", 'round_number')
+
+    combat_log = state.get('combat_log', [])
+    if type(combat_log) is not list:
+        raise SchemaError(f"expected list, got {_type_name(combat_log)}", 'combat_log')
+    for position, entry in enumerate(combat_log):
+        # Plain strings are log lines from saves made before structured events
+        if type(entry) is not str:
+            try:
+                _check_log_entry(entry)
+            except SchemaError as e:
+                raise e.prefixed(position).prefixed('combat_log') from None
+
+    # Timed effects are optional (saves made before they existed have none)
+    effects = state.get('effects', [])
+    if type(effects) is not list:
+        raise SchemaError(f"expected list, got {_type_name(effects)}", 'effects')
+    for position, effect in enumerate(effects):
+        try:
+            _check_effect(effect)
+        except SchemaError as e:
+            raise e.prefixed(position).prefixed('effects') from None
+
+
+# =============================================================================
+# Migrations
+# =============================================================================
+CURRENT_VERSIONS = {
+    'combat': EXPORT_VERSION,
+    'roster': ROSTER_VERSION,
+    'library': LIBRARY_VERSION,
+}
+
+# Files written before versioning was added are treated as this version
+LEGACY_VERSION = "1.0"
+
+_MIGRATIONS: dict[str, dict[str, tuple[str, Callable[[dict], dict]]]] = {
+    kind: {} for kind in CURRENT_VERSIONS
+}
+
+
+def register_migration(kind: str, from_version: str, to_version: str):
+    """Register a function that upgrades a `kind` document between two versions."""
+    def decorator(func: Callable[[dict], dict]):
+        _MIGRATIONS[kind][from_version] = (to_version, func)
+        return func
+    return decorator
+
+
+def _version_key(version: str) -> tuple[int, ...]:
+    try:
+        return tuple(int(part) for part in version.split('.'))
+    except (AttributeError, ValueError):
+        raise SchemaError(f"unrecognized version {version!r}", 'version') from None
+
+
+def document_version(document: dict) -> str:
+    """Return the version a document was written with."""
+    version = document.get('version', LEGACY_VERSION)
+    _version_key(version)
+    return version
+
+
+def migrate(kind: str, document: dict) -> dict:
+    """Upgrade a document to the current version by applying each migration in turn."""
+    current = CURRENT_VERSIONS[kind]
+    version = document_version(document)
+
+    if _version_key(version) > _version_key(current):
+        raise SchemaError(f"file was created by a newer version ({version} > {current})", 'version')
+
+    while version != current:
+        if version not in _MIGRATIONS[kind]:
+            raise SchemaError(f"no upgrade path from version {version} to {current}", 'version')
+        version, upgrade = _MIGRATIONS[kind][version]
+        document = upgrade(document)
+        document['version'] = version
+    return document
+
+
+_BASE_COMBATANT_DEFAULTS = {
+    'dex_modifier': 0,
+    'temp_hp': 0,
+    'ac': 10,
+    'speed': 30,
+    'exhaustion': 0,
+    'is_stable': False,
+    'notes': "",
+}
+
+
+@register_migration('combat', '1.0', '2.0')
+def _combat_1_to_2(state: dict) -> dict:
+    """Backfill status fields that early saves did not track."""
+    for combatant in state.get('combatants', []):
+        if not isinstance(combatant, dict):
+            continue
+        for key, default in _BASE_COMBATANT_DEFAULTS.items():
+            combatant.setdefault(key, default)
+        combatant.setdefault('initiative', 10 + combatant['dex_modifier'])
+        combatant.setdefault('conditions', [])
+        combatant.setdefault('death_saves', {'successes': 0, 'failures': 0})
+        if 'current_hp' not in combatant and 'max_hp' in combatant:
+            combatant['current_hp'] = combatant['max_hp']
+    state.setdefault('combat_log', [])
+    return state
+
+
+@register_migration('combat', '2.0', '3.0')
+def _combat_2_to_3(state: dict) -> dict:
+    """Split combatants into players and monsters (untyped ones were generic monsters)."""
+    for combatant in state.get('combatants', []):
+        if not isinstance(combatant, dict):
+            continue
+        combatant.setdefault('combatant_type', 'monster')
+        if combatant['combatant_type'] == 'player':
+            combatant.setdefault('class_name', 'Unknown')
+            combatant.setdefault('level', 1)
+            combatant.setdefault('proficiency_bonus', 2)
+            combatant.setdefault('has_alert', False)
+    return state
+
+
+# =============================================================================
+# Loading
+# =============================================================================
+def upgrade_combat_state(state: dict, combatants_checked: bool = False,
+                         pending_error: SchemaError | None = None) -> dict:
+    """Migrate a combat state to the current version and validate it.
+
+    Args:
+        state: Parsed combat file
+        combatants_checked: Combatants were already validated against the
+            current schema (e.g. while streaming), so skip that pass if no
+            migration is needed
+        pending_error: First combatant error found while streaming
+
+    Returns:
+        The upgraded state
+
+    Raises:
+        SchemaError: With the location of the first invalid value
+    """
+    if type(state) is not dict:
+        raise SchemaError(f"expected object, got {_type_name(state)}")
+
+    if document_version(state) != EXPORT_VERSION:
+        state = migrate('combat', state)
+        combatants_checked, pending_error = False, None
+
+    if pending_error is not None:
+        raise pending_error
+    _validate_combat_fields(state)
+
+    if not combatants_checked:
+        for position, combatant in enumerate(state['combatants']):
+            try:
+                validate_combatant(combatant)
+            except SchemaError as e:
+                raise e.prefixed(position).prefixed('combatants') from None
+    return state
+
+
+ENTRY_VALIDATORS = {
+    'roster': ('players', validate_roster_player),
+    'library': ('monsters', validate_saved_monster),
+}
+
+
+def upgrade_entries(kind: str, entries: dict, version: str,
+                    pending_error: SchemaError | None = None) -> dict:
+    """Migrate and validate roster players or library monsters.
+
+    `entries` are assumed validated against the current schema (with the first
+    failure in `pending_error`) unless a migration had to run.
+
+    Returns:
+        The upgraded entries, keyed by id
+    """
+    entries_key, validate = ENTRY_VALIDATORS[kind]
+    if version == CURRENT_VERSIONS[kind]:
+        if pending_error is not None:
+            raise pending_error
+        return entries
+
+    entries = migrate(kind, {entries_key: entries, 'version': version})[entries_key]
+    for entry_id, entry in entries.items():
+        try:
+            validate(entry)
+        except SchemaError as e:
+            raise e.prefixed(entry_id).prefixed(entries_key) from None
+    return entries
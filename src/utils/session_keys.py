@@ -0,0 +1,143 @@
+# src/utils/session_keys.py
+"""Session-state keys owned by an entity, and their garbage collection.
+
+Widgets and per-item state for a combatant, search result, saved monster or
+roster player use `entity_key(kind, id, name)`, which encodes the owner in
+the key itself. `collect_session_garbage` drops every such key whose owner
+no longer exists, so keys can't pile up over a long session or bleed into
+whichever entity takes over an index.
+"""
+
+import pickle
+import sys
+import streamlit as st
+
+_SEPARATOR = ":"
+
+
+def _search_result_ids() -> set[str]:
+    results = st.session_state.get('monster_search_results')
+    if not results:
+        return set()
+    # Imported here so startup doesn't load the API client (and requests)
+    from src.utils.monster_api import monster_id
+    return {monster_id(m) for m in results}
+
+
+# Entity kind -> ids of the entities of that kind that currently exist
+ENTITY_SOURCES = {
+    'combatant': lambda: {c['id'] for c in st.session_state.get('combatants', []) if 'id' in c},
+    'search': _search_result_ids,
+    'monster': lambda: set(st.session_state.get('saved_monsters', {})),
+    'player': lambda: set(st.session_state.get('player_roster', {})),
+}
+
+# Category of well-known (non-entity) keys, for the debug view
+KEY_CATEGORIES = {
+    'combatants': 'Combat state',
+    'current_turn_index': 'Combat state',
+    'round_number': 'Combat state',
+    'combat_active': 'Combat state',
+    'revision': 'Combat state',
+    'combat_stats': 'Combat state',
+    'effects': 'Combat state',
+    'effect_scheduler': 'Combat state',
+    'combat_log': 'Combat log',
+    'command_stack': 'Undo history',
+    'command_stack_position': 'Undo history',
+    'view_model_cache': 'Caches',
+    'monster_search_cache': 'Caches',
+    'monster_search_results': 'Search',
+    'search_term': 'Search',
+    'saved_monsters': 'Monster library',
+    'player_roster': 'Player roster',
+    'encounter_id': 'Shared encounter',
+    'encounter_token': 'Shared encounter',
+    'encounter_role': 'Shared encounter',
+    'encounter_version': 'Shared encounter',
+    'encounter_signature': 'Shared encounter',
+    'encounter_viewer_id': 'Shared encounter',
+    'auto_load_future': 'Startup',
+    'auto_loaded': 'Startup',
+    'imported_uploads': 'Save/load',
+    'profiler': 'Debugging',
+    'memory_snapshot': 'Debugging',
+    'memory_alloc_diff': 'Debugging',
+}
+
+
+def entity_key(kind: str, entity_id: str, name: str) -> str:
+    """Session/widget key for `name` belonging to one entity.
+
+    Args:
+        kind: One of ENTITY_SOURCES
+        entity_id: The entity's stable id (never a list index)
+        name: What the key is for, e.g. "dmg" or "death_roll_result"
+    """
+    return _SEPARATOR.join((kind, entity_id, name))
+
+
+def combatant_key(combatant: dict, name: str) -> str:
+    """Session/widget key for `name` belonging to a combatant."""
+    return entity_key('combatant', combatant['id'], name)
+
+
+def _parse_entity_key(key: str) -> tuple[str, str] | None:
+    """(kind, id) of an entity key, or None for other keys"""
+    parts = key.split(_SEPARATOR, 2)
+    if len(parts) == 3 and parts[0] in ENTITY_SOURCES:
+        return parts[0], parts[1]
+    return None
+
+
+def collect_session_garbage() -> int:
+    """Delete the keys of entities that no longer exist.
+
+    Returns:
+        Number of keys removed
+    """
+    live = {}
+    stale = []
+    for key in list(st.session_state.keys()):
+        owner = _parse_entity_key(str(key))
+        if owner is None:
+            continue
+        kind, entity_id = owner
+        if kind not in live:
+            live[kind] = ENTITY_SOURCES[kind]()
+        if entity_id not in live[kind]:
+            stale.append(key)
+
+    for key in stale:
+        del st.session_state[key]
+    return len(stale)
+
+
+def _value_size(value) -> int:
+    """Approximate size of a session value in bytes (pickled, or shallow if unpicklable)"""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+def session_size_by_category() -> list[dict]:
+    """Key count and approximate size of the session state, by category.
+
+    Returns:
+        Rows of {'category', 'keys', 'bytes'}, largest first
+    """
+    totals: dict[str, list[int]] = {}
+    for key in list(st.session_state.keys()):
+        key = str(key)
+        owner = _parse_entity_key(key)
+        if owner is not None:
+            category = f"Widgets: {owner[0]}"
+        else:
+            category = KEY_CATEGORIES.get(key, 'Other')
+        row = totals.setdefault(category, [0, 0])
+        row[0] += 1
+        row[1] += _value_size(st.session_state[key])
+
+    rows = [{'category': name, 'keys': count, 'bytes': size} for name, (count, size) in totals.items()]
+    return sorted(rows, key=lambda row: row['bytes'], reverse=True)
@@ -0,0 +1,291 @@
+# src/utils/snapshot_history.py
+"""Versioned combat saves stored as a base snapshot plus JSON-patch deltas.
+
+Each encounter gets an append-only ``data/history/<name>.jsonl`` file. A save
+appends one line holding either a full snapshot ("base") or the RFC 6902
+patch from the previous version ("delta"), so disk use grows with what
+changed rather than with the size of the encounter. A new base is written
+every HISTORY_REBASE_INTERVAL saves, which bounds how many patches have to
+be replayed to rebuild any version.
+
+Every line starts with a fixed header (version, kind, saved_at, round,
+combatant count) so the timeline can be listed without parsing snapshots.
+"""
+
+import copy
+import json
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from src.config import HISTORY_REBASE_INTERVAL
+from src.utils.data_manager import HISTORY_DIR
+
+# Fields that change on every save and are left out of the diff
+IGNORED_FIELDS = frozenset({'export_timestamp'})
+
+_HEADER = re.compile(
+    r'\{"version": (\d+), "kind": "(base|delta)", "saved_at": "([^"]*)", '
+    r'"round": (\d+), "combatants": (\d+)'
+)
+
+
+@dataclass(frozen=True)
+class VersionInfo:
+    """One entry in an encounter's save timeline."""
+    version: int
+    kind: str
+    saved_at: str
+    round_number: int
+    combatant_count: int
+    size: int  # Bytes on disk
+
+
+# =============================================================================
+# JSON Patch
+# =============================================================================
+def _escape(token) -> str:
+    return str(token).replace('~', '~0').replace('/', '~1')
+
+
+def _unescape(token: str) -> str:
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def _diff(old, new, path: str, ops: list) -> None:
+    if type(old) is not type(new):
+        ops.append({'op': 'replace', 'path': path, 'value': new})
+    elif isinstance(old, dict):
+        for key in old.keys() - new.keys():
+            ops.append({'op': 'remove', 'path': f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({'op': 'add', 'path': child, 'value': value})
+            elif old[key] != value:
+                _diff(old[key], value, child, ops)
+    elif isinstance(old, list):
+        common = min(len(old), len(new))
+        for i in range(common):
+            if old[i] != new[i]:
+                _diff(old[i], new[i], f"{path}/{i}", ops)
+        # Remove from the end so earlier indices stay valid
+        for i in range(len(old) - 1, common - 1, -1):
+            ops.append({'op': 'remove', 'path': f"{path}/{i}"})
+        for value in new[common:]:
+            ops.append({'op': 'add', 'path': f"{path}/-", 'value': value})
+    elif old != new:
+        ops.append({'op': 'replace', 'path': path, 'value': new})
+
+
+def make_patch(old: dict, new: dict) -> list[dict]:
+    """Compute the JSON patch (add/remove/replace operations) turning `old` into `new`."""
+    ops = []
+    _diff(old, new, "", ops)
+    return ops
+
+
+def apply_patch(document: dict, patch: list[dict]) -> dict:
+    """Apply a JSON patch to `document` in place and return it."""
+    for op in patch:
+        *parents, last = [_unescape(t) for t in op['path'].split('/')[1:]]
+        target = document
+        for token in parents:
+            target = target[int(token)] if isinstance(target, list) else target[token]
+
+        if isinstance(target, list):
+            if op['op'] == 'add':
+                if last == '-':
+                    target.append(copy.deepcopy(op['value']))
+                else:
+                    target.insert(int(last), copy.deepcopy(op['value']))
+            elif op['op'] == 'remove':
+                del target[int(last)]
+            else:
+                target[int(last)] = copy.deepcopy(op['value'])
+        elif op['op'] == 'remove':
+            del target[last]
+        else:
+            target[last] = copy.deepcopy(op['value'])
+    return document
+
+
+# =============================================================================
+# History files
+# =============================================================================
+def _history_file(name: str) -> Path:
+    if name.endswith('.json'):
+        name = name[:-len('.json')]
+    return HISTORY_DIR / f"{name}.jsonl"
+
+
+def _strip_ignored(state: dict) -> dict:
+    return {k: v for k, v in state.items() if k not in IGNORED_FIELDS}
+
+
+def _encode_line(version: int, kind: str, state: dict, payload_key: str, payload) -> str:
+    header = {
+        'version': version,
+        'kind': kind,
+        'saved_at': datetime.now().isoformat(),
+        'round': state.get('round_number', 1),
+        'combatants': len(state.get('combatants', [])),
+    }
+    return json.dumps({**header, payload_key: payload}, separators=(', ', ': ')) + "\n"
+
+
+def _read_lines(name: str) -> list[str]:
+    """The well-formed lines of an encounter's history.
+
+    Lines without a parseable header or a trailing newline (e.g. cut short
+    by an interrupted write) are left out; `_reconstruct` reports the gap if
+    a version depends on one of them.
+    """
+    filepath = _history_file(name)
+    if not filepath.exists():
+        return []
+    with open(filepath, 'r') as f:
+        return [line for line in f if line.endswith("\n") and _HEADER.match(line)]
+
+
+def _line_version(line: str) -> int:
+    return int(_HEADER.match(line).group(1))
+
+
+def _reconstruct(lines: list[str], index: int) -> dict:
+    """Rebuild the state stored at line `index` from the nearest base before it.
+
+    Raises:
+        ValueError: If there is no base before it or a version in between is missing
+    """
+    base = index
+    while _HEADER.match(lines[base]).group(2) != 'base':
+        base -= 1
+        if base < 0:
+            raise ValueError(f"no full snapshot before version {_line_version(lines[index])}")
+    expected = _line_version(lines[base])
+    for line in lines[base + 1:index + 1]:
+        expected += 1
+        if _line_version(line) != expected:
+            raise ValueError(f"version {expected} is missing or corrupt")
+    state = json.loads(lines[base])['state']
+    for line in lines[base + 1:index + 1]:
+        apply_patch(state, json.loads(line)['patch'])
+    return state
+
+
+def _drop_partial_tail(filepath: Path) -> None:
+    """Cut off an incomplete last line, so the next append starts on a line of its own."""
+    if not filepath.exists():
+        return
+    with open(filepath, 'rb+') as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            f.truncate(end)
+
+
+def get_history_names() -> list[str]:
+    """Names of encounters that have a versioned save history, newest first."""
+    if not HISTORY_DIR.exists():
+        return []
+    files = sorted(HISTORY_DIR.glob("*.jsonl"), key=lambda x: x.stat().st_mtime, reverse=True)
+    return [f.stem for f in files]
+
+
+def list_versions(name: str) -> list[VersionInfo]:
+    """Timeline of saved versions for an encounter, oldest first."""
+    versions = []
+    for line in _read_lines(name):
+        match = _HEADER.match(line)
+        versions.append(VersionInfo(
+            version=int(match.group(1)),
+            kind=match.group(2),
+            saved_at=match.group(3),
+            round_number=int(match.group(4)),
+            combatant_count=int(match.group(5)),
+            size=len(line.encode()),
+        ))
+    return versions
+
+
+def save_version(name: str, combat_data: dict) -> tuple[bool, str, int | None]:
+    """Append a new version of an encounter to its history.
+
+    Writes a JSON patch against the previous version, or a full snapshot when
+    the history is empty, HISTORY_REBASE_INTERVAL deltas have accumulated, or
+    the patch would be larger than the snapshot itself.
+
+    Returns:
+        tuple: (success, message, version number)
+    """
+    try:
+        HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+        state = _strip_ignored(combat_data)
+        _drop_partial_tail(_history_file(name))
+        lines = _read_lines(name)
+
+        if not lines:
+            line = _encode_line(1, 'base', state, 'state', state)
+        else:
+            version = _line_version(lines[-1]) + 1
+            base_line = _encode_line(version, 'base', state, 'state', state)
+            try:
+                previous = _reconstruct(lines, len(lines) - 1)
+            except ValueError:
+                previous = None  # Damaged history: start over from a full snapshot
+
+            if previous is None:
+                line = base_line
+            else:
+                patch = make_patch(previous, state)
+                if not patch:
+                    return True, f"No changes since version {version - 1}", version - 1
+
+                deltas_since_base = 0
+                for existing in reversed(lines):
+                    if _HEADER.match(existing).group(2) == 'base':
+                        break
+                    deltas_since_base += 1
+
+                delta_line = _encode_line(version, 'delta', state, 'patch', patch)
+                rebase = deltas_since_base + 1 >= HISTORY_REBASE_INTERVAL
+                line = base_line if rebase or len(base_line) <= len(delta_line) else delta_line
+
+        with open(_history_file(name), 'a') as f:
+            f.write(line)
+
+        version = _line_version(line)
+        return True, f"Saved {name} version {version}", version
+
+    except Exception as e:
+        return False, f"Error saving version: {str(e)}", None
+
+
+def load_version(name: str, version: int) -> tuple[bool, str, dict]:
+    """Reconstruct one version of an encounter.
+
+    Returns:
+        tuple: (success, message, data)
+    """
+    try:
+        lines = _read_lines(name)
+        for index, line in enumerate(lines):
+            if _line_version(line) == version:
+                return True, f"Loaded {name} version {version}", _reconstruct(lines, index)
+        return False, f"Error loading version: {name} has no version {version}", None
+    except Exception as e:
+        return False, f"Error loading version: {str(e)}", None
+
+
+def delete_history(name: str) -> tuple[bool, str]:
+    """Delete an encounter's whole version history.
+
+    Returns:
+        tuple: (success, message)
+    """
+    try:
+        _history_file(name).unlink()
+        return True, f"Deleted history for {name}"
+    except Exception as e:
+        return False, f"Error deleting history: {str(e)}"
@@ -0,0 +1,424 @@
+# src/utils/sqlite_store.py
+"""SQLite storage engine for combats, player rosters, and monster libraries.
+
+Each save is broken into rows (one per combatant, player, monster and log
+event) so that incremental writes only touch what changed, and queries such as
+"all encounters with a Beholder" can use an index instead of parsing files.
+The database runs in WAL mode so several app processes can read while one
+writes.
+"""
+
+import json
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS combats (
+    name TEXT PRIMARY KEY,
+    saved_at TEXT NOT NULL,
+    version TEXT,
+    current_turn_index INTEGER NOT NULL DEFAULT 0,
+    round_number INTEGER NOT NULL DEFAULT 1,
+    combat_active INTEGER NOT NULL DEFAULT 0,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+
+CREATE TABLE IF NOT EXISTS combatant_snapshots (
+    combat_name TEXT NOT NULL REFERENCES combats(name) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    combatant_type TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (combat_name, position)
+);
+CREATE INDEX IF NOT EXISTS idx_combatant_snapshots_name
+    ON combatant_snapshots(name COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS log_events (
+    combat_name TEXT NOT NULL REFERENCES combats(name) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    PRIMARY KEY (combat_name, seq)
+);
+
+CREATE TABLE IF NOT EXISTS rosters (
+    name TEXT PRIMARY KEY,
+    saved_at TEXT NOT NULL,
+    version TEXT
+);
+
+CREATE TABLE IF NOT EXISTS players (
+    roster_name TEXT NOT NULL REFERENCES rosters(name) ON DELETE CASCADE,
+    player_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (roster_name, player_id)
+);
+
+CREATE TABLE IF NOT EXISTS libraries (
+    name TEXT PRIMARY KEY,
+    saved_at TEXT NOT NULL,
+    version TEXT
+);
+
+CREATE TABLE IF NOT EXISTS monsters (
+    library_name TEXT NOT NULL REFERENCES libraries(name) ON DELETE CASCADE,
+    monster_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    source TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (library_name, monster_id)
+);
+CREATE INDEX IF NOT EXISTS idx_monsters_name ON monsters(name COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS stat_blocks (
+    library_name TEXT NOT NULL,
+    monster_id TEXT NOT NULL,
+    raw_data TEXT NOT NULL,
+    PRIMARY KEY (library_name, monster_id),
+    FOREIGN KEY (library_name, monster_id)
+        REFERENCES monsters(library_name, monster_id) ON DELETE CASCADE
+);
+"""
+
+# Upserts only rewrite a row when its content actually changed, so re-saving
+# an unchanged roster or library does not dirty any pages.
+_UPSERT_PLAYER = """
+INSERT INTO players (roster_name, player_id, name, data) VALUES (?, ?, ?, ?)
+ON CONFLICT (roster_name, player_id) DO UPDATE
+SET name = excluded.name, data = excluded.data
+WHERE players.data != excluded.data
+"""
+
+_UPSERT_MONSTER = """
+INSERT INTO monsters (library_name, monster_id, name, source, data) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (library_name, monster_id) DO UPDATE
+SET name = excluded.name, source = excluded.source, data = excluded.data
+WHERE monsters.data != excluded.data
+"""
+
+_UPSERT_STAT_BLOCK = """
+INSERT INTO stat_blocks (library_name, monster_id, raw_data) VALUES (?, ?, ?)
+ON CONFLICT (library_name, monster_id) DO UPDATE
+SET raw_data = excluded.raw_data
+WHERE stat_blocks.raw_data != excluded.raw_data
+"""
+
+_UPSERT_COMBATANT = """
+INSERT INTO combatant_snapshots (combat_name, position, name, combatant_type, data) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (combat_name, position) DO UPDATE
+SET name = excluded.name, combatant_type = excluded.combatant_type, data = excluded.data
+WHERE combatant_snapshots.data != excluded.data
+"""
+
+_COMBAT_KEYS = {'combatants', 'combat_log', 'current_turn_index', 'round_number',
+                'combat_active', 'export_timestamp', 'version'}
+
+BUSY_TIMEOUT_MS = 5000
+
+
+@dataclass(frozen=True)
+class StoredEntry:
+    """A saved combat, roster or library row, usable where a file path was."""
+    kind: str
+    stem: str
+    saved_at: str
+
+    @property
+    def name(self) -> str:
+        return self.stem
+
+    @property
+    def mtime(self) -> float:
+        return datetime.fromisoformat(self.saved_at).timestamp()
+
+
+def _dumps(data) -> str:
+    return json.dumps(data, sort_keys=True, separators=(',', ':'))
+
+
+def _log_line(entry) -> str:
+    # Structured log events are stored as JSON, legacy plain-text lines as-is
+    return entry if isinstance(entry, str) else _dumps(entry)
+
+
+def _parse_log_line(line: str):
+    if line.startswith('{'):
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError:
+            pass
+    return line
+
+
+class SQLiteStore:
+    """Row-level storage for combats, rosters and libraries in one database file."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._initialized = False
+
+    @contextmanager
+    def connect(self):
+        """Open a connection and run the enclosed statements as one transaction.
+
+        Connections are short-lived so the store is safe to share between
+        Streamlit sessions (threads) and separate app processes.
+        """
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_MS / 1000)
+        try:
+            conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA foreign_keys = ON")
+            if not self._initialized:
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.executescript(SCHEMA)
+                self._initialized = True
+            conn.execute("PRAGMA synchronous = NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # =========================================================================
+    # Combats
+    # =========================================================================
+    def save_combat(self, name: str, combat_data: dict) -> None:
+        """Save a combat, rewriting only the combatants and log lines that changed."""
+        combatants = combat_data.get('combatants', [])
+        combat_log = combat_data.get('combat_log', [])
+        extra = {k: v for k, v in combat_data.items() if k not in _COMBAT_KEYS}
+        saved_at = datetime.now().isoformat()
+
+        with self.connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO combats (name, saved_at, version, current_turn_index, round_number, combat_active, extra)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (name) DO UPDATE SET
+                    saved_at = excluded.saved_at,
+                    version = excluded.version,
+                    current_turn_index = excluded.current_turn_index,
+                    round_number = excluded.round_number,
+                    combat_active = excluded.combat_active,
+                    extra = excluded.extra
+                """,
+                (
+                    name, saved_at, combat_data.get('version'),
+                    combat_data.get('current_turn_index', 0),
+                    combat_data.get('round_number', 1),
+                    int(bool(combat_data.get('combat_active', False))),
+                    _dumps(extra),
+                ),
+            )
+
+            conn.executemany(_UPSERT_COMBATANT, (
+                (name, position, c.get('name', ''), c.get('combatant_type'), _dumps(c))
+                for position, c in enumerate(combatants)
+            ))
+            conn.execute(
+                "DELETE FROM combatant_snapshots WHERE combat_name = ? AND position >= ?",
+                (name, len(combatants)),
+            )
+
+            # The log is append-only in practice: keep the stored prefix when it
+            # still matches and only insert the new tail.
+            stored_count = conn.execute(
+                "SELECT COUNT(*) FROM log_events WHERE combat_name = ?", (name,)
+            ).fetchone()[0]
+            start = 0
+            if 0 < stored_count <= len(combat_log):
+                last = conn.execute(
+                    "SELECT message FROM log_events WHERE combat_name = ? AND seq = ?",
+                    (name, stored_count - 1),
+                ).fetchone()
+                if last is not None and last[0] == _log_line(combat_log[stored_count - 1]):
+                    start = stored_count
+            if start == 0:
+                conn.execute("DELETE FROM log_events WHERE combat_name = ?", (name,))
+            conn.executemany(
+                "INSERT INTO log_events (combat_name, seq, message) VALUES (?, ?, ?)",
+                ((name, seq, _log_line(combat_log[seq])) for seq in range(start, len(combat_log))),
+            )
+
+    def load_combat(self, name: str) -> dict | None:
+        """Rebuild a combat dict in the export format, or None if missing."""
+        with self.connect() as conn:
+            row = conn.execute(
+                "SELECT saved_at, version, current_turn_index, round_number, combat_active, extra "
+                "FROM combats WHERE name = ?",
+                (name,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            saved_at, version, turn_index, round_number, active, extra = row
+            combatants = [
+                json.loads(data) for (data,) in conn.execute(
+                    "SELECT data FROM combatant_snapshots WHERE combat_name = ? ORDER BY position",
+                    (name,),
+                )
+            ]
+            combat_log = [
+                _parse_log_line(message) for (message,) in conn.execute(
+                    "SELECT message FROM log_events WHERE combat_name = ? ORDER BY seq",
+                    (name,),
+                )
+            ]
+
+        return {
+            **json.loads(extra),
+            'combatants': combatants,
+            'current_turn_index': turn_index,
+            'round_number': round_number,
+            'combat_active': bool(active),
+            'combat_log': combat_log,
+            'export_timestamp': saved_at,
+            'version': version,
+        }
+
+    def delete_combat(self, name: str) -> bool:
+        with self.connect() as conn:
+            return conn.execute("DELETE FROM combats WHERE name = ?", (name,)).rowcount > 0
+
+    def list_combats(self) -> list[StoredEntry]:
+        with self.connect() as conn:
+            return [
+                StoredEntry('combat', name, saved_at)
+                for name, saved_at in conn.execute(
+                    "SELECT name, saved_at FROM combats ORDER BY saved_at DESC"
+                )
+            ]
+
+    def find_combats_with(self, combatant_name: str) -> list[str]:
+        """Names of saved combats containing a combatant whose name matches (case-insensitive).
+
+        A trailing instance number is tolerated, so "Beholder" also finds
+        "Beholder 2".
+        """
+        with self.connect() as conn:
+            return [
+                name for (name,) in conn.execute(
+                    """
+                    SELECT DISTINCT combat_name FROM combatant_snapshots
+                    WHERE name = ? COLLATE NOCASE OR name LIKE ? ESCAPE '\\'
+                    ORDER BY combat_name
+                    """,
+                    (combatant_name, _like_prefix(combatant_name) + ' %'),
+                )
+            ]
+
+    # =========================================================================
+    # Player rosters
+    # =========================================================================
+    def save_roster(self, name: str, roster_data: dict) -> None:
+        """Save a roster, upserting players and dropping ones no longer present."""
+        players = roster_data.get('players', {})
+        with self.connect() as conn:
+            conn.execute(
+                "INSERT INTO rosters (name, saved_at, version) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET saved_at = excluded.saved_at, version = excluded.version",
+                (name, datetime.now().isoformat(), roster_data.get('version')),
+            )
+            conn.executemany(_UPSERT_PLAYER, (
+                (name, player_id, player.get('name', ''), _dumps(player))
+                for player_id, player in players.items()
+            ))
+            _delete_missing(conn, 'players', 'roster_name', 'player_id', name, players.keys())
+
+    def load_roster(self, name: str) -> dict | None:
+        with self.connect() as conn:
+            row = conn.execute("SELECT saved_at, version FROM rosters WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                return None
+            players = {
+                player_id: json.loads(data) for player_id, data in conn.execute(
+                    "SELECT player_id, data FROM players WHERE roster_name = ?", (name,)
+                )
+            }
+        return {'players': players, 'export_timestamp': row[0], 'version': row[1]}
+
+    def delete_roster(self, name: str) -> bool:
+        with self.connect() as conn:
+            return conn.execute("DELETE FROM rosters WHERE name = ?", (name,)).rowcount > 0
+
+    def list_rosters(self) -> list[StoredEntry]:
+        with self.connect() as conn:
+            return [
+                StoredEntry('roster', name, saved_at)
+                for name, saved_at in conn.execute("SELECT name, saved_at FROM rosters ORDER BY saved_at DESC")
+            ]
+
+    # =========================================================================
+    # Monster libraries
+    # =========================================================================
+    def save_library(self, name: str, library_data: dict) -> None:
+        """Save a library; stat blocks are stored separately and only rewritten on change."""
+        monsters = library_data.get('monsters', {})
+        with self.connect() as conn:
+            conn.execute(
+                "INSERT INTO libraries (name, saved_at, version) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET saved_at = excluded.saved_at, version = excluded.version",
+                (name, datetime.now().isoformat(), library_data.get('version')),
+            )
+            monster_rows = []
+            stat_rows = []
+            for monster_id, monster in monsters.items():
+                summary = {k: v for k, v in monster.items() if k != 'raw_data'}
+                monster_rows.append((name, monster_id, monster.get('name', ''), monster.get('source'), _dumps(summary)))
+                if 'raw_data' in monster:
+                    stat_rows.append((name, monster_id, _dumps(monster['raw_data'])))
+            conn.executemany(_UPSERT_MONSTER, monster_rows)
+            conn.executemany(_UPSERT_STAT_BLOCK, stat_rows)
+            _delete_missing(conn, 'monsters', 'library_name', 'monster_id', name, monsters.keys())
+
+    def load_library(self, name: str) -> dict | None:
+        with self.connect() as conn:
+            row = conn.execute("SELECT saved_at, version FROM libraries WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                return None
+            monsters = {}
+            for monster_id, data, raw_data in conn.execute(
+                """
+                SELECT m.monster_id, m.data, s.raw_data FROM monsters m
+                LEFT JOIN stat_blocks s
+                    ON s.library_name = m.library_name AND s.monster_id = m.monster_id
+                WHERE m.library_name = ?
+                """,
+                (name,),
+            ):
+                monster = json.loads(data)
+                if raw_data is not None:
+                    monster['raw_data'] = json.loads(raw_data)
+                monsters[monster_id] = monster
+        return {'monsters': monsters, 'export_timestamp': row[0], 'version': row[1]}
+
+    def delete_library(self, name: str) -> bool:
+        with self.connect() as conn:
+            return conn.execute("DELETE FROM libraries WHERE name = ?", (name,)).rowcount > 0
+
+    def list_libraries(self) -> list[StoredEntry]:
+        with self.connect() as conn:
+            return [
+                StoredEntry('library', name, saved_at)
+                for name, saved_at in conn.execute("SELECT name, saved_at FROM libraries ORDER BY saved_at DESC")
+            ]
+
+
+def _like_prefix(text: str) -> str:
+    """Escape LIKE wildcards so user text matches literally."""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _delete_missing(conn, table: str, owner_col: str, id_col: str, owner: str, keep_ids) -> None:
+    """Delete rows of `owner` whose ids are not in `keep_ids`."""
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep_ids (id TEXT PRIMARY KEY)")
+    conn.execute("DELETE FROM keep_ids")
+    conn.executemany("INSERT OR IGNORE INTO keep_ids (id) VALUES (?)", ((i,) for i in keep_ids))
+    conn.execute(
+        f"DELETE FROM {table} WHERE {owner_col} = ? AND {id_col} NOT IN (SELECT id FROM keep_ids)",
+        (owner,),
+    )
@@ -0,0 +1,101 @@
+# src/utils/view_models.py
+"""Memoized display data for combatants, keyed by (id, revision).
+
+Commands stamp every combatant they change with a new session revision (see
+`command_manager`), so a combatant's (id, revision) pair always identifies
+the same content. Titles, HP colors and status icons are derived once per
+pair and kept in a per-session LRU cache; unchanged
+combatants are a dict lookup on every rerun, and undo returns combatants to
+revisions that are usually still cached.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import streamlit as st
+from src.config import VIEW_MODEL_CACHE_SIZE
+from src.constants import ICONS
+
+@dataclass(frozen=True)
+class CombatantView:
+    """Derived, display-ready data for one combatant revision."""
+    title: str
+    type_icon: str
+    hp_text: str
+    hp_pct: float
+    hp_color: str
+    status_icons: str
+    conditions_text: str
+
+
+def get_hp_color(current: int, maximum: int) -> str:
+    """Return color based on HP percentage."""
+    if current == 0:
+        return "gray"
+    pct = current / maximum
+    if pct > 0.5:
+        return "green"
+    elif pct > 0.25:
+        return "orange"
+    else:
+        return "red"
+
+
+def build_combatant_view(combatant: dict) -> CombatantView:
+    """Derive the display data for a combatant (uncached)."""
+    current_hp = combatant['current_hp']
+    max_hp = combatant['max_hp']
+    is_player = combatant.get('combatant_type') == 'player'
+
+    hp_text = f"{current_hp}/{max_hp}"
+    if combatant['temp_hp'] > 0:
+        hp_text += f"(+{combatant['temp_hp']})"
+
+    # Status icons
+    status = []
+    if current_hp == 0:
+        status.append(ICONS['dead'])
+    elif current_hp < max_hp * 0.25:
+        status.append(ICONS['critical'])
+    if combatant['conditions']:
+        status.append(f"{ICONS['condition']}{len(combatant['conditions'])}")
+    if combatant['exhaustion'] > 0:
+        status.append(f"{ICONS['exhaustion']}{combatant['exhaustion']}")
+    status_icons = " ".join(status)
+
+    type_icon = ICONS['player'] if is_player else ICONS['monster']
+
+    title = f"{type_icon} **{combatant['name']}** | HP: {hp_text} | Init: {combatant['initiative']} | AC: {combatant['ac']}"
+    if status_icons:
+        title += f" | {status_icons}"
+
+    return CombatantView(
+        title=title,
+        type_icon=type_icon,
+        hp_text=hp_text,
+        hp_pct=current_hp / max_hp if max_hp > 0 else 0,
+        hp_color=get_hp_color(current_hp, max_hp),
+        status_icons=status_icons,
+        conditions_text=", ".join(combatant['conditions']),
+    )
+
+
+def get_combatant_view(combatant: dict) -> CombatantView:
+    """Get the (cached) display data for a combatant."""
+    if 'id' not in combatant:
+        return build_combatant_view(combatant)
+
+    cache = st.session_state.get('view_model_cache')
+    if cache is None:
+        cache = st.session_state.view_model_cache = OrderedDict()
+
+    key = (combatant['id'], combatant.get('revision', 0))
+    view = cache.get(key)
+    if view is None:
+        view = build_combatant_view(combatant)
+        cache[key] = view
+        if len(cache) > VIEW_MODEL_CACHE_SIZE:
+            cache.popitem(last=False)
+    else:
+        cache.move_to_end(key)
+    return view
+